@@ -1,18 +1,30 @@
 # app/api/routes_chat.py
 from __future__ import annotations
+import asyncio
+import copy
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-
-from app.graph.graph import graph
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.api.views import View, dict_delta, project_state
+from app.core.concurrency import TURNS, content_key, run_exclusive, session_turn
+from app.core.langfuse_client import with_tracing
+from app.core.logging import get_logger
+from app.core.store import SessionBusy, VersionConflict
+from app.graph.graph import get_graph
 from app.schemas.ui_payloads import ChatRequest, ChatResponse, ChatMessage
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+logger = get_logger(__name__)
+
 
 def _load_state(run_id: str) -> dict:
     """상태 로드"""
     config = {"configurable": {"thread_id": run_id}}
-    snap = graph.get_state(config)
+    snap = get_graph().get_state(config)
 
     if snap is None:
         raise HTTPException(status_code=404, detail="run_id not found")
@@ -29,172 +41,348 @@ def _load_state(run_id: str) -> dict:
     return dict(snap) if snap else {}
 
 
-@router.post("/{run_id}/message", response_model=ChatResponse)
-def send_message(run_id: str, req: ChatRequest):
+def _build_ui_data(state: dict, base: Dict[str, Any] | None = None) -> dict:
+    """state에서 사이드바 표시용 ui_data 구성"""
+    ui_data = dict(base or {})
+    ui_data["corporation"] = (state.get("corporation") or {}).get("name")
+    ui_data["centers"] = state.get("centers", [])
+    ui_data["center_networks"] = state.get("center_networks", {})
+
+    current_center_index = state.get("current_center_index", 0)
+    centers = state.get("centers", [])
+    ui_data["current_center"] = (
+        centers[current_center_index]
+        if centers and 0 <= current_center_index < len(centers)
+        else None
+    )
+    ui_data["current_index"] = current_center_index
+    ui_data["total_centers"] = len(centers)
+    return ui_data
+
+
+def _turn_ui_data(state: dict) -> dict:
+    """턴 응답용 ui_data (마지막 UI 카드 + 스코프 상세 정보 포함)"""
+    ui_data = _build_ui_data(state, state.get("last_ui_data", {}))
+    ui_data["scope_details"] = state.get("scope_details", {})
+    return ui_data
+
+
+def _snapshot_turn(state: dict) -> Tuple[int, dict]:
     """
-    챗봇에 메시지 전송 - 간단한 invoke 방식
+    compact 응답 계산용 턴 시작 시점 스냅샷 (메시지 수, ui_data)
+    노드가 state 내부 dict를 직접 수정하므로 ui_data는 깊은 복사.
     """
-    try:
-        config = {"configurable": {"thread_id": run_id}}
+    return len(state.get("messages") or []), copy.deepcopy(_turn_ui_data(state))
 
-        # 현재 상태 로드
-        state = _load_state(run_id)
-        print(f"\n=== Message received: {req.message} ===")
-        print(f"Current state keys: {list(state.keys())}")
-        print(f"Current step: {state.get('next_step')}")
-        print(f"Current center index: {state.get('current_center_index')}")
 
-        # 기존 메시지 히스토리 가져오기
-        messages = state.get("messages", [])
+def _turn_input(message: str) -> dict:
+    """
+    턴 입력은 새 사용자 메시지만 (체크포인트된 thread에 부분 업데이트로 병합)
+    메시지 히스토리 누적은 chat_handler 노드가 담당.
+    """
+    return {"user_message": message}
 
-        # 사용자 메시지 추가
-        user_message = ChatMessage(
-            role="user", content=req.message, timestamp=datetime.now().isoformat()
-        )
-        messages.append(user_message.model_dump())
-
-        # 사용자 메시지를 state에 설정
-        state["user_message"] = req.message
-        state["messages"] = messages
-
-        # 그래프 실행 - invoke 사용
-        print("Invoking graph...")
-        result = graph.invoke(state, config=config)
-        print(f"Graph result type: {type(result)}")
-
-        # 결과를 딕셔너리로 변환
-        if isinstance(result, tuple):
-            final_state = dict(result[0]) if result else {}
-        elif isinstance(result, dict):
-            final_state = result
-        else:
-            final_state = dict(result) if result else {}
-
-        print(f"Final state keys: {list(final_state.keys())}")
-        print(f"Next step: {final_state.get('next_step')}")
-        print(f"Current center index: {final_state.get('current_center_index')}")
-
-        # 그래프 실행 후 메시지 히스토리 복원 (그래프가 덮어쓸 수 있음)
-        final_messages = final_state.get("messages", [])
 
-        # 사용자 메시지가 없으면 추가
-        if not any(
-            msg.get("role") == "user" and msg.get("content") == req.message
-            for msg in final_messages
-        ):
-            final_messages.append(user_message.model_dump())
-
-        # 어시스턴트 응답 추가
-        assistant_response = final_state.get("last_response", "")
-        if assistant_response:
-            assistant_message = ChatMessage(
-                role="assistant",
-                content=assistant_response,
-                timestamp=datetime.now().isoformat(),
-            )
-            final_messages.append(assistant_message.model_dump())
+def _run_turn(run_id: str, message: str) -> Tuple[Tuple[int, dict], dict]:
+    """
+    한 턴 실행: 체크포인트 읽기 1회 + 종료 시 쓰기 1회(durability="exit")
+    stream_mode="values"의 첫 청크(입력 병합 직후, 노드 실행 전)로
+    compact 응답용 스냅샷을 만들므로 별도의 get_state가 필요 없음.
+    반환: (턴 시작 스냅샷, 최종 state)
+    """
+    config = with_tracing({"configurable": {"thread_id": run_id}}, run_id)
+
+    snapshot: Optional[Tuple[int, dict]] = None
+    final_state: dict = {}
+    for values in get_graph().stream(
+        _turn_input(message), config=config, stream_mode="values", durability="exit"
+    ):
+        if snapshot is None:
+            snapshot = _snapshot_turn(values)
+        final_state = values
+    return snapshot or (0, {}), dict(final_state)
+
+
+async def _astream_turn(
+    run_id: str,
+    message: str,
+    on_node: Callable[[dict], None],
+    on_response: Optional[Callable[[str, str], None]] = None,
+) -> Tuple[Tuple[int, dict], dict]:
+    """
+    _run_turn의 스트리밍 버전
+    - 노드 완료마다 on_node 호출
+    - 노드가 last_response를 설정하면 즉시 on_response(node, 응답) 호출
+      (그래프 나머지 / 체크포인트 저장을 기다리지 않음)
+    """
+    config = with_tracing({"configurable": {"thread_id": run_id}}, run_id)
+
+    snapshot: Optional[Tuple[int, dict]] = None
+    final_state: dict = {}
+    async for mode, chunk in get_graph().astream(
+        _turn_input(message),
+        config=config,
+        stream_mode=["values", "updates"],
+        durability="exit",
+    ):
+        if mode == "values":
+            # 첫 values 청크 = 노드 실행 전 state
+            if snapshot is None:
+                snapshot = _snapshot_turn(chunk)
+            final_state = chunk
+            continue
+        for node, values in chunk.items():
+            # interrupt 알림 등 dict가 아닌 업데이트는 건너뜀
+            if isinstance(values, dict):
+                on_node({"node": node, "next_step": values.get("next_step")})
+                response = values.get("last_response")
+                if on_response is not None and response:
+                    on_response(node, response)
+    return snapshot or (0, {}), dict(final_state)
+
+
+def _turn_record(result: Tuple[Tuple[int, dict], dict]) -> Dict[str, Any]:
+    """세션 레지스트리에 남길 턴 결과"""
+    return {"next_step": result[1].get("next_step")}
+
+
+def _shape_turn(
+    snapshot: Tuple[int, dict],
+    final_messages: List[Dict[str, Any]],
+    ui_data: dict,
+    view: View,
+) -> Tuple[List[Dict[str, Any]], dict]:
+    """
+    view=compact: 이번 턴에 추가된 메시지와 ui_data 변경분만
+    view=full: 전체 메시지와 전체 ui_data
+    """
+    if view == "full":
+        return final_messages, ui_data
+    prev_count, prev_ui_data = snapshot
+    return final_messages[prev_count:], dict_delta(prev_ui_data, ui_data)
 
-        # 최종 메시지 히스토리 저장
-        final_state["messages"] = final_messages
 
-        # ui_data 구성
-        ui_data = final_state.get("last_ui_data", {})
-        ui_data["corporation"] = (final_state.get("corporation") or {}).get("name")
-        ui_data["centers"] = final_state.get("centers", [])
-        ui_data["center_networks"] = final_state.get("center_networks", {})
-        ui_data["scope_details"] = final_state.get(
-            "scope_details", {}
-        )  # 스코프 상세 정보 추가
-
-        current_center_index = final_state.get("current_center_index", 0)
-        centers = final_state.get("centers", [])
-        ui_data["current_center"] = (
-            centers[current_center_index]
-            if centers and 0 <= current_center_index < len(centers)
-            else None
+@router.post("/{run_id}/message", response_model=ChatResponse)
+async def send_message(
+    run_id: str,
+    req: ChatRequest,
+    view: View = "compact",
+    fields: Optional[str] = None,
+):
+    """
+    챗봇에 메시지 전송 - 간단한 invoke 방식
+
+    - view=compact(기본): 새 메시지와 ui_data 변경분만, state 생략
+    - view=full: 전체 messages / ui_data / state
+    - fields=a,b: state에서 지정한 키만 포함
+
+    같은 run_id의 턴은 순서대로 하나씩 실행되고, 같은 메시지의 재시도는
+    아직 진행 중인 턴의 결과를 그대로 받음 (/stream과 공유)
+    """
+    try:
+        logger.info(
+            "chat message received",
+            extra={"fields": {"run_id": run_id, "message_len": len(req.message)}},
         )
-        ui_data["current_index"] = current_center_index
-        ui_data["total_centers"] = len(centers)
 
-        print(f"UI data: {ui_data}")
-        print("=== End of message processing ===\n")
+        snapshot, final_state = await run_exclusive(
+            run_id,
+            _run_turn,
+            run_id,
+            req.message,
+            coalesce_key=content_key("chat", req.message),
+            record=_turn_record,
+        )
+        final_messages = final_state.get("messages", [])
+        ui_data = _turn_ui_data(final_state)
+
+        logger.info(
+            "chat message processed",
+            extra={
+                "fields": {
+                    "run_id": run_id,
+                    "next_step": final_state.get("next_step"),
+                    "center_index": final_state.get("current_center_index"),
+                    "messages": len(final_messages),
+                }
+            },
+        )
+
+        out_messages, out_ui_data = _shape_turn(snapshot, final_messages, ui_data, view)
 
         return ChatResponse(
             run_id=run_id,
-            messages=[ChatMessage(**msg) for msg in final_messages],
+            messages=[ChatMessage(**msg) for msg in out_messages],
             current_step=final_state.get("next_step", "corp-center"),
             next_step=final_state.get("next_step"),
-            state=final_state,
-            ui_data=ui_data,
+            state=project_state(final_state, view, fields),
+            ui_data=out_ui_data,
         )
 
+    except (SessionBusy, VersionConflict) as e:
+        # 다른 요청(워커)이 같은 세션의 턴을 실행 중 -> 클라이언트가 재시도
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("chat message failed", extra={"fields": {"run_id": run_id}})
 
-        # 에러 메시지도 채팅 히스토리에 추가
+        # 에러 메시지 (state는 다시 로드하지 않음)
         error_message = ChatMessage(
             role="assistant",
             content=f"죄송합니다. 처리 중 오류가 발생했습니다: {str(e)}",
             timestamp=datetime.now().isoformat(),
         )
+        return ChatResponse(
+            run_id=run_id,
+            messages=[error_message],
+            current_step="error",
+            state=project_state({}, view, fields),
+            ui_data={"error": str(e)},
+        )
+
+
+def _sse(event: str, data: Any) -> str:
+    """Server-Sent Events 한 건 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _iter_chunks(text: str) -> Iterator[str]:
+    """어시스턴트 말풍선을 줄 단위로 나눠 점진적으로 전송"""
+    for line in text.splitlines(keepends=True):
+        yield line
+
+
+@router.post("/{run_id}/stream")
+async def stream_message(run_id: str, req: ChatRequest, view: View = "compact"):
+    """
+    챗봇에 메시지 전송 - SSE 스트리밍 방식
+
+    이벤트 순서:
+      - start: 요청 수신 즉시 (첫 바이트)
+      - node: 그래프 노드 실행 완료마다
+      - delta: 노드가 어시스턴트 응답을 만든 즉시 말풍선을 줄 단위로
+               (중복 재시도로 합쳐진 요청은 done 직전에 최종 응답으로)
+      - done: messages / next_step / ui_data (view 규칙은 /message와 동일)
+      - error: 처리 중 오류
+    """
+
+    async def event_stream():
+        yield _sse("start", {"run_id": run_id})
+
+        events: asyncio.Queue = asyncio.Queue()
+        streamed = False
+
+        def on_response(node: str, response: str) -> None:
+            for chunk in _iter_chunks(response):
+                events.put_nowait(("delta", {"node": node, "content": chunk}))
+
+        async def turn():
+            async with session_turn(run_id) as fields:
+                result = await _astream_turn(
+                    run_id,
+                    req.message,
+                    lambda data: events.put_nowait(("node", data)),
+                    on_response,
+                )
+                fields.update(_turn_record(result))
+                return result
+
+        # 중복 재시도면 node / delta 이벤트 없이 원래 턴의 결과만 받음
+        task = asyncio.ensure_future(
+            TURNS.run((run_id, content_key("chat", req.message)), turn)
+        )
+        while True:
+            getter = asyncio.ensure_future(events.get())
+            done, _ = await asyncio.wait(
+                {task, getter}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if getter in done:
+                event, data = getter.result()
+                streamed = streamed or event == "delta"
+                yield _sse(event, data)
+                continue
+            getter.cancel()
+            break
+        while not events.empty():
+            event, data = events.get_nowait()
+            streamed = streamed or event == "delta"
+            yield _sse(event, data)
 
         try:
-            state = _load_state(run_id)
-            messages = state.get("messages", [])
-            messages.append(error_message.model_dump())
-
-            return ChatResponse(
-                run_id=run_id,
-                messages=[error_message],
-                current_step="error",
-                state=state,
-                ui_data={"error": str(e)},
+            snapshot, final_state = task.result()
+        except (SessionBusy, VersionConflict) as e:
+            yield _sse(
+                "error", {"message": str(e), "current_step": "busy", "status": 409}
             )
-        except:
-            return ChatResponse(
-                run_id=run_id,
-                messages=[error_message],
-                current_step="error",
-                state={},
-                ui_data={"error": str(e)},
+            return
+        except Exception as e:
+            logger.exception("chat stream failed", extra={"fields": {"run_id": run_id}})
+            yield _sse(
+                "error",
+                {
+                    "message": f"죄송합니다. 처리 중 오류가 발생했습니다: {str(e)}",
+                    "current_step": "error",
+                },
             )
+            return
+
+        final_messages = final_state.get("messages", [])
+        out_messages, out_ui_data = _shape_turn(
+            snapshot, final_messages, _turn_ui_data(final_state), view
+        )
+
+        if not streamed:
+            # 다른 요청의 턴 결과를 받은 경우 -> 최종 응답으로
+            for chunk in _iter_chunks(final_state.get("last_response") or ""):
+                yield _sse("delta", {"content": chunk})
+
+        yield _sse(
+            "done",
+            {
+                "run_id": run_id,
+                "messages": out_messages,
+                "current_step": final_state.get("next_step", "corp-center"),
+                "next_step": final_state.get("next_step"),
+                "ui_data": out_ui_data,
+            },
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{run_id}/history", response_model=ChatResponse)
-def get_chat_history(run_id: str):
-    """채팅 히스토리 조회"""
+def get_chat_history(run_id: str, view: View = "compact", fields: Optional[str] = None):
+    """채팅 히스토리 조회 (state는 view=full 또는 fields 지정 시에만)"""
     try:
         state = _load_state(run_id)
         messages = state.get("messages", [])
         current_step = state.get("next_step", "corp-center")
 
         # ui_data 구성
-        ui_data = {}
-        ui_data["corporation"] = (state.get("corporation") or {}).get("name")
-        ui_data["centers"] = state.get("centers", [])
-        ui_data["center_networks"] = state.get("center_networks", {})
-
-        current_center_index = state.get("current_center_index", 0)
-        centers = state.get("centers", [])
-        ui_data["current_center"] = (
-            centers[current_center_index]
-            if centers and 0 <= current_center_index < len(centers)
-            else None
-        )
-        ui_data["current_index"] = current_center_index
-        ui_data["total_centers"] = len(centers)
+        ui_data = _build_ui_data(state)
 
         return ChatResponse(
             run_id=run_id,
             messages=[ChatMessage(**msg) for msg in messages],
             current_step=current_step,
-            state=state,
+            state=project_state(state, view, fields),
             ui_data=ui_data,
         )
     except HTTPException:
         # 세션이 없으면 빈 히스토리 반환
         return ChatResponse(
-            run_id=run_id, messages=[], current_step="corp-center", state={}
+            run_id=run_id,
+            messages=[],
+            current_step="corp-center",
+            state=project_state({}, view, fields),
         )
+
+
+@router.get("/{run_id}/state")
+def get_state(run_id: str, fields: Optional[str] = None):
+    """전체 state 조회 (fields=a,b 로 일부 키만 선택 가능)"""
+    state = _load_state(run_id)
+    return {"run_id": run_id, "state": project_state(state, "full", fields)}
@@ -1,8 +1,20 @@
 # app/api/routes_export.py
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from app.graph.graph import graph
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.graph.graph import get_graph
+from app.schemas.graphdb_schema import GraphQuery, GraphQueryResult
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 router = APIRouter(prefix="/export", tags=["export"])
 
@@ -15,7 +27,7 @@ def export_scope_details(run_id: str):
     """
     try:
         config = {"configurable": {"thread_id": run_id}}
-        snap = graph.get_state(config)
+        snap = get_graph().get_state(config)
 
         if snap is None:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -40,36 +52,266 @@ def export_scope_details(run_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/all-sessions")
-def export_all_sessions():
+def _load_state(run_id: str) -> Dict[str, Any]:
+    snap = get_graph().get_state({"configurable": {"thread_id": run_id}})
+    state = getattr(snap, "values", None) or {}
+    if not state:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return state
+
+
+DIAGRAM_MEDIA_TYPES = {
+    "mermaid": "text/plain; charset=utf-8",
+    "svg": "image/svg+xml",
+}
+
+
+@router.get("/{run_id}/diagram")
+def export_diagram(
+    run_id: str,
+    format: str = Query("mermaid", pattern="^(json|mermaid|svg)$"),
+    layout: str = Query("layered", pattern="^(layered|grid)$"),
+):
     """
-    모든 세션의 scope_details 추출
+    조립된 구성도(state["diagram"])를 Mermaid / SVG로 스트리밍
+    (scope 클러스터 단위 렌더 캐시 사용)
+    - layout: SVG 노드 배치 (layered: 계층형, grid: 격자)
+    """
+    from app.diagram.render import iter_render
+
+    diagram = _load_state(run_id).get("diagram")
+    if not diagram:
+        raise HTTPException(status_code=404, detail="Diagram not assembled yet")
+    if format == "json":
+        return diagram
+    kwargs = {}
+    if format == "svg":
+        kwargs["layout"] = "layered" if layout == "layered" else None
+    return StreamingResponse(
+        (chunk.encode("utf-8") for chunk in iter_render(diagram, format, **kwargs)),
+        media_type=DIAGRAM_MEDIA_TYPES[format],
+    )
+
+
+@router.post("/{run_id}/diagram/query", response_model=GraphQueryResult)
+def query_diagram(run_id: str, query: GraphQuery):
+    """
+    조립된 구성도에 그래프 질의 (CSR + BFS / Dijkstra, 인프로세스)
+    - query_type: neighbors | k_hop | shortest_path | zone_external
+    - query_string: 시작 노드 (id / 이름) 또는 zone (scope_key / 표시명)
+    - parameters: k, target, scope, max_depth, max_paths,
+      weights({관계: 가중치}, 0 이상 유한값 - 아니면 400)
+    - zone_external: zone -> ExternalSystem 관계 방향 단순 경로 전부 (max_depth 이내)
+    """
+    from app.diagram.query import GraphQueryEngine
+
+    diagram = _load_state(run_id).get("diagram")
+    if not diagram:
+        raise HTTPException(status_code=404, detail="Diagram not assembled yet")
+    try:
+        engine = GraphQueryEngine(diagram, weights=query.parameters.get("weights"))
+        # 내부 레코드 -> dict, pydantic 검증은 response_model에서 한 번
+        return engine.run(query).to_dict()
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Node not found: {e.args[0]}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
-    주의: MemorySaver는 모든 세션 목록을 제공하지 않으므로
-    실제로는 run_id를 알아야 함
+def _iter_diagram_revisions(run_id: str) -> Iterator[tuple]:
     """
-    # MemorySaver의 경우 내부 storage에 직접 접근
-    from app.graph.graph import checkpointer
+    체크포인트 히스토리(최신 -> 과거)에서 구성도가 바뀐 지점만 lazy하게
+    (checkpoint_id, created_at, signature, diagram, 같은 구성도의 checkpoint_id 집합)
+    - 리비전 하나는 더 과거 쪽에서 구성도가 바뀌는 순간 확정되어 나옴
+    """
+    from app.diagram.diff import diagram_signature
 
-    if hasattr(checkpointer, "storage"):
-        all_data = []
-        for thread_id, checkpoint_data in checkpointer.storage.items():
-            # checkpoint_data 구조 확인 필요
-            if isinstance(checkpoint_data, dict):
-                state = checkpoint_data.get("checkpoint", {})
-            else:
-                state = checkpoint_data
+    config = {"configurable": {"thread_id": run_id}}
+    current = None
+    for snap in get_graph().get_state_history(config):
+        diagram = (snap.values or {}).get("diagram")
+        if not diagram:
+            continue
+        # 스냅샷마다 새로 역직렬화된 dict라 객체 id로 캐시하면 주소 재사용으로 꼬임
+        sig = diagram_signature(diagram)
+        checkpoint_id = snap.config["configurable"].get("checkpoint_id")
+        if current is not None and current[2] == sig:
+            # 같은 구성도가 이어지면 가장 처음 만들어진 체크포인트로
+            current = (checkpoint_id, snap.created_at, sig, diagram, current[4])
+            current[4].add(checkpoint_id)
+            continue
+        if current is not None:
+            yield current
+        current = (checkpoint_id, snap.created_at, sig, diagram, {checkpoint_id})
+    if current is not None:
+        yield current
+
+
+def _diagram_revisions(run_id: str) -> list:
+    """[(checkpoint_id, created_at, signature, diagram), ...] (최신 -> 과거)"""
+    return [rev[:4] for rev in _iter_diagram_revisions(run_id)]
 
-            scope_details = (
-                state.get("scope_details", {}) if isinstance(state, dict) else {}
-            )
 
-            if scope_details:
-                all_data.append({"run_id": thread_id, "scope_details": scope_details})
+def _diagram_at(run_id: str, checkpoint_id: str) -> Dict[str, Any]:
+    config = {"configurable": {"thread_id": run_id, "checkpoint_id": checkpoint_id}}
+    snap = get_graph().get_state(config)
+    diagram = (getattr(snap, "values", None) or {}).get("diagram")
+    if not diagram:
+        raise HTTPException(
+            status_code=404, detail=f"No diagram at checkpoint: {checkpoint_id}"
+        )
+    return diagram
+
+
+@router.get("/{run_id}/diagram/revisions")
+def list_diagram_revisions(run_id: str):
+    """구성도 리비전 목록 (최신순, 구성도가 바뀐 체크포인트만)"""
+    revisions = _diagram_revisions(run_id)
+    if not revisions:
+        raise HTTPException(status_code=404, detail="Diagram not assembled yet")
+    return {
+        "run_id": run_id,
+        "revisions": [
+            {
+                "checkpoint_id": checkpoint_id,
+                "created_at": created_at,
+                "signature": sig,
+                "nodes": len(diagram.get("nodes") or []),
+                "edges": len(diagram.get("edges") or []),
+            }
+            for checkpoint_id, created_at, sig, diagram in revisions
+        ],
+    }
+
+
+@router.get("/{run_id}/diagram/diff")
+def diff_diagram(
+    run_id: str,
+    base: Optional[str] = Query(None, description="기준 checkpoint_id"),
+    target: Optional[str] = Query(None, description="비교 checkpoint_id"),
+):
+    """
+    두 구성도 리비전 비교 (노드 / 엣지 id 기준 added / removed / changed)
+    - target 생략: 최신 구성도
+    - base 생략: target 바로 이전 리비전 (없으면 빈 구성도 -> 전부 added)
+    - clusters.changed / added: 다시 렌더할 scope (나머지는 렌더 캐시 그대로)
+    """
+    from app.diagram.diff import diff_diagrams
 
-        return {"total_sessions": len(all_data), "sessions": all_data}
+    if base is not None and target is not None:
+        base_diagram = _diagram_at(run_id, base)
+        target_diagram = _diagram_at(run_id, target)
+    else:
+        # target 리비전과 그 바로 이전(더 과거) 리비전까지만 히스토리를 훑음
+        revisions = _iter_diagram_revisions(run_id)
+        found = next((r for r in revisions if target is None or target in r[4]), None)
+        if found is None:
+            if target is None:
+                raise HTTPException(status_code=404, detail="Diagram not assembled yet")
+            raise HTTPException(
+                status_code=404, detail=f"No diagram at checkpoint: {target}"
+            )
+        if target is None:
+            target = found[0]
+        target_diagram = found[3]
+        if base is None:
+            older = next(revisions, None)
+            base, base_diagram = (older[0], older[3]) if older else (None, {})
+        else:
+            base_diagram = _diagram_at(run_id, base)
 
     return {
-        "error": "Cannot access checkpointer storage",
-        "message": "Use Redis checkpointer for production",
+        "run_id": run_id,
+        "base": base,
+        "target": target,
+        **diff_diagrams(base_diagram, target_diagram),
     }
+
+
+def _iter_sessions(
+    since: Optional[datetime] = None,
+    include_empty: bool = False,
+    include_diagram: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """세션별 최신 scope_details / edges (체크포인터를 lazy하게 순회)"""
+    from app.graph.checkpointer import iter_latest_states
+
+    for run_id, ts, state in iter_latest_states(get_graph().checkpointer, since):
+        scope_details = state.get("scope_details") or {}
+        edges = state.get("edges") or {}
+        if not include_empty and not scope_details and not edges:
+            continue
+        row = {
+            "run_id": run_id,
+            "updated_at": ts,
+            "next_step": state.get("next_step"),
+            "scope_details": scope_details,
+            "edges": edges,
+        }
+        if include_diagram:
+            row["diagram"] = state.get("diagram")
+        yield row
+
+
+def _ndjson_line(row: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+@router.get("/sessions.ndjson")
+def export_sessions_ndjson(
+    since: Optional[datetime] = None,
+    include_empty: bool = False,
+    include_diagram: bool = False,
+):
+    """
+    모든 세션의 최신 scope_details / edges를 NDJSON으로 스트리밍
+    (한 줄 = 한 세션, GLiNER 학습 데이터 야간 수집용)
+
+    - since: 이 시각 이후 갱신된 세션만 (ISO 8601, timezone 없으면 UTC)
+    - include_empty: scope_details / edges가 비어있는 세션도 포함
+    - include_diagram: 조립된 구성도도 포함 (scripts/export_graphdb.py 입력용)
+    """
+    rows = (
+        _ndjson_line(row)
+        for row in _iter_sessions(since, include_empty, include_diagram)
+    )
+    return StreamingResponse(rows, media_type="application/x-ndjson")
+
+
+@router.get("/gliner.jsonl")
+def export_gliner_jsonl(
+    since: Optional[datetime] = None, workers: int = Query(4, ge=1, le=32)
+):
+    """
+    세션 후보를 GLiNER2 학습 JSONL로 바로 스트리밍
+    (gliner2.training.data.InputExample 형식, 텍스트 해시로 중복 제거)
+    """
+    from app.extract.training_export import iter_training_records
+    from app.graph.checkpointer import iter_thread_ids, load_latest_state
+
+    checkpointer = get_graph().checkpointer
+
+    def load(thread_id: str) -> Optional[Dict[str, Any]]:
+        latest = load_latest_state(checkpointer, thread_id, since)
+        return latest[1] if latest else None
+
+    records = iter_training_records(iter_thread_ids(checkpointer), load, workers)
+    return StreamingResponse(
+        (_ndjson_line(r) for r in records), media_type="application/x-ndjson"
+    )
+
+
+@router.get("/all-sessions")
+def export_all_sessions():
+    """
+    모든 세션의 scope_details 추출
+    (세션이 많으면 /export/sessions.ndjson 사용)
+    """
+    all_data = [
+        {"run_id": row["run_id"], "scope_details": row["scope_details"]}
+        for row in _iter_sessions()
+        if row["scope_details"]
+    ]
+    return {"total_sessions": len(all_data), "sessions": all_data}
@@ -1,33 +1,37 @@
 # app/api/routes_sessions.py
 from __future__ import annotations
 
-import uuid
+import copy
+import time
 from fastapi import APIRouter
 from datetime import datetime
+from typing import Any, Dict, List
 
-from app.graph.graph import graph
-from app.schemas.ui_payloads import ChatMessage
+from app.core.logging import get_logger
+from app.core.store import get_session_store
+from app.graph.graph import get_graph
+from app.schemas.ui_payloads import (
+    BulkCreateSessionsRequest,
+    BulkCreateSessionsResponse,
+    ChatMessage,
+    ReplayRequest,
+    ReplayResponse,
+    ReplayRunResult,
+    ReplayTurn,
+)
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
+logger = get_logger(__name__)
 
-@router.post("")
-def create_session():
-    """
-    새 세션 생성 - 간단한 초기화
+WELCOME_MESSAGE = '안녕하세요! 구성도 생성 도구입니다.\n\n어떤 법인의 구성도를 만들어드릴까요?\n법인명과 센터 정보를 알려주세요.\n\n예시: "법인은 은행이고 AWS, 의왕으로 구성되어있습니다"'
 
-    초기 상태만 설정하고, 그래프는 첫 메시지에서 시작
-    """
-    run_id = f"run-{uuid.uuid4().hex[:16]}"
 
-    # 환영 메시지
+def _initial_state(run_id: str, created_at: str) -> Dict[str, Any]:
     welcome_message = ChatMessage(
-        role="assistant",
-        content='안녕하세요! 구성도 생성 도구입니다.\n\n어떤 법인의 구성도를 만들어드릴까요?\n법인명과 센터 정보를 알려주세요.\n\n예시: "법인은 은행이고 AWS, 의왕으로 구성되어있습니다"',
-        timestamp=datetime.now().isoformat(),
+        role="assistant", content=WELCOME_MESSAGE, timestamp=created_at
     )
-
-    init_state = {
+    return {
         "run_id": run_id,
         "raw_text": None,
         "corporation": None,
@@ -47,24 +51,136 @@ def create_session():
         "last_ui_data": {},
     }
 
-    config = {"configurable": {"thread_id": run_id}}
 
-    # 초기 상태를 저장 - invoke로 한 번만 실행
+def _registry_entry(state: Dict[str, Any], created_at: str) -> Dict[str, Any]:
+    return {
+        "run_id": state["run_id"],
+        "created_at": created_at,
+        "next_step": state.get("next_step"),
+    }
+
+
+def _persist(state: Dict[str, Any]) -> None:
+    """
+    state를 체크포인트로 바로 기록 (노드 실행 없이 chat_handler 출력으로 간주)
+    -> invoke와 같은 상태(wait_for_input 앞에서 대기)를 체크포인트 1개로
+    """
+    config = {"configurable": {"thread_id": state["run_id"]}}
+    get_graph().update_state(config, state, as_node="chat_handler")
+
+
+@router.post("")
+def create_session():
+    """
+    새 세션 생성 - 간단한 초기화
+
+    초기 상태만 설정하고, 그래프는 첫 메시지에서 시작
+    """
+    store = get_session_store()
+    run_id = store.new_run_id()
+    created_at = datetime.now().isoformat()
+    init_state = _initial_state(run_id, created_at)
+
     try:
-        # 그래프를 통해 초기 상태 저장
-        result = graph.invoke(init_state, config=config)
-        print(f"Session created: {run_id}")
-        print(f"Initial state saved: {type(result)}")
-    except Exception as e:
-        print(f"Error initializing session: {e}")
-        import traceback
+        _persist(init_state)
+        logger.info("session created", extra={"fields": {"run_id": run_id}})
+    except Exception:
+        logger.exception(
+            "session initialization failed", extra={"fields": {"run_id": run_id}}
+        )
 
-        traceback.print_exc()
-        result = init_state
+    # 세션 레지스트리 (워커 간 공유, 이미 있는 run_id면 VersionConflict)
+    store.set(run_id, _registry_entry(init_state, created_at), expected_version=0)
 
     return {
         "run_id": run_id,
-        "state": result if isinstance(result, dict) else init_state,
-        "messages": [welcome_message.model_dump()],
+        "state": init_state,
+        "messages": init_state["messages"],
         "current_step": "corp-center",
     }
+
+
+@router.post("/bulk", response_model=BulkCreateSessionsResponse)
+def create_sessions_bulk(req: BulkCreateSessionsRequest):
+    """세션 N개 일괄 생성 (부하 테스트용, 레지스트리는 한 번에 기록)"""
+    t0 = time.perf_counter()
+    store = get_session_store()
+    created_at = datetime.now().isoformat()
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    for _ in range(req.count):
+        state = _initial_state(store.new_run_id(), created_at)
+        _persist(state)
+        entries[state["run_id"]] = _registry_entry(state, created_at)
+    store.set_many(entries)
+
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    logger.info(
+        "sessions created",
+        extra={"fields": {"count": req.count, "elapsed_ms": round(elapsed_ms, 1)}},
+    )
+    return BulkCreateSessionsResponse(
+        run_ids=list(entries), created=len(entries), elapsed_ms=round(elapsed_ms, 3)
+    )
+
+
+@router.post("/replay", response_model=ReplayResponse)
+def replay_sessions(req: ReplayRequest):
+    """
+    메시지 시나리오를 process_chat_message로 직접 재생 (HTTP 왕복 없음)
+
+    - repeat: 같은 시나리오를 독립된 세션 N개로 재생
+    - expect_next_step: 턴별 기대 단계 (다르면 failures에 집계)
+    - persist: 최종 state를 저장해 /chat/{run_id}로 이어서 확인 가능
+    """
+    from app.graph.replay import run_script
+
+    turns: List[ReplayTurn] = [
+        t if isinstance(t, ReplayTurn) else ReplayTurn(message=t) for t in req.turns
+    ]
+    store = get_session_store()
+    created_at = datetime.now().isoformat()
+    template = _initial_state("", created_at)
+
+    t0 = time.perf_counter()
+    runs: List[ReplayRunResult] = []
+    entries: Dict[str, Dict[str, Any]] = {}
+    for _ in range(req.repeat):
+        state = copy.deepcopy(template)
+        state["run_id"] = store.new_run_id()
+        state, results = run_script(state, turns)
+        if req.persist:
+            _persist(state)
+            entries[state["run_id"]] = _registry_entry(state, created_at)
+        runs.append(
+            ReplayRunResult(
+                run_id=state["run_id"],
+                next_step=state.get("next_step"),
+                failures=sum(1 for r in results if not r.ok),
+                turns=results if req.include_transcript else None,
+            )
+        )
+    if entries:
+        store.set_many(entries)
+
+    elapsed = time.perf_counter() - t0
+    total_turns = len(turns) * req.repeat
+    failures = sum(r.failures for r in runs)
+    logger.info(
+        "replay finished",
+        extra={
+            "fields": {
+                "repeat": req.repeat,
+                "turns": total_turns,
+                "failures": failures,
+                "elapsed_ms": round(elapsed * 1000, 1),
+            }
+        },
+    )
+    return ReplayResponse(
+        runs=runs,
+        total_turns=total_turns,
+        failures=failures,
+        elapsed_ms=round(elapsed * 1000, 3),
+        turns_per_second=round(total_turns / elapsed, 2) if elapsed > 0 else 0.0,
+    )
@@ -1,10 +1,13 @@
 # app/api/routes_steps.py
 from __future__ import annotations
-from fastapi import APIRouter, HTTPException
-from langfuse.langchain import CallbackHandler
+from typing import Any, Dict, Optional
 
+from fastapi import APIRouter, HTTPException
 
-from app.graph.graph import graph
+from app.api.views import View, project_state
+from app.core.concurrency import run_exclusive
+from app.core.langfuse_client import with_tracing
+from app.graph.graph import get_graph
 from app.schemas.ui_payloads import (
     CorpCenterStepRequest,
     NetworksStepRequest,
@@ -20,71 +23,87 @@ router = APIRouter(prefix="/steps", tags=["steps"])
 
 
 def _load_state(run_id: str) -> dict:
-    snap = graph.get_state(config={"configurable": {"thread_id": run_id}})
+    snap = get_graph().get_state(config={"configurable": {"thread_id": run_id}})
     if snap is None or snap.values is None:
         raise HTTPException(status_code=404, detail="run_id not found")
     return dict(snap.values)
 
 
 def _invoke(run_id: str, state: dict) -> dict:
-    langfuse_handler = CallbackHandler(
-        session_id=run_id,
-        # user_id="(로그인 유저 있으면 여기에)",
-        # tags=["graph_lang", state.get("requested_step", "unknown")],
-    )
-
-    return graph.invoke(
-        state,
-        config={
-            "configurable": {"thread_id": run_id},
-            "callbacks": [langfuse_handler],
-            "metadata": {
-                "run_id": run_id,
-                "requested_step": state.get("requested_step"),
-            },
+    config = {
+        "configurable": {"thread_id": run_id},
+        "metadata": {
+            "run_id": run_id,
+            "requested_step": state.get("requested_step"),
         },
-    )
+    }
+    return get_graph().invoke(state, config=with_tracing(config, run_id))
 
 
-@router.post("/{run_id}/corp-center", response_model=StepResponse)
-def post_corp_center(run_id: str, req: CorpCenterStepRequest):
+def _apply_step(run_id: str, updates: Dict[str, Any]) -> dict:
     state = _load_state(run_id)
+    state.update(updates)
+    return _invoke(run_id, state)
+
+
+async def _step(run_id: str, updates: Dict[str, Any]) -> dict:
+    """
+    load -> 입력 반영 -> invoke 를 run_id 잠금 안에서 실행
+    단계 요청은 병합하지 않음 (/next-scope처럼 입력이 매번 같은 명령도 호출마다 한 번씩 진행)
+    """
+    return await run_exclusive(
+        run_id,
+        _apply_step,
+        run_id,
+        updates,
+        record=lambda state: {"next_step": state.get("next_step")},
+    )
 
-    state["corporation"] = {"name": req.corporation}
-    state["centers"] = req.centers
-    state["requested_step"] = "corp_center"
 
-    new_state = _invoke(run_id, state)
+@router.post("/{run_id}/corp-center", response_model=StepResponse)
+async def post_corp_center(
+    run_id: str,
+    req: CorpCenterStepRequest,
+    view: View = "compact",
+    fields: Optional[str] = None,
+):
+    new_state = await _step(
+        run_id,
+        {
+            "corporation": {"name": req.corporation},
+            "centers": req.centers,
+            "requested_step": "corp_center",
+        },
+    )
     return StepResponse(
         run_id=run_id,
-        state=new_state,
+        state=project_state(new_state, view, fields),
         next_step="networks",
         message="법인/센터 저장 완료",
     )
 
 
 @router.post("/{run_id}/networks", response_model=StepResponse)
-def post_networks(run_id: str, req: NetworksStepRequest):
-    state = _load_state(run_id)
-
-    state["networks_payload"] = req.model_dump()
-    state["requested_step"] = "networks"
-
-    new_state = _invoke(run_id, state)
+async def post_networks(
+    run_id: str,
+    req: NetworksStepRequest,
+    view: View = "compact",
+    fields: Optional[str] = None,
+):
+    new_state = await _step(
+        run_id, {"networks_payload": req.model_dump(), "requested_step": "networks"}
+    )
     return StepResponse(
         run_id=run_id,
-        state=new_state,
+        state=project_state(new_state, view, fields),
         next_step="next-scope",
         message="통신망/장비 저장 완료",
     )
 
 
 @router.post("/{run_id}/next-scope", response_model=NextScopeResponse)
-def next_scope(run_id: str):
-    state = _load_state(run_id)
-    state["requested_step"] = "next_scope"
-
-    new_state = _invoke(run_id, state)
+async def next_scope(run_id: str, view: View = "compact", fields: Optional[str] = None):
+    new_state = await _step(run_id, {"requested_step": "next_scope"})
     cur = new_state.get("current_scope")
     remaining = len(new_state.get("pending_scopes") or [])
 
@@ -95,7 +114,7 @@ def next_scope(run_id: str):
             "remaining": 0,
             "next_step": "edges",
             "message": "pending_scopes 소진 (다음: edges)",
-            "state": new_state,
+            "state": project_state(new_state, view, fields),
         }
 
     return {
@@ -104,37 +123,41 @@ def next_scope(run_id: str):
         "remaining": remaining,
         "next_step": "scope-detail",
         "message": f"다음 scope 준비: {cur.get('display')}",
-        "state": new_state,
+        "state": project_state(new_state, view, fields),
     }
 
 
 @router.post("/{run_id}/scope-detail", response_model=ScopeDetailResponse)
-def scope_detail(run_id: str, req: ScopeDetailRequest):
-    state = _load_state(run_id)
-
-    state["scope_detail_text"] = req.detail_text
-    state["requested_step"] = "scope_detail"
-
-    new_state = _invoke(run_id, state)
+async def scope_detail(
+    run_id: str,
+    req: ScopeDetailRequest,
+    view: View = "compact",
+    fields: Optional[str] = None,
+):
+    new_state = await _step(
+        run_id,
+        {"scope_detail_text": req.detail_text, "requested_step": "scope_detail"},
+    )
     return {
         "run_id": run_id,
+        "current_scope": new_state.get("current_scope"),
+        "remaining": len(new_state.get("pending_scopes") or []),
         "next_step": "next-scope",
         "message": "scope-detail 저장 완료",
-        "state": new_state,
+        "state": project_state(new_state, view, fields),
     }
 
 
 @router.post("/{run_id}/edges", response_model=EdgesResponse)
-def post_edges(run_id: str, req: EdgesRequest):
-    state = _load_state(run_id)
-
-    state["edge_text"] = req.edge_text
-    state["requested_step"] = "edges"
-
-    new_state = _invoke(run_id, state)
+async def post_edges(
+    run_id: str, req: EdgesRequest, view: View = "compact", fields: Optional[str] = None
+):
+    new_state = await _step(
+        run_id, {"edge_text": req.edge_text, "requested_step": "edges"}
+    )
     return {
         "run_id": run_id,
         "next_step": new_state.get("next_step", "done"),
         "message": "엣지 텍스트 저장 완료",
-        "state": new_state,
+        "state": project_state(new_state, view, fields),
     }
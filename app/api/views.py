@@ -0,0 +1,66 @@
+# app/api/views.py
+"""
+API 응답 경량화 유틸
+
+- view=compact(기본): state 제외, 이번 턴의 변경분만
+- view=full: 전체 state 포함 (기존 응답 형태)
+- fields=a,b,c: state에서 지정한 키만 포함
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+View = Literal["compact", "full"]
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson이 있으면 orjson으로, 없으면 표준 json으로 직렬화"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """'a, b,c' -> ['a', 'b', 'c'] (비어있으면 None)"""
+    if not fields:
+        return None
+    out = [f.strip() for f in fields.split(",") if f.strip()]
+    return out or None
+
+
+def project_state(
+    state: Dict[str, Any], view: View = "compact", fields: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    응답에 실을 state 선택
+    - fields 지정 시: 해당 키만
+    - full: 전체
+    - compact: None (state 생략)
+    """
+    keys = parse_fields(fields)
+    if keys is not None:
+        return {k: state.get(k) for k in keys if k in state}
+    if view == "full":
+        return state
+    return None
+
+
+def dict_delta(prev: Dict[str, Any], cur: Dict[str, Any]) -> Dict[str, Any]:
+    """prev 대비 바뀐 키만 반환 (사라진 키는 None)"""
+    delta = {k: v for k, v in cur.items() if prev.get(k) != v}
+    for k in prev:
+        if k not in cur:
+            delta[k] = None
+    return delta
@@ -1,11 +1,17 @@
 # app/core/candidates.py
+from threading import Lock
+
 from app.extract.candidate_extractor import CandidateExtractor
 
 _ce = None
+_ce_lock = Lock()
 
 
 def get_candidate_extractor() -> CandidateExtractor:
+    # 추출 스레드 풀 / 워밍업 스레드가 동시에 처음 호출해도 한 번만 생성
     global _ce
     if _ce is None:
-        _ce = CandidateExtractor()
+        with _ce_lock:
+            if _ce is None:
+                _ce = CandidateExtractor()
     return _ce
@@ -0,0 +1,154 @@
+# app/core/concurrency.py
+"""
+세션(run_id) 단위 직렬화 + 중복 요청 병합
+
+- 같은 run_id의 턴은 한 번에 하나만 실행 (load -> invoke -> checkpoint 사이에
+  다른 요청이 끼어들어 current_center_index / pending_scopes가 꼬이는 것 방지)
+- UI 재시도로 같은 내용이 앞 요청이 아직 실행 중일 때 다시 오면 새로 실행하지 않고
+  그 결과를 같이 돌려줌 (끝난 턴의 결과는 재사용하지 않음 -> 같은 메시지를
+  연달아 보내면 두 번 다 실행됨)
+- 프로세스 로컬 잠금 + SessionStore 턴 lease (version 검사)
+  -> 다른 워커가 같은 run_id 턴을 실행 중이면 SessionBusy / VersionConflict (409)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.core.metrics import REGISTRY
+from app.core.settings import settings
+from app.core.store import get_session_store
+
+COALESCED = REGISTRY.counter(
+    "session_coalesced_requests_total",
+    "Duplicate requests served from an in-flight turn",
+    ("kind",),
+)
+
+
+class KeyedLocks:
+    """키별 asyncio.Lock (대기자가 없어지면 정리)"""
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable):
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] == 0:
+                del self._waiters[key]
+                del self._locks[key]
+
+    def locked(self, key: Hashable) -> bool:
+        lock = self._locks.get(key)
+        return bool(lock and lock.locked())
+
+
+class Coalescer:
+    """
+    같은 키의 요청을 하나로 병합
+    - 실행 중이면 그 결과를 기다림 (실행이 끝나면 키는 바로 비워짐)
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        kind: str = "turn",
+    ) -> Any:
+        if key in self._inflight:
+            COALESCED.inc(kind)
+            return await asyncio.shield(self._inflight[key])
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # 대기자가 없을 때 "never retrieved" 경고 방지
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+
+def content_key(*parts: Any) -> str:
+    """요청 내용 해시 (병합 키용)"""
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(repr(p).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+SESSION_LOCKS = KeyedLocks()
+TURNS = Coalescer()
+
+
+@asynccontextmanager
+async def session_turn(run_id: str):
+    """
+    run_id 턴 구간: 프로세스 내 잠금 -> store lease 획득 -> (턴) -> lease 해제
+    블록 안에서 yield된 dict에 넣은 값은 레지스트리 항목에 같이 기록
+    """
+    async with SESSION_LOCKS.hold(run_id):
+        store = get_session_store()
+        claim = await asyncio.to_thread(
+            store.begin_turn, run_id, settings.SESSION_TURN_LEASE_SECONDS
+        )
+        fields: Dict[str, Any] = {}
+        try:
+            yield fields
+        finally:
+            await asyncio.to_thread(store.end_turn, run_id, claim, **fields)
+
+
+async def run_exclusive(
+    run_id: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    coalesce_key: Optional[str] = None,
+    kind: str = "turn",
+    record: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> Any:
+    """
+    session_turn 안에서 동기 함수 fn을 스레드에서 실행
+    - coalesce_key가 있으면 동시에 실행 중인 같은 (run_id, key) 요청은 한 번만 실행
+    - record(result): 레지스트리에 남길 값 (next_step 등)
+    """
+
+    async def call():
+        async with session_turn(run_id) as fields:
+            task = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+            try:
+                result = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                # 클라이언트가 끊겨도 스레드의 invoke는 계속 돌므로 끝날 때까지 잠금 유지
+                await asyncio.wait({task})
+                raise
+            if record is not None:
+                fields.update(record(result))
+            return result
+
+    if coalesce_key is None:
+        return await call()
+    return await TURNS.run((run_id, coalesce_key), call, kind=kind)
@@ -1,8 +1,52 @@
 from __future__ import annotations
 
+import atexit
+from threading import RLock
+from typing import Any, Dict, Optional
+
+from app.core.logging import get_logger
 from app.core.settings import settings
 
+logger = get_logger(__name__)
+
+# 프로세스당 하나의 client / CallbackHandler 를 재사용
+# - langfuse는 키가 있을 때만 import (미사용 시 import 비용 0)
+# - 이벤트 전송은 langfuse client의 백그라운드 배치 flush에 맡김
+_client = None
 _handler = None
+_unavailable = False
+_lock = RLock()
+
+
+def tracing_enabled() -> bool:
+    return bool(settings.LANGFUSE_PUBLIC_KEY and settings.LANGFUSE_SECRET_KEY)
+
+
+def _get_client():
+    """Langfuse client 싱글톤 (배치 크기/주기는 settings에서)"""
+    global _client, _unavailable
+
+    if _client is not None or _unavailable or not tracing_enabled():
+        return _client
+
+    with _lock:
+        if _client is None and not _unavailable:
+            try:
+                from langfuse import Langfuse
+            except ImportError:
+                logger.warning("langfuse keys set but langfuse is not installed")
+                _unavailable = True
+                return None
+
+            _client = Langfuse(
+                public_key=settings.LANGFUSE_PUBLIC_KEY,
+                secret_key=settings.LANGFUSE_SECRET_KEY,
+                host=settings.LANGFUSE_BASE_URL,
+                flush_at=settings.LANGFUSE_FLUSH_AT,
+                flush_interval=settings.LANGFUSE_FLUSH_INTERVAL,
+            )
+            atexit.register(shutdown_tracing)
+    return _client
 
 
 def get_langfuse_handler():
@@ -11,12 +55,59 @@ def get_langfuse_handler():
     """
     global _handler
 
-    if not settings.LANGFUSE_PUBLIC_KEY or not settings.LANGFUSE_SECRET_KEY:
+    if _handler is not None:
+        return _handler
+    if _get_client() is None:
         return None
 
-    if _handler is None:
-        # langfuse>=2 + langfuse-langchain 환경 가정
-        from langfuse.langchain import CallbackHandler
+    with _lock:
+        if _handler is None:
+            from langfuse.langchain import CallbackHandler
 
-        _handler = CallbackHandler()
+            _handler = CallbackHandler(public_key=settings.LANGFUSE_PUBLIC_KEY)
     return _handler
+
+
+def with_tracing(config: Dict[str, Any], run_id: str) -> Dict[str, Any]:
+    """
+    graph.invoke config에 tracing 설정을 합쳐서 반환.
+    - 비활성화면 config 그대로 (fast path)
+    - 세션 구분은 handler 재생성 대신 metadata(langfuse_session_id)로
+    """
+    handler = get_langfuse_handler()
+    if handler is None:
+        return config
+
+    out = dict(config)
+    out["callbacks"] = list(out.get("callbacks") or []) + [handler]
+    out["metadata"] = {**(out.get("metadata") or {}), "langfuse_session_id": run_id}
+    return out
+
+
+def shutdown_tracing() -> None:
+    """남은 이벤트 flush (프로세스 종료 시)"""
+    client: Optional[Any] = _client
+    if client is None:
+        return
+    try:
+        client.flush()
+    except Exception:
+        logger.debug("langfuse flush failed", exc_info=True)
+
+
+def record_node_span(name: str, metadata: Dict[str, Any]) -> None:
+    """
+    노드 타이밍을 Langfuse span으로 전송 (키가 없거나 비활성화면 no-op)
+    tracing 실패가 노드 실행을 깨뜨리지 않도록 예외는 삼킴
+    """
+    if not settings.METRICS_LANGFUSE_SPANS:
+        return
+    client = _get_client()
+    if client is None:
+        return
+
+    try:
+        span = client.start_span(name=f"node:{name}", metadata=metadata)
+        span.end()
+    except Exception:
+        logger.debug("langfuse span failed", exc_info=True)
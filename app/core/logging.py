@@ -1,17 +1,147 @@
+# app/core/logging.py
+"""
+구조화 로깅
+
+- 요청 경로에서는 QueueHandler에만 기록하고, 실제 stdout 쓰기는
+  QueueListener 스레드가 담당 (요청 스레드가 I/O에 블로킹되지 않음)
+- 요청마다 request_id(correlation id)를 contextvar로 전파
+- 후보 덤프처럼 장황한 로그는 should_sample()로 샘플링
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
-from core.settings import settings
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from app.core.settings import settings
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_listener: Optional[QueueListener] = None
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """레코드에 현재 request_id를 부착 (호출 스레드에서 실행되어야 함)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON. extra={"fields": {...}}로 넘긴 값은 최상위 키로 합쳐짐"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if isinstance(fields, dict):
+            payload.update(fields)
+        if record.exc_info or record.exc_text:
+            payload["exc_info"] = record.exc_text or self.formatException(
+                record.exc_info
+            )
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """
+    기본 QueueHandler.prepare는 메시지를 미리 문자열로 포맷하면서
+    exc_info를 지워버리므로, 포맷은 listener 쪽 formatter에 맡긴다.
+    """
 
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
 
-def setup_logging():
-    """Configure application logging"""
-    logging.basicConfig(
-        level=getattr(logging, settings.log_level.upper()),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
+
+def setup_logging() -> None:
+    """Configure application logging (여러 번 호출해도 한 번만 적용)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
 
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance"""
     return logging.getLogger(name)
+
+
+def should_sample(rate: Optional[float] = None) -> bool:
+    """장황한 로그(후보 전체 덤프 등)를 남길지 샘플링"""
+    rate = settings.LOG_SAMPLE_RATE if rate is None else rate
+    return rate >= 1.0 or random.random() < rate
+
+
+class RequestIdMiddleware:
+    """
+    요청마다 request_id를 contextvar에 설정하고 응답 헤더로 돌려줌.
+    클라이언트가 X-Request-ID를 보내면 그대로 사용.
+    """
+
+    header = "x-request-id"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers") or []:
+            if key.decode("latin-1").lower() == self.header:
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or uuid.uuid4().hex[:16]
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((self.header.encode(), request_id.encode()))
+                message["headers"] = headers
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
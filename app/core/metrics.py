@@ -0,0 +1,158 @@
+# app/core/metrics.py
+"""
+Prometheus 텍스트 포맷 메트릭 (외부 의존성 없는 최소 구현)
+
+- Counter / Histogram만 지원
+- 라벨 조합별로 값을 보관, render()로 /metrics 응답 생성
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from threading import Lock
+from typing import Dict, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7)
+
+
+def _fmt_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_value(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for lv, v in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_fmt_labels(self.labels, lv)} {_fmt_value(v)}"
+                )
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label -> (bucket별 count, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, n = self._values.get(
+                label_values, ([0] * (len(self.buckets) + 1), 0.0, 0)
+            )
+            counts[idx] += 1
+            self._values[label_values] = (counts, total + value, n + 1)
+
+    def count(self, *label_values: str) -> int:
+        entry = self._values.get(label_values)
+        return entry[2] if entry else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for lv, (counts, total, n) in sorted(self._values.items()):
+                cum = 0
+                for bound, c in zip(self.buckets + (math.inf,), counts):
+                    cum += c
+                    le = f'le="{_fmt_value(bound)}"'
+                    lines.append(
+                        f"{self.name}_bucket{_fmt_labels(self.labels, lv, le)} {cum}"
+                    )
+                lines.append(
+                    f"{self.name}_sum{_fmt_labels(self.labels, lv)} {_fmt_value(total)}"
+                )
+                lines.append(f"{self.name}_count{_fmt_labels(self.labels, lv)} {n}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help_text, labels))  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ) -> Histogram:
+        return self._metrics.setdefault(  # type: ignore
+            name, Histogram(name, help_text, labels, buckets)
+        )
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())  # type: ignore
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# ---- LangGraph node metrics ----
+NODE_CALLS = REGISTRY.counter(
+    "graph_node_calls_total", "Graph node invocations", ("node", "status")
+)
+NODE_WALL_SECONDS = REGISTRY.histogram(
+    "graph_node_wall_seconds", "Graph node wall-clock time", ("node",)
+)
+NODE_CPU_SECONDS = REGISTRY.histogram(
+    "graph_node_cpu_seconds", "Graph node CPU time (thread)", ("node",)
+)
+NODE_STATE_BYTES = REGISTRY.histogram(
+    "graph_node_state_bytes",
+    "Serialized state size around a graph node",
+    ("node", "direction"),
+    buckets=SIZE_BUCKETS,
+)
+NODE_CANDIDATES = REGISTRY.counter(
+    "graph_node_candidates_total",
+    "Extraction candidates added by a graph node",
+    ("node",),
+)
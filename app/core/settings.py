@@ -7,10 +7,43 @@ class Settings(BaseSettings):
 
     ENV: str = "local"
 
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" | "text"
+    LOG_SAMPLE_RATE: float = 0.01  # 후보 덤프 등 장황한 DEBUG 로그 샘플링 비율
+
+    # Metrics
+    # 노드 입출력 state 직렬화 크기 측정 비율 (호출마다 state 전체를 직렬화하므로
+    # 기본은 끔, 0.01 = 1% 호출만 측정, 1.0 = 매번)
+    METRICS_STATE_SIZE_SAMPLE_RATE: float = 0.0
+    METRICS_LANGFUSE_SPANS: bool = False  # 노드 타이밍을 Langfuse span으로도 전송
+
+    # Session store / checkpointer
+    # memory:// | redis://host:6379/0 | fakeredis:// (로컬 테스트)
+    SESSION_STORE_URL: str = "memory://"
+    SESSION_TTL_SECONDS: int = 7 * 24 * 3600
+    # 턴 실행권 lease (이 시간 안에 끝나지 않은 턴은 다른 요청이 가져갈 수 있음)
+    SESSION_TURN_LEASE_SECONDS: float = 300.0
+    # 지정 시 그래프 체크포인트를 SQLite 파일에 저장
+    CHECKPOINTER_SQLITE_PATH: str | None = None
+
+    # Diagram
+    ID_MODE: str = "content"  # "content"(내용 해시, 결정적) | "random"(uuid)
+    GRAPHDB_EXPORT_BATCH_SIZE: int = 1000  # UNWIND 한 문 / CSV flush 한 번의 행 수
+    GRAPHDB_EXPORT_BATCHES_PER_FILE: int = 50  # 적재 파일 하나에 담을 batch 수
+
+    # Extraction
+    # 센터별 네트워크 동시 추출 스레드 수 (1 = 순차, 기본: 동시 추출 꺼짐)
+    # 기본 추출기는 순수 파이썬(GIL)이라 스레드를 늘려도 빨라지지 않음.
+    # GIL을 놓는 추출기(GLiNER 모델 추론 등)를 쓸 때만 2 이상으로 켬
+    NETWORKS_EXTRACT_WORKERS: int = 1
+
     # Langfuse
     LANGFUSE_PUBLIC_KEY: str | None = None
     LANGFUSE_SECRET_KEY: str | None = None
     LANGFUSE_BASE_URL: str = "https://cloud.langfuse.com"
+    LANGFUSE_FLUSH_AT: int = 64  # 이벤트 배치 크기
+    LANGFUSE_FLUSH_INTERVAL: float = 5.0  # 배치 flush 주기(초)
 
 
 settings = Settings()
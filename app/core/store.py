@@ -1,12 +1,301 @@
-class InMemoryStore:
+# app/core/store.py
+"""
+세션 저장소 (프로세스 간 공유 가능한 단일 인터페이스)
+
+- SessionStore: get / set / get_many / set_many / update
+- 모든 값은 version(1부터 증가)과 함께 저장 -> set(expected_version=)으로
+  낙관적 동시성 제어 (다른 워커가 먼저 쓰면 VersionConflict)
+- 턴 실행권: begin_turn / end_turn (run_id 레지스트리 항목에 lease 기록)
+  -> 여러 워커가 같은 run_id 턴을 동시에 시작하면 하나만 성공
+- 백엔드는 SESSION_STORE_URL로 선택
+  - memory://              프로세스 로컬 (개발용, 기본값)
+  - redis://host:6379/0    Redis 프로토콜 (redis-py)
+  - fakeredis://           로컬 테스트용 Redis 대체 (fakeredis)
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+logger = get_logger(__name__)
+
+State = Dict[str, Any]
+
+TURN_LEASE_KEY = "turn_started_at"
+
+
+class VersionConflict(Exception):
+    """expected_version과 저장된 version이 다름 (다른 요청이 먼저 씀)"""
+
+    def __init__(self, run_id: str, expected: int, actual: int):
+        super().__init__(f"{run_id}: expected version {expected}, found {actual}")
+        self.run_id = run_id
+        self.expected = expected
+        self.actual = actual
+
+
+class SessionBusy(Exception):
+    """다른 요청(워커)이 이 run_id의 턴을 실행 중"""
+
+    def __init__(self, run_id: str, started_at: float):
+        super().__init__(f"{run_id}: turn already running since {started_at:.0f}")
+        self.run_id = run_id
+        self.started_at = started_at
+
+
+@dataclass
+class Versioned:
+    state: State
+    version: int
+
+
+def _dumps(state: State) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(state, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes | str) -> State:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class SessionStore(ABC):
+    """
+    expected_version 규칙
+    - None: 무조건 덮어쓰기
+    - 0: 새로 생성할 때만 (이미 있으면 충돌)
+    - n: 현재 version이 n일 때만
+    """
+
+    def new_run_id(self) -> str:
+        return f"run-{uuid.uuid4().hex[:16]}"
+
+    @abstractmethod
+    def get(self, run_id: str) -> Optional[Versioned]: ...
+
+    @abstractmethod
+    def get_many(self, run_ids: Iterable[str]) -> Dict[str, Optional[Versioned]]: ...
+
+    @abstractmethod
+    def set(
+        self, run_id: str, state: State, expected_version: Optional[int] = None
+    ) -> int: ...
+
+    @abstractmethod
+    def set_many(self, items: Dict[str, State]) -> Dict[str, int]: ...
+
+    @abstractmethod
+    def delete(self, run_id: str) -> None: ...
+
+    @abstractmethod
+    def iter_ids(self) -> Iterator[str]: ...
+
+    def update(
+        self, run_id: str, fn: Callable[[State], State], retries: int = 5
+    ) -> Versioned:
+        """read-modify-write, 충돌 시 다시 읽어서 재시도"""
+        for attempt in range(retries + 1):
+            cur = self.get(run_id)
+            base, version = (cur.state, cur.version) if cur else ({}, 0)
+            new_state = fn(dict(base))
+            try:
+                return Versioned(new_state, self.set(run_id, new_state, version))
+            except VersionConflict:
+                if attempt == retries:
+                    raise
+        raise AssertionError("unreachable")
+
+    def begin_turn(self, run_id: str, lease_seconds: float) -> Versioned:
+        """
+        턴 실행권 획득: 읽은 version 그대로 lease를 기록 (재시도 없음)
+        - lease가 살아 있으면 SessionBusy
+        - 동시에 다른 워커가 먼저 기록하면 VersionConflict
+        """
+        cur = self.get(run_id)
+        state, version = (cur.state, cur.version) if cur else ({"run_id": run_id}, 0)
+        now = time.time()
+        started = state.get(TURN_LEASE_KEY)
+        if started and now - started < lease_seconds:
+            raise SessionBusy(run_id, started)
+        state = {**state, TURN_LEASE_KEY: now}
+        return Versioned(state, self.set(run_id, state, expected_version=version))
+
+    def end_turn(self, run_id: str, claim: Versioned, **fields: Any) -> None:
+        """lease 해제 + 턴 결과 기록 (claim 이후 version이 바뀌었으면 경고만)"""
+        state = {**claim.state, **fields, TURN_LEASE_KEY: None}
+        state["updated_at"] = time.time()
+        try:
+            self.set(run_id, state, expected_version=claim.version)
+        except VersionConflict as e:
+            # lease 만료 후 다른 워커가 가져감 -> 그쪽 기록을 덮지 않음
+            logger.warning(
+                "turn lease lost",
+                extra={"fields": {"run_id": run_id, "actual": e.actual}},
+            )
+
+
+class InMemorySessionStore(SessionStore):
     def __init__(self):
-        self._data = {}
+        self._lock = Lock()
+        self._data: Dict[str, Versioned] = {}
+
+    def get(self, run_id: str) -> Optional[Versioned]:
+        with self._lock:
+            cur = self._data.get(run_id)
+            return Versioned(dict(cur.state), cur.version) if cur else None
+
+    def get_many(self, run_ids: Iterable[str]) -> Dict[str, Optional[Versioned]]:
+        return {rid: self.get(rid) for rid in run_ids}
+
+    def set(
+        self, run_id: str, state: State, expected_version: Optional[int] = None
+    ) -> int:
+        with self._lock:
+            cur = self._data.get(run_id)
+            actual = cur.version if cur else 0
+            if expected_version is not None and expected_version != actual:
+                raise VersionConflict(run_id, expected_version, actual)
+            self._data[run_id] = Versioned(dict(state), actual + 1)
+            return actual + 1
+
+    def set_many(self, items: Dict[str, State]) -> Dict[str, int]:
+        return {rid: self.set(rid, state) for rid, state in items.items()}
+
+    def delete(self, run_id: str) -> None:
+        with self._lock:
+            self._data.pop(run_id, None)
+
+    def iter_ids(self) -> Iterator[str]:
+        with self._lock:
+            ids = list(self._data)
+        return iter(ids)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    세션 하나 = hash 하나 (session:{run_id} -> {v: version, s: state})
+    - get_many / set_many: pipeline으로 왕복 1회
+    - set(expected_version=): WATCH/MULTI/EXEC 낙관적 잠금
+    """
+
+    def __init__(self, client, prefix: str = "session:", ttl: Optional[int] = None):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, run_id: str) -> str:
+        return f"{self.prefix}{run_id}"
+
+    @staticmethod
+    def _decode(raw: List[Any]) -> Optional[Versioned]:
+        version, payload = raw
+        if version is None or payload is None:
+            return None
+        return Versioned(_loads(payload), int(version))
+
+    def get(self, run_id: str) -> Optional[Versioned]:
+        return self._decode(self.client.hmget(self._key(run_id), "v", "s"))
+
+    def get_many(self, run_ids: Iterable[str]) -> Dict[str, Optional[Versioned]]:
+        run_ids = list(run_ids)
+        pipe = self.client.pipeline(transaction=False)
+        for rid in run_ids:
+            pipe.hmget(self._key(rid), "v", "s")
+        return {rid: self._decode(raw) for rid, raw in zip(run_ids, pipe.execute())}
+
+    def _write(self, pipe, key: str, state: State, version: int) -> None:
+        pipe.hset(key, mapping={"v": version, "s": _dumps(state)})
+        if self.ttl:
+            pipe.expire(key, self.ttl)
+
+    def set(
+        self, run_id: str, state: State, expected_version: Optional[int] = None
+    ) -> int:
+        from redis.exceptions import WatchError
+
+        key = self._key(run_id)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                raw = pipe.hget(key, "v")
+                actual = int(raw) if raw is not None else 0
+                if expected_version is not None and expected_version != actual:
+                    raise VersionConflict(run_id, expected_version, actual)
+                pipe.multi()
+                self._write(pipe, key, state, actual + 1)
+                pipe.execute()
+                return actual + 1
+            except WatchError:
+                # WATCH 이후 다른 클라이언트가 먼저 씀
+                current = self.client.hget(key, "v")
+                raise VersionConflict(
+                    run_id,
+                    expected_version if expected_version is not None else actual,
+                    int(current) if current is not None else 0,
+                )
+
+    def set_many(self, items: Dict[str, State]) -> Dict[str, int]:
+        """버전 검사 없이 일괄 덮어쓰기 (HINCRBY로 version 증가)"""
+        pipe = self.client.pipeline(transaction=True)
+        for rid, state in items.items():
+            key = self._key(rid)
+            pipe.hincrby(key, "v", 1)
+            pipe.hset(key, "s", _dumps(state))
+            if self.ttl:
+                pipe.expire(key, self.ttl)
+        results = pipe.execute()
+        step = 3 if self.ttl else 2
+        return {rid: int(results[i * step]) for i, rid in enumerate(items)}
+
+    def delete(self, run_id: str) -> None:
+        self.client.delete(self._key(run_id))
+
+    def iter_ids(self) -> Iterator[str]:
+        for key in self.client.scan_iter(match=f"{self.prefix}*", count=500):
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            yield key[len(self.prefix) :]
+
+
+def build_session_store(url: str) -> SessionStore:
+    ttl = settings.SESSION_TTL_SECONDS or None
+    if url.startswith("memory://"):
+        return InMemorySessionStore()
+    if url.startswith("fakeredis://"):
+        import fakeredis
+
+        return RedisSessionStore(fakeredis.FakeRedis(), ttl=ttl)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis
+
+        return RedisSessionStore(redis.Redis.from_url(url), ttl=ttl)
+    raise ValueError(f"unsupported SESSION_STORE_URL: {url}")
 
-    def get(self, run_id):
-        return self._data.get(run_id)
 
-    def set(self, run_id, state):
-        self._data[run_id] = state
+_store: Optional[SessionStore] = None
+_store_lock = Lock()
 
 
-store = InMemoryStore()
+def get_session_store() -> SessionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = build_session_store(settings.SESSION_STORE_URL)
+    return _store
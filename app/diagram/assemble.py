@@ -0,0 +1,289 @@
+# app/diagram/assemble.py
+"""
+scope_details + edges.by_scope (후보 dict) -> DiagramGraph
+
+- Diagram -> Corporation -> Center -> NetworkZone 골격
+  (루트 Diagram 이름은 법인 기준, run_id는 속성)
+- scope 상세 텍스트의 후보를 줄 단위로 묶어 엔티티 라벨 추정
+  (Engine/DBMS 힌트 -> DBMS, Interface 힌트 -> Interface,
+   장비 힌트 -> NetworkDevice, 대외/기관 키워드 -> ExternalSystem, 그 외 Server)
+- 엣지 텍스트는 연결자(->, <-, <->, ' - ' ...)로 나눠 앞뒤 엔티티를 CONNECTED_TO로 연결
+  (scope 상세에 없던 엔티티는 origin="edges"로 표시)
+- 후보/줄/세그먼트를 한 번씩만 훑음 (입력 크기에 선형)
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.diagram.model import DiagramGraph
+from app.diagram.schema import ZONE_MEMBER_RELATION
+
+NAME_TYPES = {"NameCandidate", "QuotedNameCandidate"}
+DBMS_HINTS = {"EngineHint", "DBMSRoleHint"}
+DEVICE_HINTS = {"DeviceTypeHint", "DeviceSubtypeHint"}
+
+EXTERNAL_RE = re.compile(r"대외|외부\s*기관|기관|external", re.IGNORECASE)
+CONNECTOR_RE = re.compile(r"\s*(<->|↔|<-|←|->|→|=>|⇒)\s*|\s+(--?|~)\s+")
+REVERSE_CONNECTORS = {"<-", "←"}
+
+Entity = Tuple[str, str]  # (label, name)
+
+
+# =========================================================
+# Candidate grouping
+# =========================================================
+def _segments(text: str) -> List[Tuple[int, int]]:
+    """줄 단위 (start, end) 구간"""
+    out: List[Tuple[int, int]] = []
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        out.append((pos, pos + len(line.rstrip("\r\n"))))
+        pos += len(line)
+    return out or [(0, len(text))]
+
+
+def _group_by_segment(
+    segments: List[Tuple[int, int]], candidates: Iterable[Dict[str, Any]]
+) -> List[List[Dict[str, Any]]]:
+    starts = [s for s, _ in segments]
+    groups: List[List[Dict[str, Any]]] = [[] for _ in segments]
+    for c in candidates:
+        span = c.get("span") or (0, 0)
+        i = bisect_right(starts, span[0]) - 1
+        if i >= 0 and span[0] < segments[i][1]:
+            groups[i].append(c)
+    return groups
+
+
+def _overlaps(a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+    return a[0] < b[1] and b[0] < a[1]
+
+
+def _segment_label(text: str, cands: List[Dict[str, Any]]) -> str:
+    """세그먼트(줄) 안 힌트로 이름 후보의 라벨 추정"""
+    types = {c.get("type") for c in cands}
+    if types & DBMS_HINTS or any(
+        c.get("type") == "ServerClassHint" and c.get("normalized") == "DB"
+        for c in cands
+    ):
+        return "DBMS"
+    if "InterfaceHint" in types:
+        return "Interface"
+    if types & DEVICE_HINTS:
+        return "NetworkDevice"
+    if EXTERNAL_RE.search(text):
+        return "ExternalSystem"
+    return "Server"
+
+
+def _devices(text: str, cands: List[Dict[str, Any]]) -> List[str]:
+    """이름 없는 장비 힌트 -> 장비명 ('IRT 라우터', 'L4 스위치')"""
+    subtypes = sorted(
+        (c for c in cands if c.get("type") == "DeviceSubtypeHint"),
+        key=lambda c: c["span"][0],
+    )
+    out: List[str] = []
+    used = set()
+    for c in sorted(cands, key=lambda c: c["span"][0]):
+        if c.get("type") != "DeviceTypeHint":
+            continue
+        start, end = c["span"]
+        for sub in subtypes:
+            s, e = sub["span"]
+            if e <= start and not text[e:start].strip():
+                start = s
+                used.add(s)
+        out.append(text[start:end])
+    # 타입 없이 서브타입만 있는 경우 ('L4', 'IRT')
+    for sub in subtypes:
+        if sub["span"][0] not in used and not any(
+            sub["span"][0] >= c["span"][0] and sub["span"][1] <= c["span"][1]
+            for c in cands
+            if c.get("type") == "DeviceTypeHint"
+        ):
+            out.append(sub.get("text") or "")
+    return [d for d in out if d.strip()]
+
+
+def segment_entities(text: str, cands: List[Dict[str, Any]]) -> List[Entity]:
+    """한 세그먼트의 엔티티 목록 (등장 순서)"""
+    label = _segment_label(text, cands)
+    dbms_spans = [
+        tuple(c["span"]) for c in cands if c.get("type") in DBMS_HINTS and c.get("span")
+    ]
+
+    out: List[Entity] = []
+    names = sorted(
+        (c for c in cands if c.get("type") in NAME_TYPES),
+        key=lambda c: c["span"][0],
+    )
+    for c in names:
+        name = (c.get("text") or "").strip()
+        if not name:
+            continue
+        span = tuple(c["span"])
+        own = "DBMS" if any(_overlaps(span, s) for s in dbms_spans) else label
+        out.append((own, name))
+
+    if not names:
+        out.extend(("NetworkDevice", d) for d in _devices(text, cands))
+        out.extend(
+            ("Interface", (c.get("text") or "").strip())
+            for c in cands
+            if c.get("type") == "InterfaceHint" and (c.get("text") or "").strip()
+        )
+    return out
+
+
+# =========================================================
+# Assembly
+# =========================================================
+class _Assembler:
+    def __init__(self, state: Dict[str, Any]) -> None:
+        self.state = state
+        self.g = DiagramGraph()
+        self.centers: Dict[str, int] = {}
+        self.zones: Dict[str, int] = {}  # scope_key -> NetworkZone index
+        self.corp: Optional[int] = None
+        self.unresolved: List[Dict[str, Any]] = []
+
+    def center(self, name: str) -> int:
+        idx = self.centers.get(name)
+        if idx is None:
+            idx = self.g.add_node("Center", name)
+            self.centers[name] = idx
+            if self.corp is not None:
+                self.g.add_edge(self.corp, "HAS_CENTER", idx)
+        return idx
+
+    def place(self, label: str, name: str, scope: Optional[str], **props: Any) -> int:
+        """엔티티 노드 추가 + 소속 관계 (zone / center)"""
+        idx = self.g.add_node(label, name, scope, **props)
+        if scope is None or scope not in self.zones:
+            return idx
+        if label == "NetworkDevice":
+            center = self.g.props[self.zones[scope]].get("center")
+            self.g.add_edge(self.center(center), "HAS_DEVICE", idx, scope)
+        elif label in ZONE_MEMBER_RELATION:
+            self.g.add_edge(idx, ZONE_MEMBER_RELATION[label], self.zones[scope], scope)
+        return idx
+
+    def skeleton(self) -> None:
+        state, g = self.state, self.g
+        corp_name = (state.get("corporation") or {}).get("name")
+        # 루트 이름(-> content id)은 법인 기준이라 세션이 달라도 같음, run_id는 속성으로만
+        # (법인 노드와 이름이 겹치면 엣지 이름 조회가 루트로 갈 수 있어 접미사를 붙임)
+        run_id = state.get("run_id")
+        root = g.add_node(
+            "Diagram",
+            f"{corp_name} 구성도" if corp_name else "diagram",
+            **({"run_id": run_id} if run_id else {}),
+        )
+        if corp_name:
+            self.corp = g.add_node("Corporation", corp_name)
+            g.add_edge(root, "HAS_COVERS", self.corp)
+        for c in state.get("centers") or []:
+            self.center(c)
+
+    def scopes(self) -> None:
+        for key, detail in (self.state.get("scope_details") or {}).items():
+            detail = detail or {}
+            sc = detail.get("scope") or {}
+            center = sc.get("center") or key.split(":", 1)[0]
+            zone = sc.get("zone") or key.split(":", 1)[-1]
+            zone_idx = self.g.add_node(
+                "NetworkZone",
+                sc.get("display") or key,
+                key,
+                center=center,
+                zone=zone,
+            )
+            self.zones[key] = zone_idx
+            self.g.add_edge(self.center(center), "HAS_ZONE", zone_idx, key)
+
+        for key, detail in (self.state.get("scope_details") or {}).items():
+            text = (detail or {}).get("text") or ""
+            segs = _segments(text)
+            groups = _group_by_segment(segs, (detail or {}).get("candidates") or [])
+            for (s, e), cands in zip(segs, groups):
+                for label, name in segment_entities(text[s:e], _rebase(cands, s)):
+                    self.place(label, name, key)
+
+    def resolve(self, text: str, cands: List[Dict[str, Any]], scope) -> List[int]:
+        """엣지 세그먼트 -> 노드 index들 (기존 노드 우선, 없으면 새로 배치)"""
+        out: List[int] = []
+        for label, name in segment_entities(text, cands):
+            idx = self.g.lookup(name, scope)
+            if idx is None:
+                # scope 상세에 없던 이름 -> 엣지에서 처음 등장 (검증 시 missing)
+                idx = self.place(label, name, scope, origin="edges")
+            out.append(idx)
+        if not out and text.strip():
+            idx = self.g.lookup(text.strip(), scope)
+            if idx is not None:
+                out.append(idx)
+            else:
+                self.unresolved.append({"text": text.strip(), "scope": scope})
+        return out
+
+    def edges(self) -> None:
+        by_scope = (self.state.get("edges") or {}).get("by_scope") or {}
+        for key, block in by_scope.items():
+            block = block or {}
+            scope = key if key in self.zones else None
+            text = block.get("text") or ""
+            segs = _segments(text)
+            groups = _group_by_segment(segs, block.get("candidates") or [])
+            for (s, e), cands in zip(segs, groups):
+                self.line(text[s:e], _rebase(cands, s), scope)
+
+    def line(self, text: str, cands: List[Dict[str, Any]], scope) -> None:
+        parts: List[Tuple[int, int]] = []
+        connectors: List[str] = []
+        pos = 0
+        for m in CONNECTOR_RE.finditer(text):
+            parts.append((pos, m.start()))
+            connectors.append(m.group(1) or m.group(2))
+            pos = m.end()
+        if not connectors:
+            return
+        parts.append((pos, len(text)))
+
+        groups = _group_by_segment(parts, cands)
+        nodes = [
+            self.resolve(text[s:e], _rebase(g, s), scope)
+            for (s, e), g in zip(parts, groups)
+        ]
+        for i, conn in enumerate(connectors):
+            left, right = nodes[i], nodes[i + 1]
+            if conn in REVERSE_CONNECTORS:
+                left, right = right, left
+            for a in left:
+                for b in right:
+                    if a != b:
+                        self.g.add_edge(a, "CONNECTED_TO", b, scope)
+
+
+def _rebase(cands: List[Dict[str, Any]], offset: int) -> List[Dict[str, Any]]:
+    """span을 세그먼트 기준으로 옮긴 사본"""
+    if not offset:
+        return cands
+    out = []
+    for c in cands:
+        s, e = c.get("span") or (0, 0)
+        out.append({**c, "span": [s - offset, e - offset]})
+    return out
+
+
+def assemble_diagram(
+    state: Dict[str, Any],
+) -> Tuple[DiagramGraph, List[Dict[str, Any]]]:
+    """state -> (DiagramGraph, 해석하지 못한 엣지 세그먼트)"""
+    asm = _Assembler(state)
+    asm.skeleton()
+    asm.scopes()
+    asm.edges()
+    return asm.g, asm.unresolved
@@ -0,0 +1,30 @@
+# app/diagram/csr.py
+"""
+CSR(compressed sparse row) 인접 배열 helper (layout / query 공용)
+
+- csr(n, src, *columns): src 기준 정렬 -> indptr + 같은 순서로 정렬된 열들
+- gather(indptr, nodes): 여러 노드의 CSR 구간을 한 번에 펼침 (frontier 단위 BFS용)
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+
+def csr(n: int, src: np.ndarray, *columns: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """-> (indptr, *columns를 src 순서로 정렬한 배열)"""
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return (indptr,) + tuple(col[order] for col in columns)
+
+
+def gather(indptr: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """nodes의 CSR 구간 index를 한 번에 (구간 index, 각 index의 출처 위치)"""
+    starts, counts = indptr[nodes], indptr[nodes + 1] - indptr[nodes]
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(nodes.size), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets, owner
@@ -0,0 +1,160 @@
+# app/diagram/diff.py
+"""
+구성도 두 리비전 비교 (노드 / 엣지 id 기준, 선형 시간)
+
+- 노드 signature: id·index를 뺀 필드(label, name, scope, 속성) 해시
+- 엣지 signature: (type, source_id, target_id, scope) 해시, 키는 엣지 id
+- id -> signature dict 두 개를 한 번씩 훑어 added / removed / changed 분류
+  (바뀐 항목만 필드 단위로 before/after 계산)
+- clusters: render.build_clusters 서명 비교 -> 바뀐 scope만 다시 그리면 됨
+  (렌더 캐시 키와 같은 서명이라 unchanged 클러스터는 캐시 적중)
+- id가 내용 기반(ID_MODE=content)일 때 의미 있음 (random이면 전부 added/removed)
+"""
+
+from __future__ import annotations
+
+from hashlib import blake2b
+from typing import Any, Dict, List, Tuple
+
+from app.diagram.render import build_clusters
+
+NODE_SKIP = frozenset({"index", "id"})
+EDGE_SKIP = frozenset({"source", "target", "id"})
+
+Signed = Dict[str, Tuple[str, int]]  # id -> (signature, 리스트 index)
+
+
+def _node_id(nodes: List[Dict[str, Any]], i: int) -> str:
+    return nodes[i].get("id") or f"#{i}"
+
+
+def _rest(item: Dict[str, Any], skip: frozenset) -> list:
+    # 값은 str / 숫자 / None 위주라 정렬된 (키, 값) repr로 충분 (json.dumps보다 빠름)
+    return sorted((k, v) for k, v in item.items() if k not in skip)
+
+
+def _digest(raw: str) -> str:
+    return blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def node_fields(node: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(_rest(node, NODE_SKIP))
+
+
+def edge_fields(edge: Dict[str, Any], nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    fields = dict(_rest(edge, EDGE_SKIP))
+    fields["source_id"] = _node_id(nodes, edge["source"])
+    fields["target_id"] = _node_id(nodes, edge["target"])
+    return fields
+
+
+def sign_nodes(diagram: Dict[str, Any]) -> Signed:
+    out: Signed = {}
+    for i, node in enumerate(diagram.get("nodes") or []):
+        out[node.get("id") or f"#{i}"] = (_digest(repr(_rest(node, NODE_SKIP))), i)
+    return out
+
+
+def sign_edges(diagram: Dict[str, Any]) -> Signed:
+    nodes = diagram.get("nodes") or []
+    out: Signed = {}
+    for i, edge in enumerate(diagram.get("edges") or []):
+        src, dst = _node_id(nodes, edge["source"]), _node_id(nodes, edge["target"])
+        raw = f"{src}|{dst}|{_rest(edge, EDGE_SKIP)!r}"
+        out[edge.get("id") or f"{src}|{edge['type']}|{dst}"] = (_digest(raw), i)
+    return out
+
+
+def diagram_signature(diagram: Dict[str, Any]) -> str:
+    """구성도 전체 서명 (노드 / 엣지 서명의 순서 무관 합성)"""
+    h = blake2b(digest_size=16)
+    for kind, signed in (("n", sign_nodes(diagram)), ("e", sign_edges(diagram))):
+        for key in sorted(signed):
+            h.update(f"{kind}|{key}|{signed[key][0]}\x1e".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _diff_signed(
+    base: Signed, target: Signed, base_fields, target_fields
+) -> Dict[str, Any]:
+    """서명 dict 비교 -> 필드 dict는 달라진 항목만 만듦 (*_fields: index -> 필드)"""
+    added = [
+        {"id": key, **target_fields(i)}
+        for key, (_, i) in target.items()
+        if key not in base
+    ]
+    removed = [
+        {"id": key, **base_fields(i)}
+        for key, (_, i) in base.items()
+        if key not in target
+    ]
+    changed = []
+    unchanged = 0
+    for key, (sig, i) in target.items():
+        old = base.get(key)
+        if old is None:
+            continue
+        if old[0] == sig:
+            unchanged += 1
+            continue
+        before, after = base_fields(old[1]), target_fields(i)
+        changed.append(
+            {
+                "id": key,
+                "fields": {
+                    f: [before.get(f), after.get(f)]
+                    for f in before.keys() | after.keys()
+                    if before.get(f) != after.get(f)
+                },
+            }
+        )
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "unchanged": unchanged,
+    }
+
+
+def _diff_clusters(base: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    old = {k: c.signature for k, c in build_clusters(base).items()}
+    new = {k: c.signature for k, c in build_clusters(target).items()}
+    return {
+        "added": [k for k in new if k not in old],
+        "removed": [k for k in old if k not in new],
+        "changed": [k for k in new if k in old and old[k] != new[k]],
+        "unchanged": [k for k in new if old.get(k) == new[k]],
+        "signatures": new,
+    }
+
+
+def diff_diagrams(base: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    """base -> target 변경분"""
+    base, target = base or {}, target or {}
+    b_nodes, t_nodes = base.get("nodes") or [], target.get("nodes") or []
+    b_edges, t_edges = base.get("edges") or [], target.get("edges") or []
+    nodes = _diff_signed(
+        sign_nodes(base),
+        sign_nodes(target),
+        lambda i: node_fields(b_nodes[i]),
+        lambda i: node_fields(t_nodes[i]),
+    )
+    edges = _diff_signed(
+        sign_edges(base),
+        sign_edges(target),
+        lambda i: edge_fields(b_edges[i], b_nodes),
+        lambda i: edge_fields(t_edges[i], t_nodes),
+    )
+    clusters = _diff_clusters(base, target)
+    summary = {
+        f"{kind}_{status}": len(part[status])
+        for kind, part in (("nodes", nodes), ("edges", edges))
+        for status in ("added", "removed", "changed")
+    }
+    return {
+        "identical": not any(summary.values()),
+        "summary": summary,
+        "nodes": nodes,
+        "edges": edges,
+        "clusters": clusters,
+    }
@@ -0,0 +1,320 @@
+# app/diagram/graphdb_export.py
+"""
+구성도 -> 그래프 DB(Neo4j) 대량 적재 파일
+
+- cypher : 라벨 / 관계별로 묶은 `UNWIND [...] AS row MERGE ...` 문 (batch_size 행씩)
+           cypher-shell -f 로 constraints -> nodes -> rels 순서로 실행
+- csv    : neo4j-admin database import 용 헤더 + 분할 데이터 파일
+- 행 버퍼는 라벨 / 관계별 batch 하나 크기 (파일은 files_per_chunk 단위로 회전)
+- 노드 / 관계는 id(assign_ids, 내용 기반) 기준으로 한 번만 기록 -> 같은 법인 구성도끼리
+  같은 시스템은 하나의 노드로 합쳐짐
+  (중복 판단용 id 집합은 고유 노드 / 관계 수만큼 커짐)
+- 합쳐진 노드 / 관계는 여러 세션이 공유하므로 run_id는 기록하지 않음
+- 마지막에 manifest.json (적재 순서 / 파일 / 개수)
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+from app.core.settings import settings
+from app.nodes.assign_ids import assign_ids
+
+FORMATS = ("cypher", "csv")
+
+# CSV 노드 속성 열 (라벨마다 다른 속성은 이 열로 통일)
+NODE_CSV_PROPS = ("name", "scope", "center", "zone", "origin")
+REL_CSV_PROPS = ("id", "scope")
+
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_NODE_SKIP = ("index", "id", "label", "run_id")
+
+RowKey = Tuple[str, ...]
+
+
+# =========================================================
+# Cypher literals
+# =========================================================
+def cypher_ident(name: str) -> str:
+    return name if _IDENT_RE.match(name) else "`" + name.replace("`", "``") + "`"
+
+
+def cypher_literal(value: Any) -> str:
+    """파이썬 값 -> Cypher 리터럴 (list / map 재귀)"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value) if math.isfinite(value) else "null"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(cypher_literal(v) for v in value) + "]"
+    if isinstance(value, dict):
+        items = (
+            f"{cypher_ident(str(k))}: {cypher_literal(v)}" for k, v in value.items()
+        )
+        return "{" + ", ".join(items) + "}"
+    text = str(value)
+    text = text.replace("\\", "\\\\").replace("'", "\\'")
+    text = text.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+    return f"'{text}'"
+
+
+# =========================================================
+# Rows
+# =========================================================
+def _node_rows(diagram: Dict[str, Any]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    for node in diagram.get("nodes") or []:
+        props = {
+            k: v
+            for k, v in node.items()
+            # Neo4j 속성에 map은 못 넣음
+            if k not in _NODE_SKIP and v is not None and not isinstance(v, dict)
+        }
+        yield node["label"], {"id": node["id"], "props": props}
+
+
+def _rel_rows(diagram: Dict[str, Any]) -> Iterable[Tuple[RowKey, Dict[str, Any]]]:
+    nodes = diagram.get("nodes") or []
+    for edge in diagram.get("edges") or []:
+        src, dst = nodes[edge["source"]], nodes[edge["target"]]
+        props = {"scope": edge.get("scope")}
+        yield (src["label"], edge["type"], dst["label"]), {
+            "s": src["id"],
+            "t": dst["id"],
+            "id": edge["id"],
+            "props": {k: v for k, v in props.items() if v is not None},
+        }
+
+
+# =========================================================
+# Chunked files
+# =========================================================
+class _ChunkedFile:
+    """prefix_0001.ext, prefix_0002.ext ... (per_file 단위마다 새 파일)"""
+
+    def __init__(self, out_dir: Path, prefix: str, ext: str, per_file: int) -> None:
+        self.out_dir, self.prefix, self.ext = out_dir, prefix, ext
+        self.per_file = max(1, per_file)
+        self.files: List[str] = []
+        self._fh: Optional[TextIO] = None
+        self._count = 0
+
+    def handle(self) -> TextIO:
+        if self._fh is None or self._count >= self.per_file:
+            self.close()
+            path = self.out_dir / f"{self.prefix}_{len(self.files) + 1:04d}.{self.ext}"
+            self._fh = path.open("w", encoding="utf-8", newline="")
+            self.files.append(path.name)
+            self._count = 0
+        self._count += 1
+        return self._fh
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class _Batches:
+    """키별 row 버퍼, batch_size가 차면 flush(key, rows)"""
+
+    def __init__(self, batch_size: int, flush) -> None:
+        self.batch_size = max(1, batch_size)
+        self.flush = flush
+        self.buffers: Dict[Any, List[Dict[str, Any]]] = {}
+
+    def add(self, key: Any, row: Dict[str, Any]) -> None:
+        rows = self.buffers.setdefault(key, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self.flush(key, rows)
+            self.buffers[key] = []
+
+    def drain(self) -> None:
+        for key, rows in self.buffers.items():
+            if rows:
+                self.flush(key, rows)
+        self.buffers.clear()
+
+
+# =========================================================
+# Writers
+# =========================================================
+class CypherWriter:
+    def __init__(self, out_dir: Path, batch_size: int, per_file: int) -> None:
+        self.out_dir = out_dir
+        self.nodes_out = _ChunkedFile(out_dir, "nodes", "cypher", per_file)
+        self.rels_out = _ChunkedFile(out_dir, "rels", "cypher", per_file)
+        self.nodes = _Batches(batch_size, self._flush_nodes)
+        self.rels = _Batches(batch_size, self._flush_rels)
+        self.labels: Set[str] = set()
+        self.statements = 0
+
+    def _flush_nodes(self, label: str, rows: List[Dict[str, Any]]) -> None:
+        self.labels.add(label)
+        self.nodes_out.handle().write(
+            f"UNWIND {cypher_literal(rows)} AS row\n"
+            f"MERGE (n:{cypher_ident(label)} {{id: row.id}})\n"
+            "SET n += row.props;\n"
+        )
+        self.statements += 1
+
+    def _flush_rels(self, key: RowKey, rows: List[Dict[str, Any]]) -> None:
+        head, rel, tail = (cypher_ident(k) for k in key)
+        self.rels_out.handle().write(
+            f"UNWIND {cypher_literal(rows)} AS row\n"
+            f"MATCH (a:{head} {{id: row.s}})\n"
+            f"MATCH (b:{tail} {{id: row.t}})\n"
+            f"MERGE (a)-[r:{rel} {{id: row.id}}]->(b)\n"
+            "SET r += row.props;\n"
+        )
+        self.statements += 1
+
+    def close(self) -> Dict[str, Any]:
+        self.nodes.drain()
+        self.rels.drain()
+        self.nodes_out.close()
+        self.rels_out.close()
+        constraints = self.out_dir / "constraints.cypher"
+        with constraints.open("w", encoding="utf-8") as f:
+            for label in sorted(self.labels):
+                name = cypher_ident(f"{label.lower()}_id")
+                f.write(
+                    f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+                    f"FOR (n:{cypher_ident(label)}) REQUIRE n.id IS UNIQUE;\n"
+                )
+        return {
+            "load_order": [constraints.name]
+            + self.nodes_out.files
+            + self.rels_out.files,
+            "statements": self.statements,
+            "command": "cypher-shell -f <file>",
+        }
+
+
+class CsvWriter:
+    def __init__(self, out_dir: Path, batch_size: int, per_file: int) -> None:
+        self.out_dir = out_dir
+        self.nodes_out = _ChunkedFile(out_dir, "nodes", "csv", per_file)
+        self.rels_out = _ChunkedFile(out_dir, "rels", "csv", per_file)
+        self.nodes = _Batches(batch_size, self._flush_nodes)
+        self.rels = _Batches(batch_size, self._flush_rels)
+
+    def _flush_nodes(self, label: str, rows: List[Dict[str, Any]]) -> None:
+        w = csv.writer(self.nodes_out.handle())
+        for row in rows:
+            props = row["props"]
+            w.writerow(
+                [row["id"]]
+                + [_csv_value(props.get(k)) for k in NODE_CSV_PROPS]
+                + [label]
+            )
+
+    def _flush_rels(self, key: RowKey, rows: List[Dict[str, Any]]) -> None:
+        w = csv.writer(self.rels_out.handle())
+        for row in rows:
+            props = {**row["props"], "id": row["id"]}
+            w.writerow(
+                [row["s"], row["t"], key[1]]
+                + [_csv_value(props.get(k)) for k in REL_CSV_PROPS]
+            )
+
+    def close(self) -> Dict[str, Any]:
+        self.nodes.drain()
+        self.rels.drain()
+        self.nodes_out.close()
+        self.rels_out.close()
+        headers = {
+            "nodes_header.csv": ["id:ID"] + list(NODE_CSV_PROPS) + [":LABEL"],
+            "rels_header.csv": [":START_ID", ":END_ID", ":TYPE"] + list(REL_CSV_PROPS),
+        }
+        for name, header in headers.items():
+            with (self.out_dir / name).open("w", encoding="utf-8", newline="") as f:
+                csv.writer(f).writerow(header)
+        nodes = ",".join(["nodes_header.csv"] + self.nodes_out.files)
+        rels = ",".join(["rels_header.csv"] + self.rels_out.files)
+        return {
+            "load_order": list(headers) + self.nodes_out.files + self.rels_out.files,
+            "command": (
+                f"neo4j-admin database import full --nodes={nodes} "
+                f"--relationships={rels} --skip-duplicate-nodes=true"
+            ),
+        }
+
+
+def _csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+WRITERS = {"cypher": CypherWriter, "csv": CsvWriter}
+
+
+# =========================================================
+# Entry
+# =========================================================
+def export_graphdb(
+    diagrams: Iterable[Tuple[Optional[str], Dict[str, Any]]],
+    out_dir: str,
+    fmt: str = "cypher",
+    batch_size: Optional[int] = None,
+    files_per_chunk: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    (run_id, diagram) 스트림 -> out_dir 아래 적재 파일 + manifest.json
+    - batch_size: UNWIND 한 문(또는 CSV flush 한 번)의 행 수
+    - files_per_chunk: 파일 하나에 담을 batch 수
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported graphdb export format: {fmt}")
+    batch_size = batch_size or settings.GRAPHDB_EXPORT_BATCH_SIZE
+    files_per_chunk = files_per_chunk or settings.GRAPHDB_EXPORT_BATCHES_PER_FILE
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    writer = WRITERS[fmt](out, batch_size, files_per_chunk)
+
+    seen_nodes: Set[str] = set()
+    seen_rels: Set[str] = set()
+    counts = {"diagrams": 0, "nodes": 0, "relationships": 0, "skipped_nodes": 0}
+    for run_id, diagram in diagrams:
+        if not diagram:
+            continue
+        if any(not n.get("id") for n in diagram.get("nodes") or []):
+            assign_ids({"run_id": run_id, "diagram": diagram})
+        counts["diagrams"] += 1
+        for label, row in _node_rows(diagram):
+            if row["id"] in seen_nodes:
+                counts["skipped_nodes"] += 1
+                continue
+            seen_nodes.add(row["id"])
+            writer.nodes.add(label, row)
+            counts["nodes"] += 1
+        for key, row in _rel_rows(diagram):
+            if row["id"] in seen_rels:
+                continue
+            seen_rels.add(row["id"])
+            writer.rels.add(key, row)
+            counts["relationships"] += 1
+
+    manifest = {
+        "format": fmt,
+        "batch_size": batch_size,
+        "files_per_chunk": files_per_chunk,
+        **counts,
+        **writer.close(),
+    }
+    with (out / "manifest.json").open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
@@ -0,0 +1,361 @@
+# app/diagram/layout.py
+"""
+계층형(Sugiyama) 레이아웃 - NumPy 배열 연산
+
+Corporation -> Center -> NetworkZone 구조는 클러스터(센터 열 / zone 박스)로 표현하고
+각 zone 클러스터 안의 노드를 연결 관계 기준으로 층(layer)에 배치.
+모든 클러스터를 한 번에(배열 하나로) 처리.
+
+1) cycle removal : (out - in degree) 내림차순 순서로 간선을 정방향화 -> DAG
+2) layering      : longest path (Kahn frontier 단위 벡터 연산)
+3) dummy node    : 두 층 이상 건너뛰는 간선을 인접 층 간선 체인으로 분해
+4) crossing min  : layer-by-layer barycenter sweep (down/up 교대)
+                   층 l은 방금 갱신된 l-1(up이면 l+1) 순서로 다시 정렬 (층 하나 안에서는
+                   모든 클러스터를 한 번에), 클러스터마다 교차 수가 가장 적은 순서 유지
+5) coordinates   : 층 내 순서 -> x (가운데 정렬), 넓은 층은 여러 줄로 접음
+
+클러스터 결과는 그 클러스터 내용에만 의존 -> 클러스터 서명 단위로 캐시
+(cluster_positions / layout_crossings는 캐시에 없는 클러스터만 배치)
+
+한계: 층 / 순서 / 교차 수는 클러스터 내부 간선만 기준. zone 사이 CONNECTED_TO는
+클러스터 배치(센터 열 / zone 박스)에 맡기고 렌더러가 박스 사이 연결선으로 그림
+(클러스터마다 로컬 좌표계라 서로 다른 박스 노드의 층 내 순서는 비교 대상이 아님)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.diagram.csr import csr, gather
+from app.diagram.render import (
+    GAP,
+    NODE_H,
+    NODE_W,
+    PAD,
+    TITLE_H,
+    Cluster,
+    RenderCache,
+    build_clusters,
+)
+
+Position = Tuple[float, float]
+
+V_GAP = 36.0  # 층 간격
+SMALL_INVERSION = 2048  # 이 크기 이하 블록은 브로드캐스트로 교차 수 계산
+DEFAULT_SWEEPS = 4
+
+# (sweeps, 클러스터 서명) -> 교차 수 (레이아웃은 클러스터 내부만 보므로 같은 서명이면 같음)
+_crossings_cache = RenderCache(maxsize=4096)
+
+
+@dataclass
+class Layout:
+    """노드 index 기준 배열 (dummy 제외, 길이 = 노드 수)"""
+
+    x: np.ndarray  # 클러스터 로컬 중심 좌표
+    y: np.ndarray
+    layer: np.ndarray
+    order: np.ndarray  # 층 내 순서
+    group: np.ndarray  # 클러스터 번호 (-1: 골격 / 클러스터 밖)
+    crossings: int  # 클러스터 내부 인접 층 간선 교차 수 (dummy 포함, zone 간 간선 제외)
+    dummies: int
+    cluster_crossings: np.ndarray  # 클러스터 번호별 교차 수
+
+    def local_positions(self) -> Dict[int, Position]:
+        """render.iter_svg(layout=...)에 넘길 {노드 index: (x, y)}"""
+        idx = np.flatnonzero(self.group >= 0)
+        return {int(i): (float(self.x[i]), float(self.y[i])) for i in idx}
+
+
+# =========================================================
+# Steps
+# =========================================================
+def _acyclic(n: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """degree 차이 기준 선형 순서로 간선을 정방향화 (결과는 항상 DAG)"""
+    if not src.size:
+        return src, dst
+    delta = np.bincount(src, minlength=n) - np.bincount(dst, minlength=n)
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), -delta))] = np.arange(n)
+    flip = rank[src] > rank[dst]
+    src, dst = np.where(flip, dst, src), np.where(flip, src, dst)
+    pairs = np.unique(np.stack([src, dst], axis=1), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _longest_path_layers(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    layer = np.zeros(n, dtype=np.int64)
+    if not src.size:
+        return layer
+    indptr, targets = csr(n, src, dst)
+    indeg = np.bincount(dst, minlength=n)
+    frontier = np.flatnonzero(indeg == 0)
+    while frontier.size:
+        idx, owner = gather(indptr, frontier)
+        if not idx.size:
+            break
+        nbr = targets[idx]
+        np.maximum.at(layer, nbr, layer[frontier][owner] + 1)
+        indeg -= np.bincount(nbr, minlength=n)
+        touched = np.unique(nbr)
+        frontier = touched[indeg[touched] == 0]
+    return layer
+
+
+def _add_dummies(
+    n: int, src: np.ndarray, dst: np.ndarray, layer: np.ndarray, group: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    """층을 건너뛰는 간선 u->v를 u->d1->...->v 체인으로 (벡터화)"""
+    span = layer[dst] - layer[src]
+    long = span > 1
+    if not long.any():
+        return src, dst, layer, group, 0
+
+    ls, ld = src[long], dst[long]
+    d = span[long] - 1
+    total = int(d.sum())
+    first = n + np.cumsum(d) - d  # 각 간선의 첫 dummy id
+    step = np.arange(total) - np.repeat(first - n, d)  # 체인 내 위치 0..d-1
+    dummy_ids = n + np.arange(total)
+    dummy_layer = np.repeat(layer[ls], d) + step + 1
+    dummy_group = np.repeat(group[ls], d)
+
+    last = first + d - 1
+    inner = np.ones(total, dtype=bool)
+    inner[last - n] = False
+    new_src = np.concatenate([src[~long], ls, dummy_ids[inner], last])
+    new_dst = np.concatenate([dst[~long], first, dummy_ids[inner] + 1, ld])
+    return (
+        new_src,
+        new_dst,
+        np.concatenate([layer, dummy_layer]),
+        np.concatenate([group, dummy_group]),
+        total,
+    )
+
+
+def _rank_within(group: np.ndarray, layer: np.ndarray, *keys: np.ndarray) -> np.ndarray:
+    """(group, layer) 블록 안에서 keys 순서의 순위"""
+    idx = np.lexsort(tuple(reversed(keys)) + (layer, group))
+    g, lay = group[idx], layer[idx]
+    start = np.ones(idx.size, dtype=bool)
+    start[1:] = (g[1:] != g[:-1]) | (lay[1:] != lay[:-1])
+    block_start = np.maximum.accumulate(np.where(start, np.arange(idx.size), 0))
+    rank = np.empty(idx.size, dtype=np.int64)
+    rank[idx] = np.arange(idx.size) - block_start
+    return rank
+
+
+def _split_by(key: np.ndarray, items: np.ndarray, n: int) -> list:
+    """key(0..n-1) 값별 items 목록"""
+    idx = np.argsort(key, kind="stable")
+    cuts = np.cumsum(np.bincount(key, minlength=n))[:-1]
+    return np.split(items[idx], cuts)
+
+
+def _inversions(a: np.ndarray) -> int:
+    if a.size < 2:
+        return 0
+    if a.size <= SMALL_INVERSION:
+        return int(np.triu(a[:, None] > a[None, :], 1).sum())
+    # 큰 블록: Fenwick tree
+    values = np.unique(a, return_inverse=True)[1] + 1
+    tree = [0] * (int(values.max()) + 1)
+    count = 0
+    for seen, v in enumerate(values.tolist()):
+        i, le = v, 0
+        while i > 0:
+            le += tree[i]
+            i -= i & -i
+        count += seen - le
+        i = v
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+    return count
+
+
+def crossings_by_group(
+    src: np.ndarray,
+    dst: np.ndarray,
+    group: np.ndarray,
+    layer: np.ndarray,
+    pos,
+    n_groups: int,
+) -> np.ndarray:
+    """클러스터별 인접 층 간선 교차 수 (같은 클러스터 / 같은 층 쌍 블록별 inversion 수)"""
+    out = np.zeros(max(n_groups, 1), dtype=np.int64)
+    if not src.size:
+        return out
+    stride = int(layer.max()) + 2
+    block = group[src] * stride + layer[src]
+    idx = np.lexsort((pos[dst], pos[src], block))
+    b = block[idx]
+    cuts = np.flatnonzero(b[1:] != b[:-1]) + 1
+    owners = b[np.concatenate([[0], cuts])] // stride
+    for g, seg in zip(owners.tolist(), np.split(pos[dst][idx], cuts)):
+        out[g] += _inversions(seg)
+    return out
+
+
+def count_crossings(
+    src: np.ndarray, dst: np.ndarray, group: np.ndarray, layer: np.ndarray, pos
+) -> int:
+    """인접 층 간선 교차 수 (전체 합)"""
+    if not src.size:
+        return 0
+    n_groups = int(group[src].max()) + 1
+    return int(crossings_by_group(src, dst, group, layer, pos, n_groups).sum())
+
+
+def _coordinates(
+    group: np.ndarray, layer: np.ndarray, order: np.ndarray, n_groups: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """층 내 순서 -> 로컬 좌표 (넓은 층은 cap개씩 여러 줄로)"""
+    valid = group >= 0
+    sizes = np.bincount(group[valid], minlength=max(n_groups, 1))
+    cap = np.maximum(4, np.ceil(np.sqrt(sizes)).astype(np.int64) * 2)
+    g = np.where(valid, group, 0)
+    node_cap = cap[g]
+
+    # (group, layer) 블록별 노드 수 / 줄 수
+    n_layers = int(layer.max()) + 1 if layer.size else 1
+    block = g * n_layers + layer
+    counts = np.bincount(block[valid], minlength=max(n_groups, 1) * n_layers)
+    rows = -(-counts // np.repeat(cap, n_layers))  # ceil
+    rows_2d = rows.reshape(-1, n_layers)
+    row_offset = (np.cumsum(rows_2d, axis=1) - rows_2d).ravel()
+
+    row = order // node_cap
+    col = order % node_cap
+    in_row = np.minimum(node_cap, counts[block] - row * node_cap)
+    width = np.minimum(cap, counts.reshape(-1, n_layers).max(axis=1))[g]
+
+    x = PAD + (col + (width - in_row) / 2.0) * (NODE_W + GAP) + NODE_W / 2
+    y = TITLE_H + PAD + (row_offset[block] + row) * (NODE_H + V_GAP) + NODE_H / 2
+    return x, y
+
+
+# =========================================================
+# Entry
+# =========================================================
+def layered_layout(
+    diagram: Dict[str, Any],
+    sweeps: int = DEFAULT_SWEEPS,
+    clusters: Optional[Iterable[Cluster]] = None,
+) -> Layout:
+    """
+    - clusters: 배치할 클러스터만 (기본: 전체). 나머지 노드는 group -1
+    """
+    nodes = diagram.get("nodes") or []
+    edges = diagram.get("edges") or []
+    n = len(nodes)
+    if clusters is None:
+        clusters = build_clusters(diagram).values()
+    clusters = list(clusters)
+
+    group = np.full(n, -1, dtype=np.int64)
+    edge_idx = []
+    for gi, c in enumerate(clusters):
+        if c.members:
+            group[np.asarray(c.members, dtype=np.int64)] = gi
+        edge_idx.extend(c.edges)
+    src = np.fromiter((edges[i]["source"] for i in edge_idx), np.int64, len(edge_idx))
+    dst = np.fromiter((edges[i]["target"] for i in edge_idx), np.int64, len(edge_idx))
+    keep = src != dst
+    src, dst = _acyclic(n, src[keep], dst[keep])
+
+    layer = _longest_path_layers(n, src, dst)
+    src, dst, layer, group_all, n_dummy = _add_dummies(n, src, dst, layer, group)
+    total = n + n_dummy
+    n_groups = len(clusters)
+
+    # 초기 순서: 노드 등장 순서
+    order = _rank_within(group_all, layer, np.arange(total))
+    best = order.copy()
+    best_cross = crossings_by_group(src, dst, group_all, layer, order, n_groups)
+    n_layers = int(layer.max()) + 1 if layer.size else 1
+    members = _split_by(layer, np.arange(total), n_layers)
+    into = _split_by(layer[dst], np.arange(src.size), n_layers)  # 선행 층 간선
+    out_of = _split_by(layer[src], np.arange(src.size), n_layers)  # 후행 층 간선
+    in_group = group_all >= 0
+    for sweep in range(sweeps):
+        if not best_cross.any():
+            break
+        down = sweep % 2 == 0
+        for lay in range(1, n_layers) if down else range(n_layers - 2, -1, -1):
+            e = into[lay] if down else out_of[lay]
+            if not e.size:
+                continue
+            a, b = (src[e], dst[e]) if down else (dst[e], src[e])
+            wsum = np.bincount(b, weights=order[a], minlength=total)
+            deg = np.bincount(b, minlength=total)
+            nodes = members[lay]
+            bary = np.where(
+                deg[nodes] > 0, wsum[nodes] / np.maximum(deg[nodes], 1), order[nodes]
+            )
+            order[nodes] = _rank_within(
+                group_all[nodes], layer[nodes], bary, order[nodes]
+            )
+        cross = crossings_by_group(src, dst, group_all, layer, order, n_groups)
+        better = cross < best_cross
+        if better.any():
+            # 클러스터마다 따로 최적 순서 유지 (다른 클러스터 결과에 영향 없음)
+            take = in_group & better[np.where(in_group, group_all, 0)]
+            best[take] = order[take]
+            best_cross = np.minimum(best_cross, cross)
+
+    x, y = _coordinates(group_all, layer, best, n_groups)
+    # export에서 계산한 레이아웃의 교차 수를 review가 재사용
+    for gi, c in enumerate(clusters):
+        _crossings_cache.put(str(sweeps), c.signature, int(best_cross[gi]))
+    return Layout(
+        x=x[:n],
+        y=y[:n],
+        layer=layer[:n],
+        order=best[:n],
+        group=group,
+        crossings=int(best_cross[:n_groups].sum()),
+        dummies=n_dummy,
+        cluster_crossings=best_cross[:n_groups],
+    )
+
+
+def layout_crossings(diagram: Dict[str, Any]) -> int:
+    """
+    교차 수만 필요할 때 (review 지표)
+    클러스터 서명이 같으면 이전 레이아웃(export 포함) 결과를 캐시에서, 나머지만 배치
+    """
+    key = str(DEFAULT_SWEEPS)
+    clusters = list(build_clusters(diagram).values())
+    known = [_crossings_cache.get(key, c.signature) for c in clusters]
+    missing = [c for c, k in zip(clusters, known) if k is None]
+    if missing:
+        layout = layered_layout(diagram, clusters=missing)
+        fresh = dict(zip((c.scope for c in missing), layout.cluster_crossings))
+        known = [
+            k if k is not None else int(fresh[c.scope]) for c, k in zip(clusters, known)
+        ]
+    return int(sum(known))
+
+
+def cluster_positions(
+    diagram: Dict[str, Any], clusters: Iterable[Cluster]
+) -> Dict[str, List[Position]]:
+    """scope -> 클러스터 로컬 좌표 (members 순서), 주어진 클러스터만 배치"""
+    clusters = list(clusters)
+    if not clusters:
+        return {}
+    layout = layered_layout(diagram, clusters=clusters)
+    return {
+        c.scope: [(float(layout.x[i]), float(layout.y[i])) for i in c.members]
+        for c in clusters
+    }
+
+
+def layout_positions(diagram: Dict[str, Any]) -> Optional[Dict[int, Position]]:
+    """export 단계용: 계층형 레이아웃 로컬 좌표"""
+    return layered_layout(diagram).local_positions()
@@ -0,0 +1,156 @@
+# app/diagram/model.py
+"""
+조립된 구성도 그래프 (메모리 내 인덱스 구조)
+
+- 노드 = 정수 index, 속성은 열(column) 리스트로 보관
+- 관계 타입별 adjacency: adj[rel][i] = [j, ...] (i -> j)
+- (label, name, scope) 기준 중복 제거
+- ALLOWED_TRIPLES에 없는 관계는 추가하지 않고 violations에 기록
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.diagram.schema import RELATIONS, SYMMETRIC_RELATIONS, is_allowed
+
+NodeKey = Tuple[str, str, Optional[str]]
+
+
+def _name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+class DiagramGraph:
+    def __init__(self) -> None:
+        # 노드 열
+        self.labels: List[str] = []
+        self.names: List[str] = []
+        self.scopes: List[Optional[str]] = []
+        self.props: List[Dict[str, Any]] = []
+
+        # 엣지 (추가 순서), 관계별 adjacency
+        self.edges: List[Tuple[int, str, int]] = []
+        self.edge_scopes: List[Optional[str]] = []
+        self.adj: Dict[str, List[List[int]]] = {rel: [] for rel in RELATIONS}
+
+        self.violations: List[Dict[str, Any]] = []
+
+        self._keys: Dict[NodeKey, int] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._edge_set: set = set()
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    # ---- nodes ----
+    def add_node(
+        self, label: str, name: str, scope: Optional[str] = None, **props: Any
+    ) -> int:
+        """노드 추가 (같은 label/name/scope가 있으면 기존 index 반환)"""
+        name = " ".join((name or "").split())
+        key = (label, _name_key(name), scope)
+        idx = self._keys.get(key)
+        if idx is not None:
+            if props:
+                self.props[idx].update(props)
+            return idx
+
+        idx = len(self.labels)
+        self._keys[key] = idx
+        self.labels.append(label)
+        self.names.append(name)
+        self.scopes.append(scope)
+        self.props.append(dict(props))
+        for rows in self.adj.values():
+            rows.append([])
+        self._by_name.setdefault(key[1], []).append(idx)
+        return idx
+
+    def find(self, label: str, name: str, scope: Optional[str] = None) -> Optional[int]:
+        return self._keys.get((label, _name_key(name), scope))
+
+    def lookup(self, name: str, scope: Optional[str] = None) -> Optional[int]:
+        """이름으로 노드 찾기 (같은 scope 우선, 없으면 먼저 추가된 노드)"""
+        hits = self._by_name.get(_name_key(name))
+        if not hits:
+            return None
+        if scope is not None:
+            for idx in hits:
+                if self.scopes[idx] == scope:
+                    return idx
+        return hits[0]
+
+    # ---- edges ----
+    def add_edge(
+        self, src: int, relation: str, dst: int, scope: Optional[str] = None
+    ) -> bool:
+        """
+        관계 추가. 허용 triple이 아니면 violations에 기록하고 False
+        (CONNECTED_TO처럼 대칭 관계는 역방향이 허용되면 뒤집어 저장)
+        """
+        head, tail = self.labels[src], self.labels[dst]
+        if not is_allowed(head, relation, tail):
+            if relation in SYMMETRIC_RELATIONS and is_allowed(tail, relation, head):
+                src, dst = dst, src
+            else:
+                self.violations.append(
+                    {
+                        "source": src,
+                        "type": relation,
+                        "target": dst,
+                        "triple": [head, relation, tail],
+                        "scope": scope,
+                    }
+                )
+                return False
+
+        edge = (src, relation, dst)
+        if edge in self._edge_set:
+            return True
+        self._edge_set.add(edge)
+        self.edges.append(edge)
+        self.edge_scopes.append(scope)
+        self.adj[relation][src].append(dst)
+        return True
+
+    def neighbors(self, idx: int, relation: str) -> List[int]:
+        return self.adj[relation][idx]
+
+    def iter_nodes(self, label: str) -> Iterator[int]:
+        return (i for i, lb in enumerate(self.labels) if lb == label)
+
+    # ---- (de)serialization ----
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodes": [
+                {
+                    "index": i,
+                    "label": self.labels[i],
+                    "name": self.names[i],
+                    "scope": self.scopes[i],
+                    **self.props[i],
+                }
+                for i in range(len(self.labels))
+            ],
+            "edges": [
+                {"source": s, "type": r, "target": t, "scope": sc}
+                for (s, r, t), sc in zip(self.edges, self.edge_scopes)
+            ],
+            "violations": list(self.violations),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DiagramGraph":
+        g = cls()
+        for node in sorted(data.get("nodes") or [], key=lambda n: n["index"]):
+            props = {
+                k: v
+                for k, v in node.items()
+                if k not in ("index", "label", "name", "scope")
+            }
+            g.add_node(node["label"], node["name"], node.get("scope"), **props)
+        for e in data.get("edges") or []:
+            g.add_edge(e["source"], e["type"], e["target"], e.get("scope"))
+        g.violations.extend(data.get("violations") or [])
+        return g
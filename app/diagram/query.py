@@ -0,0 +1,481 @@
+# app/diagram/query.py
+"""
+조립된 구성도(state["diagram"]) 위 인프로세스 그래프 질의
+
+- 관계 -> CSR 배열 (indptr / targets / edge index)
+  양방향 CSR(이웃 / 최단 경로)과 정방향 CSR(source -> target, 경로 열거)
+- neighbors / k_hop    : frontier 단위 BFS (NumPy, 깊이 제한)
+- shortest_path        : 가중치가 모두 같으면 BFS, 아니면 Dijkstra (heapq)
+                         목적지에 닿으면 바로 종료, 가중치는 0 이상 유한값만
+                         Dijkstra는 (노드, hop 수) 상태로 탐색 -> max_depth 이내 최단
+- zone_external        : zone 소속 노드에서 ExternalSystem까지 관계 방향을 따르는
+                         단순 경로(노드 중복 없음) 전부, max_depth / max_paths 제한
+                         (zone 안의 ExternalSystem 포함, ExternalSystem에서 경로 종료)
+- 결과는 내부 QueryRecord (app/diagram/records), execute() / API 경계에서만
+  GraphQueryResult로 변환 (execution_time = 실제 소요 초)
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.diagram.csr import csr, gather
+from app.diagram.model import _name_key
+from app.diagram.records import (
+    DEFAULT_ENTITY_TYPE,
+    DEFAULT_RELATIONSHIP_TYPE,
+    ENTITY_TYPES,
+    RELATIONSHIP_TYPES,
+    EntityRecord,
+    PathRecord,
+    QueryRecord,
+    RelationshipRecord,
+    intern,
+)
+from app.schemas.graphdb_schema import GraphQuery, GraphQueryResult
+
+DEFAULT_RELATIONS: Tuple[str, ...] = ("CONNECTED_TO",)
+DEFAULT_MAX_DEPTH = 16
+ZONE_PATH_DEPTH = 8  # zone_external 경로 최대 길이 (단순 경로 열거라 작게)
+MAX_PATHS = 1000  # zone_external 경로 수 상한 (넘으면 truncated)
+
+
+def _check_weights(weights: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """관계별 가중치 검증 (Dijkstra 전제: {관계: 0 이상 유한값})"""
+    if weights is None:
+        return {}
+    if not isinstance(weights, dict):
+        raise ValueError(
+            f"weights must be an object of relation -> weight: {weights!r}"
+        )
+    checked = {}
+    for rel, w in weights.items():
+        try:
+            value = float(w)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid weight for {rel}: {w!r}")
+        if not math.isfinite(value) or value < 0:
+            raise ValueError(f"Weight for {rel} must be finite and >= 0: {w!r}")
+        checked[rel] = value
+    return checked
+
+
+class GraphQueryEngine:
+    """diagram dict 하나에 대한 CSR 인덱스 + 질의"""
+
+    def __init__(
+        self,
+        diagram: Dict[str, Any],
+        relations: Sequence[str] = DEFAULT_RELATIONS,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.diagram = diagram
+        self.nodes: List[Dict[str, Any]] = diagram.get("nodes") or []
+        self.edges: List[Dict[str, Any]] = diagram.get("edges") or []
+        self.relations = tuple(relations)
+        self.weights = _check_weights(weights)
+
+        n = len(self.nodes)
+        picked = [
+            i for i, e in enumerate(self.edges) if e.get("type") in self.relations
+        ]
+        eidx = np.asarray(picked, dtype=np.int64)
+        src = np.fromiter((self.edges[i]["source"] for i in picked), np.int64)
+        dst = np.fromiter((self.edges[i]["target"] for i in picked), np.int64)
+        w = np.fromiter(
+            (self.weights.get(self.edges[i]["type"], 1.0) for i in picked), float
+        )
+
+        # 양방향 CSR
+        self.indptr, self.targets, self.edge_of, self.weight_of = csr(
+            n,
+            np.concatenate([src, dst]),
+            np.concatenate([dst, src]),
+            np.concatenate([eidx, eidx]),
+            np.concatenate([w, w]),
+        )
+        self.unit = bool(not w.size or np.all(w == w[0]))
+        # 정방향 CSR (경로 열거용)
+        self.out_indptr, self.out_targets, self.out_edge_of = csr(n, src, dst, eidx)
+
+        # id / 라벨은 intern해서 엔티티 / 관계 / 경로 레코드가 같은 str 공유
+        self._node_ids = [
+            intern(nd.get("id") or str(i)) for i, nd in enumerate(self.nodes)
+        ]
+        self._labels = [intern(nd.get("label") or "") for nd in self.nodes]
+        self._ids = {nid: i for i, nid in enumerate(self._node_ids)}
+        self._names: Dict[str, List[int]] = {}
+        for i, nd in enumerate(self.nodes):
+            self._names.setdefault(_name_key(nd.get("name") or ""), []).append(i)
+
+    # ---- node resolution ----
+    def resolve(self, ref: Any, scope: Optional[str] = None) -> int:
+        """노드 id / 이름 / index -> index (없으면 KeyError)"""
+        if isinstance(ref, int) and 0 <= ref < len(self.nodes):
+            return ref
+        ref = str(ref).strip()
+        if ref in self._ids:
+            return self._ids[ref]
+        hits = self._names.get(_name_key(ref)) or []
+        if scope is not None:
+            hits = [i for i in hits if self.nodes[i].get("scope") == scope] or hits
+        if not hits:
+            raise KeyError(ref)
+        return hits[0]
+
+    def zone_members(self, zone: str) -> np.ndarray:
+        """scope_key 또는 zone 표시명 -> zone 소속 노드 index"""
+        scope = zone
+        if not any(nd.get("scope") == zone for nd in self.nodes):
+            scope = self.nodes[self.resolve(zone)].get("scope")
+        return np.asarray(
+            [
+                i
+                for i, nd in enumerate(self.nodes)
+                if nd.get("scope") == scope and nd.get("label") != "NetworkZone"
+            ],
+            dtype=np.int64,
+        )
+
+    # ---- traversal ----
+    def bfs(
+        self,
+        sources: Iterable[int],
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        stop: Optional[Callable[[np.ndarray, np.ndarray], bool]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        frontier 단위 BFS -> (dist, parent, parent_edge)  (-1: 미방문)
+        - stop(dist, 새로 방문한 노드): True면 그 층에서 종료
+        """
+        n = len(self.nodes)
+        dist = np.full(n, -1, dtype=np.int64)
+        parent = np.full(n, -1, dtype=np.int64)
+        parent_edge = np.full(n, -1, dtype=np.int64)
+        frontier = np.unique(np.asarray(list(sources), dtype=np.int64))
+        dist[frontier] = 0
+        for depth in range(1, max_depth + 1):
+            if not frontier.size:
+                break
+            idx, owner = gather(self.indptr, frontier)
+            nbr = self.targets[idx]
+            fresh = dist[nbr] < 0
+            nbr, idx, owner = nbr[fresh], idx[fresh], owner[fresh]
+            if not nbr.size:
+                break
+            reached, first = np.unique(nbr, return_index=True)
+            dist[reached] = depth
+            parent[reached] = frontier[owner[first]]
+            parent_edge[reached] = self.edge_of[idx[first]]
+            if stop is not None and stop(dist, reached):
+                break
+            frontier = reached
+        return dist, parent, parent_edge
+
+    def dijkstra(
+        self, source: int, target: int, max_depth: int = DEFAULT_MAX_DEPTH
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        max_depth hop 이내 가중 최단 경로 -> (노드 목록, 엣지 목록), 없으면 None
+        - 상태 = (노드, hop 수): 더 싼 긴 경로가 노드를 먼저 차지해도
+          hop이 적은 경로를 버리지 않음
+        - 노드를 더 적은 hop으로 이미 꺼냈다면 그 상태가 거리 / hop 모두 우세 -> 건너뜀
+        - target을 꺼내는 순간 종료
+        """
+        inf = float("inf")
+        best: Dict[Tuple[int, int], float] = {(source, 0): 0.0}
+        prev: Dict[Tuple[int, int], Tuple[Tuple[int, int], int]] = {}
+        settled: Dict[int, int] = {}  # 노드 -> 꺼낸 최소 hop
+        heap = [(0.0, 0, source)]
+        indptr, targets = self.indptr, self.targets
+        while heap:
+            d, h, u = heapq.heappop(heap)
+            if d > best[(u, h)] or h >= settled.get(u, inf):
+                continue
+            settled[u] = h
+            if u == target:
+                nodes, edges = [u], []
+                state = (u, h)
+                while state in prev:
+                    state, e = prev[state]
+                    nodes.append(state[0])
+                    edges.append(e)
+                return nodes[::-1], edges[::-1]
+            if h >= max_depth:
+                continue
+            for k in range(int(indptr[u]), int(indptr[u + 1])):
+                v = int(targets[k])
+                nd = d + float(self.weight_of[k])
+                if h + 1 < settled.get(v, inf) and nd < best.get((v, h + 1), inf):
+                    best[(v, h + 1)] = nd
+                    prev[(v, h + 1)] = ((u, h), int(self.edge_of[k]))
+                    heapq.heappush(heap, (nd, h + 1, v))
+        return None
+
+    # ---- queries ----
+    def neighbors(self, node: Any, scope: Optional[str] = None) -> QueryRecord:
+        return self.k_hop(node, 1, scope=scope, query="neighbors")
+
+    def k_hop(
+        self,
+        node: Any,
+        k: int = 2,
+        scope: Optional[str] = None,
+        query: str = "k_hop",
+    ) -> QueryRecord:
+        started = time.perf_counter()
+        start = self.resolve(node, scope)
+        dist, _, parent_edge = self.bfs([start], max_depth=max(0, int(k)))
+        reached = np.flatnonzero(dist > 0)
+        reached = reached[np.lexsort((reached, dist[reached]))]
+        edges = sorted({int(e) for e in parent_edge[reached]})
+        return self._result(
+            query,
+            started,
+            entities=[int(i) for i in reached],
+            relationships=edges,
+            metadata={
+                "start": self._node_meta(start),
+                "k": int(k),
+                "depth": {self._node_id(i): int(dist[i]) for i in reached},
+            },
+        )
+
+    def shortest_path(
+        self,
+        source: Any,
+        target: Any,
+        scope: Optional[str] = None,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+    ) -> QueryRecord:
+        started = time.perf_counter()
+        s, t = self.resolve(source, scope), self.resolve(target, scope)
+        path: Optional[Tuple[List[int], List[int]]] = None
+        if s == t:
+            path = ([s], [])
+        elif self.unit:
+            goal = np.zeros(len(self.nodes), dtype=bool)
+            goal[t] = True
+            dist, parent, parent_edge = self.bfs(
+                [s], max_depth, stop=lambda _d, reached: bool(goal[reached].any())
+            )
+            if dist[t] >= 0:
+                path = self._walk(t, lambda v: (int(parent[v]), int(parent_edge[v])))
+        else:
+            path = self.dijkstra(s, t, max_depth)
+
+        paths = [self._path(*path)] if path else []
+        return self._result(
+            "shortest_path",
+            started,
+            entities=path[0] if path else [],
+            relationships=path[1] if path else [],
+            paths=paths,
+            metadata={
+                "source": self._node_meta(s),
+                "target": self._node_meta(t),
+                "found": bool(path),
+                "algorithm": "bfs" if self.unit else "dijkstra",
+            },
+        )
+
+    def simple_paths(
+        self,
+        sources: Iterable[int],
+        goal: np.ndarray,
+        max_depth: int = ZONE_PATH_DEPTH,
+        max_paths: int = MAX_PATHS,
+    ) -> Tuple[List[Tuple[List[int], List[int]]], bool]:
+        """
+        정방향 간선을 따라 sources -> goal 단순 경로 전부 (DFS, goal에서 멈춤)
+        -> ([(노드 목록, 엣지 목록), ...], max_paths에 걸려 잘렸는지)
+        """
+        indptr, targets, edge_of = self.out_indptr, self.out_targets, self.out_edge_of
+        found: List[Tuple[List[int], List[int]]] = []
+        for s in sources:
+            nodes, edges = [s], []
+            on_path = {s}
+            stack = [int(indptr[s])]  # 노드별 다음에 볼 CSR 위치
+            while stack:
+                u = nodes[-1]
+                k = stack[-1]
+                if k >= indptr[u + 1] or len(edges) >= max_depth:
+                    stack.pop()
+                    on_path.discard(nodes.pop())
+                    if edges:
+                        edges.pop()
+                    continue
+                stack[-1] = k + 1
+                v = int(targets[k])
+                if v in on_path:
+                    continue
+                if goal[v]:
+                    if len(found) >= max_paths:
+                        return found, True
+                    found.append((nodes + [v], edges + [int(edge_of[k])]))
+                    continue
+                nodes.append(v)
+                edges.append(int(edge_of[k]))
+                on_path.add(v)
+                stack.append(int(indptr[v]))
+        return found, False
+
+    def zone_external(
+        self,
+        zone: str,
+        max_depth: int = ZONE_PATH_DEPTH,
+        max_paths: int = MAX_PATHS,
+    ) -> QueryRecord:
+        started = time.perf_counter()
+        members = self.zone_members(zone)
+        external = np.asarray(
+            [nd.get("label") == "ExternalSystem" for nd in self.nodes], dtype=bool
+        )
+        found, truncated = self.simple_paths(
+            members.tolist(), external, max(0, int(max_depth)), max(1, int(max_paths))
+        )
+        found.sort(key=lambda p: (len(p[1]), p[0]))
+
+        paths: List[PathRecord] = []
+        entities: Dict[int, None] = {}
+        relationships: Dict[int, None] = {}
+        for node_path, edge_path in found:
+            paths.append(self._path(node_path, edge_path))
+            entities.update(dict.fromkeys(node_path))
+            relationships.update(dict.fromkeys(edge_path))
+        return self._result(
+            "zone_external",
+            started,
+            entities=list(entities),
+            relationships=list(relationships),
+            paths=paths,
+            metadata={
+                "zone": zone,
+                "members": int(members.size),
+                "externals": list(
+                    dict.fromkeys(self._node_id(p[0][-1]) for p in found)
+                ),
+                "max_depth": int(max_depth),
+                "truncated": truncated,
+            },
+        )
+
+    def run(self, query: GraphQuery) -> QueryRecord:
+        """
+        GraphQuery 실행 (내부 레코드)
+        - query_type: neighbors | k_hop | shortest_path | zone_external
+        - query_string: 시작 노드 (id / 이름) 또는 zone (scope_key / 표시명)
+        - parameters: k, target, scope, max_depth, max_paths
+        """
+        op = QUERIES.get(query.query_type)
+        if op is None:
+            raise ValueError(f"Unsupported query type: {query.query_type}")
+        result = op(self, query.query_string, dict(query.parameters or {}))
+        return result.page(query.offset, query.limit)
+
+    def execute(self, query: GraphQuery) -> GraphQueryResult:
+        """GraphQuery 실행 -> pydantic GraphQueryResult (API 경계용)"""
+        return self.run(query).to_model()
+
+    # ---- helpers ----
+    def _walk(
+        self, target: int, step: Callable[[int], Tuple[int, int]]
+    ) -> Tuple[List[int], List[int]]:
+        nodes, edges = [target], []
+        v = target
+        while True:
+            u, e = step(v)
+            if u < 0:
+                break
+            nodes.append(u)
+            edges.append(e)
+            v = u
+        return nodes[::-1], edges[::-1]
+
+    def _node_id(self, i: int) -> str:
+        return self._node_ids[i]
+
+    def _node_meta(self, i: int) -> Dict[str, Any]:
+        nd = self.nodes[i]
+        return {
+            "id": self._node_id(i),
+            "name": nd.get("name"),
+            "scope": nd.get("scope"),
+        }
+
+    def entity(self, i: int) -> EntityRecord:
+        label = self._labels[i]
+        return EntityRecord(
+            self._node_ids[i],
+            ENTITY_TYPES.get(label, DEFAULT_ENTITY_TYPE),
+            self.nodes[i].get("name") or "",
+            label,
+            self.nodes[i],
+        )
+
+    def relationship(self, e: int) -> RelationshipRecord:
+        edge = self.edges[e]
+        rel = intern(edge.get("type") or "")
+        return RelationshipRecord(
+            edge.get("id") or f"e{e}",
+            RELATIONSHIP_TYPES.get(rel, DEFAULT_RELATIONSHIP_TYPE),
+            self._node_ids[edge["source"]],
+            self._node_ids[edge["target"]],
+            rel,
+            edge.get("scope"),
+            float(self.weights.get(rel, 1.0)),
+        )
+
+    def _path(self, nodes: List[int], edges: List[int]) -> PathRecord:
+        rels = tuple(self.relationship(e) for e in edges)
+        return PathRecord(
+            "path-" + "-".join(self._node_ids[i] for i in (nodes[0], nodes[-1])),
+            tuple(self.entity(i) for i in nodes),
+            rels,
+            len(edges),
+            sum(r.weight for r in rels),
+        )
+
+    def _result(
+        self,
+        query: str,
+        started: float,
+        entities: List[int],
+        relationships: List[int],
+        paths: Optional[List[PathRecord]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> QueryRecord:
+        entity_records = [self.entity(i) for i in entities]
+        relationship_records = [self.relationship(e) for e in relationships]
+        return QueryRecord(
+            f"q-{uuid.uuid4().hex[:8]}",
+            entity_records,
+            relationship_records,
+            paths or [],
+            {"query": query, **(metadata or {})},
+            time.perf_counter() - started,
+            len(paths) if paths is not None else len(entities),
+        )
+
+
+QUERIES: Dict[str, Callable[[GraphQueryEngine, str, Dict[str, Any]], Any]] = {
+    "neighbors": lambda g, ref, p: g.neighbors(ref, scope=p.get("scope")),
+    "k_hop": lambda g, ref, p: g.k_hop(ref, int(p.get("k", 2)), scope=p.get("scope")),
+    "shortest_path": lambda g, ref, p: g.shortest_path(
+        ref,
+        p["target"],
+        scope=p.get("scope"),
+        max_depth=int(p.get("max_depth", DEFAULT_MAX_DEPTH)),
+    ),
+    "zone_external": lambda g, ref, p: g.zone_external(
+        ref,
+        max_depth=int(p.get("max_depth", ZONE_PATH_DEPTH)),
+        max_paths=int(p.get("max_paths", MAX_PATHS)),
+    ),
+}
@@ -0,0 +1,132 @@
+# app/diagram/records.py
+"""
+그래프 질의 결과의 내부 표현 (pydantic 검증 없이 가볍게)
+
+- EntityRecord / RelationshipRecord / PathRecord / QueryRecord: NamedTuple
+  (튜플 하나 생성 비용, 속성 dict는 diagram 노드를 복사 없이 참조)
+- id / 라벨 / 관계 문자열은 intern -> 엔티티, 관계, 경로가 같은 str 객체 공유
+- pydantic 모델(app/schemas/graphdb_schema)은 API 경계에서만:
+  to_dict()로 평범한 dict를 만들고 to_model()에서 한 번에 검증
+  (created_at / updated_at은 결과 단위 한 시각 공유, 객체마다 datetime.now 호출 안 함)
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.schemas.graphdb_schema import EntityType, GraphQueryResult, RelationshipType
+
+intern = sys.intern
+
+ENTITY_TYPES: Dict[str, str] = {
+    "Diagram": EntityType.DOCUMENT.value,
+    "Corporation": EntityType.ORGANIZATION.value,
+    "Center": EntityType.LOCATION.value,
+    "NetworkZone": EntityType.LOCATION.value,
+}
+DEFAULT_ENTITY_TYPE = EntityType.SYSTEM.value
+
+RELATIONSHIP_TYPES: Dict[str, str] = {
+    "CONNECTED_TO": RelationshipType.CONNECTS_TO.value,
+    "IN_ZONE": RelationshipType.LOCATED_IN.value,
+    "IN_GROUP": RelationshipType.LOCATED_IN.value,
+}
+DEFAULT_RELATIONSHIP_TYPE = RelationshipType.CONTAINS.value
+
+# properties에서 뺄 노드 필드 (GraphEntity의 별도 필드로 감)
+NODE_FIELDS = frozenset({"index", "id", "label", "name"})
+
+
+class EntityRecord(NamedTuple):
+    id: str
+    type: str  # EntityType 값
+    name: str
+    label: str
+    node: Dict[str, Any]  # diagram 노드 (참조, 복사 안 함)
+
+    def to_dict(self, ts: datetime) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "name": self.name,
+            "properties": {k: v for k, v in self.node.items() if k not in NODE_FIELDS},
+            "labels": [self.label],
+            "created_at": ts,
+            "updated_at": ts,
+        }
+
+
+class RelationshipRecord(NamedTuple):
+    id: str
+    type: str  # RelationshipType 값
+    source_id: str
+    target_id: str
+    relation: str  # 구성도 관계 (CONNECTED_TO ...)
+    scope: Optional[str]
+    weight: float
+
+    def to_dict(self, ts: datetime) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "source_id": self.source_id,
+            "target_id": self.target_id,
+            "properties": {"relation": self.relation, "scope": self.scope},
+            "weight": self.weight,
+            "created_at": ts,
+            "updated_at": ts,
+        }
+
+
+class PathRecord(NamedTuple):
+    id: str
+    entities: Tuple[EntityRecord, ...]
+    relationships: Tuple[RelationshipRecord, ...]
+    length: int
+    total_weight: float
+
+    def to_dict(self, ts: datetime) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "entities": [e.to_dict(ts) for e in self.entities],
+            "relationships": [r.to_dict(ts) for r in self.relationships],
+            "length": self.length,
+            "total_weight": self.total_weight,
+        }
+
+
+class QueryRecord(NamedTuple):
+    query_id: str
+    entities: List[EntityRecord]
+    relationships: List[RelationshipRecord]
+    paths: List[PathRecord]
+    metadata: Dict[str, Any]
+    execution_time: float
+    total_results: int
+
+    def page(self, offset: Optional[int], limit: Optional[int]) -> "QueryRecord":
+        if not offset and limit is None:
+            return self
+        start = offset or 0
+        end = None if limit is None else start + limit
+        if self.paths:
+            return self._replace(paths=self.paths[start:end])
+        return self._replace(entities=self.entities[start:end])
+
+    def to_dict(self, ts: Optional[datetime] = None) -> Dict[str, Any]:
+        """GraphQueryResult 형태의 평범한 dict (FastAPI response_model이 검증)"""
+        ts = ts or datetime.now()
+        return {
+            "query_id": self.query_id,
+            "entities": [e.to_dict(ts) for e in self.entities],
+            "relationships": [r.to_dict(ts) for r in self.relationships],
+            "paths": [p.to_dict(ts) for p in self.paths],
+            "metadata": self.metadata,
+            "execution_time": self.execution_time,
+            "total_results": self.total_results,
+        }
+
+    def to_model(self) -> GraphQueryResult:
+        return GraphQueryResult.model_validate(self.to_dict())
@@ -0,0 +1,481 @@
+# app/diagram/render.py
+"""
+조립된 구성도(state["diagram"]) -> Mermaid / SVG
+
+- 외부 서비스 없이 순수 Python으로 렌더링
+- 출력은 문자열 조각을 yield (큰 구성도도 한 번에 메모리에 올리지 않음)
+- scope(center:zone) 단위 클러스터 렌더 결과를 내용 해시로 캐시
+  -> scope 하나가 바뀌면 그 클러스터만 다시 렌더
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape as xml_escape, quoteattr
+
+# 구성도 골격 라벨 (클러스터/제목으로 표현, 노드로 그리지 않음)
+FRAME_LABELS = {"Diagram", "Corporation", "Center", "NetworkZone"}
+# 중첩(subgraph)으로 표현되므로 선으로 그리지 않는 관계
+STRUCTURAL_RELATIONS = {"HAS_COVERS", "HAS_CENTER", "HAS_ZONE", "HAS_DEVICE", "IN_ZONE"}
+
+Position = Tuple[float, float]
+
+
+# =========================================================
+# Escaping
+# =========================================================
+_MERMAID_ID_RE = re.compile(r"[^0-9A-Za-z_]")
+_MERMAID_UNSAFE_RE = re.compile(r"[\"#<>&|\[\]{}()`;]")
+
+
+def mermaid_id(node: Dict[str, Any]) -> str:
+    raw = node.get("id") or f"n{node['index']}"
+    return "n_" + _MERMAID_ID_RE.sub("_", raw)
+
+
+def mermaid_label(text: str) -> str:
+    """따옴표 라벨 안에서 의미를 갖는 문자는 '#<code>;' 엔티티로"""
+    text = " ".join((text or "").split())
+    return '"' + _MERMAID_UNSAFE_RE.sub(lambda m: f"#{ord(m.group())};", text) + '"'
+
+
+# label -> (여는 괄호, 닫는 괄호)
+MERMAID_SHAPES: Dict[str, Tuple[str, str]] = {
+    "Server": ("[", "]"),
+    "DBMS": ("[(", ")]"),
+    "NetworkDevice": ("{{", "}}"),
+    "Interface": ("([", "])"),
+    "ExternalSystem": (">", "]"),
+    "SystemGroup": ("[[", "]]"),
+}
+
+
+# =========================================================
+# Clusters
+# =========================================================
+@dataclass
+class Cluster:
+    scope: str
+    zone: Optional[int]  # NetworkZone 노드 index
+    center: Optional[str]
+    members: List[int] = field(default_factory=list)
+    edges: List[int] = field(default_factory=list)  # 클러스터 내부 엣지 index
+    signature: str = ""
+
+
+def build_clusters(diagram: Dict[str, Any]) -> "OrderedDict[str, Cluster]":
+    """scope별 클러스터 (zone 노드 등장 순서), 내부 엣지 및 내용 서명 포함"""
+    nodes = diagram.get("nodes") or []
+    clusters: "OrderedDict[str, Cluster]" = OrderedDict()
+    for n in nodes:
+        if n["label"] == "NetworkZone" and n.get("scope"):
+            clusters[n["scope"]] = Cluster(n["scope"], n["index"], n.get("center"))
+    for n in nodes:
+        scope = n.get("scope")
+        if n["label"] in FRAME_LABELS or scope not in clusters:
+            continue
+        clusters[scope].members.append(n["index"])
+
+    for i, e in enumerate(diagram.get("edges") or []):
+        if e["type"] in STRUCTURAL_RELATIONS:
+            continue
+        s_scope = nodes[e["source"]].get("scope")
+        if s_scope in clusters and s_scope == nodes[e["target"]].get("scope"):
+            clusters[s_scope].edges.append(i)
+
+    for c in clusters.values():
+        c.signature = cluster_signature(diagram, c)
+    return clusters
+
+
+def cluster_signature(diagram: Dict[str, Any], cluster: Cluster) -> str:
+    nodes = diagram.get("nodes") or []
+    edges = diagram.get("edges") or []
+    h = hashlib.blake2b(digest_size=16)
+    parts = [cluster.scope]
+    if cluster.zone is not None:
+        parts.append(nodes[cluster.zone].get("name") or "")
+    for i in cluster.members:
+        n = nodes[i]
+        parts.append(f"{n.get('id') or i}|{n['label']}|{n.get('name')}")
+    for i in cluster.edges:
+        e = edges[i]
+        src, dst = nodes[e["source"]], nodes[e["target"]]
+        parts.append(
+            f"{src.get('id') or e['source']}|{e['type']}|{dst.get('id') or e['target']}"
+        )
+    h.update("\x1e".join(parts).encode("utf-8"))
+    return h.hexdigest()
+
+
+# =========================================================
+# Render cache
+# =========================================================
+class RenderCache:
+    """(format, 클러스터 서명) -> 렌더 결과 LRU"""
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_render(self, fmt: str, signature: str, render) -> Any:
+        key = (fmt, signature)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+        value = render()
+        with self._lock:
+            self.misses += 1
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def get(self, fmt: str, signature: str) -> Any:
+        """캐시에 있으면 값, 없으면 None (렌더하지 않음)"""
+        with self._lock:
+            value = self._data.get((fmt, signature))
+            if value is not None:
+                self._data.move_to_end((fmt, signature))
+            return value
+
+    def put(self, fmt: str, signature: str, value: Any) -> None:
+        with self._lock:
+            self._data[(fmt, signature)] = value
+            self._data.move_to_end((fmt, signature))
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+_render_cache = RenderCache()
+
+
+def get_render_cache() -> RenderCache:
+    return _render_cache
+
+
+# =========================================================
+# Mermaid
+# =========================================================
+def _mermaid_node(node: Dict[str, Any], indent: str) -> str:
+    open_, close = MERMAID_SHAPES.get(node["label"], ("[", "]"))
+    return (
+        f"{indent}{mermaid_id(node)}{open_}{mermaid_label(node.get('name'))}{close}\n"
+    )
+
+
+def _mermaid_edge(diagram: Dict[str, Any], edge: Dict[str, Any], indent: str) -> str:
+    nodes = diagram["nodes"]
+    src, dst = mermaid_id(nodes[edge["source"]]), mermaid_id(nodes[edge["target"]])
+    if edge["type"] == "CONNECTED_TO":
+        return f"{indent}{src} --- {dst}\n"
+    return f"{indent}{src} -->|{edge['type']}| {dst}\n"
+
+
+def _mermaid_cluster(diagram: Dict[str, Any], cluster: Cluster) -> str:
+    nodes = diagram["nodes"]
+    edges = diagram.get("edges") or []
+    title = nodes[cluster.zone].get("name") if cluster.zone is not None else None
+    cid = mermaid_id(nodes[cluster.zone]) if cluster.zone is not None else "n_scope"
+    lines = [f"    subgraph {cid}[{mermaid_label(title or cluster.scope)}]\n"]
+    lines.extend(_mermaid_node(nodes[i], "      ") for i in cluster.members)
+    lines.extend(_mermaid_edge(diagram, edges[i], "      ") for i in cluster.edges)
+    lines.append("    end\n")
+    return "".join(lines)
+
+
+def iter_mermaid(
+    diagram: Dict[str, Any],
+    cache: Optional[RenderCache] = None,
+    direction: str = "TD",
+) -> Iterator[str]:
+    """Mermaid flowchart 조각을 순서대로 yield (센터 subgraph > zone subgraph)"""
+    cache = cache or get_render_cache()
+    nodes = diagram.get("nodes") or []
+    edges = diagram.get("edges") or []
+    clusters = build_clusters(diagram)
+
+    yield f"flowchart {direction}\n"
+
+    by_center: "OrderedDict[str, List[Cluster]]" = OrderedDict()
+    for n in nodes:
+        if n["label"] == "Center":
+            by_center.setdefault(n.get("name"), [])
+    for c in clusters.values():
+        by_center.setdefault(c.center, []).append(c)
+
+    center_ids = {n.get("name"): n for n in nodes if n["label"] == "Center"}
+    for center, cs in by_center.items():
+        node = center_ids.get(center)
+        cid = mermaid_id(node) if node else f"n_center_{len(cs)}"
+        yield f"  subgraph {cid}[{mermaid_label(center or '')}]\n"
+        for c in cs:
+            yield cache.get_or_render(
+                "mermaid", c.signature, lambda c=c: _mermaid_cluster(diagram, c)
+            )
+        yield "  end\n"
+
+    # 클러스터 밖 노드 (scope 없음)
+    for n in nodes:
+        if n["label"] not in FRAME_LABELS and n.get("scope") not in clusters:
+            yield _mermaid_node(n, "  ")
+
+    # 클러스터를 넘나드는 엣지
+    inside = {i for c in clusters.values() for i in c.edges}
+    for i, e in enumerate(edges):
+        if e["type"] in STRUCTURAL_RELATIONS or i in inside:
+            continue
+        yield _mermaid_edge(diagram, e, "  ")
+
+
+# =========================================================
+# SVG
+# =========================================================
+NODE_W, NODE_H = 150.0, 36.0
+GAP = 16.0
+PAD = 20.0
+TITLE_H = 24.0
+
+SVG_FILL: Dict[str, str] = {
+    "Server": "#e8f0fe",
+    "DBMS": "#fef7e0",
+    "NetworkDevice": "#e6f4ea",
+    "Interface": "#f3e8fd",
+    "ExternalSystem": "#fce8e6",
+    "SystemGroup": "#f1f3f4",
+}
+
+
+@dataclass
+class ClusterBox:
+    svg: str  # 클러스터 로컬 좌표 기준 <g> 내용
+    width: float
+    height: float
+    positions: List[Position]  # members 순서대로 로컬 중심 좌표
+
+
+def _svg_text(x: float, y: float, text: str, **attrs: str) -> str:
+    extra = "".join(f" {k.replace('_', '-')}={quoteattr(v)}" for k, v in attrs.items())
+    return f'<text x="{x:.1f}" y="{y:.1f}"{extra}>{xml_escape(text or "")}</text>'
+
+
+def _svg_node(node: Dict[str, Any], cx: float, cy: float) -> str:
+    x, y = cx - NODE_W / 2, cy - NODE_H / 2
+    fill = SVG_FILL.get(node["label"], "#ffffff")
+    rx = 14 if node["label"] in ("Interface", "DBMS") else 4
+    return (
+        f'<g class="node" data-id={quoteattr(node.get("id") or str(node["index"]))}'
+        f" data-label={quoteattr(node['label'])}>"
+        f'<rect x="{x:.1f}" y="{y:.1f}" width="{NODE_W:.0f}" height="{NODE_H:.0f}"'
+        f' rx="{rx}" fill="{fill}" stroke="#5f6368"/>'
+        + _svg_text(cx, cy + 4, node.get("name") or "", text_anchor="middle")
+        + "</g>"
+    )
+
+
+def _grid_positions(count: int) -> List[Position]:
+    cols = max(1, math.ceil(math.sqrt(count)))
+    out: List[Position] = []
+    for k in range(count):
+        r, c = divmod(k, cols)
+        out.append(
+            (
+                PAD + c * (NODE_W + GAP) + NODE_W / 2,
+                TITLE_H + PAD + r * (NODE_H + GAP) + NODE_H / 2,
+            )
+        )
+    return out
+
+
+def _svg_cluster(
+    diagram: Dict[str, Any],
+    cluster: Cluster,
+    positions: Optional[List[Position]] = None,
+) -> ClusterBox:
+    nodes = diagram["nodes"]
+    edges = diagram.get("edges") or []
+    local = positions or _grid_positions(len(cluster.members))
+    pos = dict(zip(cluster.members, local))
+    width = max([x for x, _ in local] or [0]) + NODE_W / 2 + PAD
+    height = max([y for _, y in local] or [0]) + NODE_H / 2 + PAD
+    width, height = max(width, NODE_W + 2 * PAD), max(height, TITLE_H + 2 * PAD)
+
+    title = nodes[cluster.zone].get("name") if cluster.zone is not None else ""
+    parts = [
+        f'<rect width="{width:.1f}" height="{height:.1f}" rx="8"'
+        ' fill="none" stroke="#9aa0a6" stroke-dasharray="4 3"/>',
+        _svg_text(PAD / 2, 16, title or cluster.scope, font_weight="bold"),
+    ]
+    for i in cluster.edges:
+        e = edges[i]
+        (x1, y1), (x2, y2) = pos[e["source"]], pos[e["target"]]
+        parts.append(
+            f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"'
+            ' stroke="#5f6368"/>'
+        )
+    parts.extend(_svg_node(nodes[i], *pos[i]) for i in cluster.members)
+    return ClusterBox("".join(parts), width, height, local)
+
+
+def _layered_positions(
+    diagram: Dict[str, Any], clusters: List[Cluster]
+) -> Optional[Dict[str, List[Position]]]:
+    try:
+        from app.diagram.layout import cluster_positions
+    except ImportError:  # numpy 미설치 -> 격자 배치
+        return None
+    return cluster_positions(diagram, clusters)
+
+
+def iter_svg(
+    diagram: Dict[str, Any],
+    cache: Optional[RenderCache] = None,
+    layout: Union[str, Dict[int, Position], None] = "layered",
+) -> Iterator[str]:
+    """
+    SVG 조각을 순서대로 yield
+    - 센터는 가로로, 센터 안 zone 클러스터는 세로로 배치
+    - layout(노드 index -> 클러스터 로컬 좌표)이 있으면 격자 대신 사용
+    - layout="layered"(기본): app.diagram.layout 계층형 배치, None: 격자
+    클러스터 캐시 값은 members 순서 기준이라 index가 바뀐 다른 리비전에서도 재사용
+    """
+    cache = cache or get_render_cache()
+    nodes = diagram.get("nodes") or []
+    edges = diagram.get("edges") or []
+    clusters = build_clusters(diagram)
+
+    # 계층형 배치는 클러스터 서명 단위로 캐시 -> 캐시에 없는 클러스터만,
+    # 첫 miss 때 한 번에 배치 (전부 캐시에 있으면 레이아웃 계산 없음)
+    layered: Dict[str, Optional[List[Position]]] = {}
+
+    def layered_local(c: Cluster) -> Optional[List[Position]]:
+        if c.scope not in layered:
+            pending = [
+                o
+                for o in clusters.values()
+                if o.scope not in layered
+                and (
+                    o.scope == c.scope or cache.get("svg:layered", o.signature) is None
+                )
+            ]
+            found = _layered_positions(diagram, pending) or {}
+            layered.update({o.scope: found.get(o.scope) for o in pending})
+        return layered[c.scope]
+
+    by_center: "OrderedDict[Optional[str], List[Tuple[Cluster, ClusterBox]]]"
+    by_center = OrderedDict()
+    for c in clusters.values():
+        if layout == "layered":
+            box = cache.get_or_render(
+                "svg:layered",
+                c.signature,
+                lambda c=c: _svg_cluster(diagram, c, layered_local(c)),
+            )
+        else:
+            local = None
+            if layout is not None and all(i in layout for i in c.members):
+                local = [layout[i] for i in c.members]
+            sig = c.signature
+            if local is not None:
+                sig += (
+                    ":"
+                    + hashlib.blake2b(repr(local).encode(), digest_size=8).hexdigest()
+                )
+            box = cache.get_or_render(
+                "svg", sig, lambda c=c, local=local: _svg_cluster(diagram, c, local)
+            )
+        by_center.setdefault(c.center, []).append((c, box))
+
+    # 배치 (절대 좌표)
+    absolute: Dict[int, Position] = {}
+    placed: List[Tuple[Optional[str], float, float, float, float]] = []
+    placed_boxes: List[Tuple[float, float, ClusterBox]] = []
+    x = PAD
+    total_h = 0.0
+    for center, items in by_center.items():
+        y = PAD + TITLE_H + PAD
+        col_w = max([b.width for _, b in items] or [NODE_W])
+        for c, box in items:
+            placed_boxes.append((x + PAD, y, box))
+            for i, (lx, ly) in zip(c.members, box.positions):
+                absolute[i] = (x + PAD + lx, y + ly)
+            y += box.height + GAP
+        placed.append((center, x, PAD, col_w + 2 * PAD, y - PAD))
+        total_h = max(total_h, y)
+        x += col_w + 2 * PAD + GAP
+
+    # 클러스터 밖 노드는 맨 아래 한 줄
+    loose = [
+        n["index"]
+        for n in nodes
+        if n["label"] not in FRAME_LABELS and n.get("scope") not in clusters
+    ]
+    for k, i in enumerate(loose):
+        absolute[i] = (PAD + k * (NODE_W + GAP) + NODE_W / 2, total_h + NODE_H)
+    width = max(x, PAD + len(loose) * (NODE_W + GAP)) + PAD
+    height = total_h + (2 * NODE_H if loose else 0) + PAD
+
+    yield (
+        '<svg xmlns="http://www.w3.org/2000/svg"'
+        f' width="{width:.0f}" height="{height:.0f}"'
+        f' viewBox="0 0 {width:.0f} {height:.0f}"'
+        ' font-family="sans-serif" font-size="12">\n'
+    )
+    for center, cx, cy, cw, ch in placed:
+        yield (
+            f'<g class="center"><rect x="{cx:.1f}" y="{cy:.1f}" width="{cw:.1f}"'
+            f' height="{ch:.1f}" rx="10" fill="#fafafa" stroke="#3c4043"/>'
+            + _svg_text(cx + PAD / 2, cy + 18, center or "", font_weight="bold")
+            + "</g>\n"
+        )
+    for bx, by, box in placed_boxes:
+        yield f'<g class="zone" transform="translate({bx:.1f},{by:.1f})">{box.svg}</g>\n'
+
+    # 클러스터를 넘나드는 엣지
+    inside = {i for c in clusters.values() for i in c.edges}
+    for i, e in enumerate(edges):
+        if e["type"] in STRUCTURAL_RELATIONS or i in inside:
+            continue
+        if e["source"] not in absolute or e["target"] not in absolute:
+            continue
+        (x1, y1), (x2, y2) = absolute[e["source"]], absolute[e["target"]]
+        yield (
+            f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"'
+            ' stroke="#d93025" stroke-opacity="0.7"/>\n'
+        )
+    for i in loose:
+        yield _svg_node(nodes[i], *absolute[i]) + "\n"
+    yield "</svg>\n"
+
+
+# =========================================================
+# Entry
+# =========================================================
+RENDERERS = {"mermaid": iter_mermaid, "svg": iter_svg}
+
+
+def iter_render(diagram: Dict[str, Any], fmt: str, **kwargs: Any) -> Iterator[str]:
+    renderer = RENDERERS.get(fmt)
+    if renderer is None:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return renderer(diagram, **kwargs)
+
+
+def render(diagram: Dict[str, Any], fmt: str, **kwargs: Any) -> str:
+    return "".join(iter_render(diagram, fmt, **kwargs))
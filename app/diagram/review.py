@@ -0,0 +1,223 @@
+# app/diagram/review.py
+"""
+구성도 품질 지표 (NumPy 배열 한 번 훑기)
+
+- orphans          : 연결(CONNECTED_TO)이 하나도 없는 엔티티
+- unplaced         : 소속(zone / center)이 없는 엔티티 (DBMS는 스키마상 소속 관계 없음)
+- disallowed       : ALLOWED_TRIPLES에 없는 관계 (조립 시 걸러진 violations 포함)
+- duplicate_names  : 같은 scope 안 같은 이름이 다른 라벨로 중복
+- crossings        : 계층형 레이아웃 기준 간선 교차 수 (레이아웃 전체 계산이 필요해
+                     opt-in: 호출자가 넘기거나 with_crossings=True, 아니면 None)
+- zone_boundary    : 내부망 Server/DBMS가 Interface 없이 ExternalSystem 또는
+                     대외망 노드와 직접 연결
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.diagram.schema import ALLOWED_TRIPLES, RELATIONS
+
+FRAME_LABELS = ("Diagram", "Corporation", "Center", "NetworkZone")
+ENTITY_LABELS = (
+    "Server",
+    "DBMS",
+    "Interface",
+    "ExternalSystem",
+    "NetworkDevice",
+    "SystemGroup",
+)
+LABELS = FRAME_LABELS + ENTITY_LABELS
+PLACEMENT_RELATIONS = ("IN_ZONE", "HAS_DEVICE")
+
+INTERNAL_ZONES = ("internal", "internal_sdn")
+EXTERNAL_ZONES = ("external",)
+
+# 지표별 감점 (개수당, 지표별 상한)
+PENALTIES: Dict[str, tuple] = {
+    "disallowed": (10.0, 40.0),
+    "zone_boundary": (10.0, 30.0),
+    "duplicate_names": (5.0, 20.0),
+    "unplaced": (2.0, 20.0),
+    "orphans": (1.0, 20.0),
+    "crossings": (0.2, 10.0),
+}
+
+_LABEL_ID = {lb: i for i, lb in enumerate(LABELS)}
+_REL_ID = {r: i for i, r in enumerate(RELATIONS)}
+
+
+def _allowed_table() -> np.ndarray:
+    table = np.zeros((len(LABELS) + 1, len(RELATIONS) + 1, len(LABELS) + 1), bool)
+    for h, r, t in ALLOWED_TRIPLES:
+        if h in _LABEL_ID and t in _LABEL_ID and r in _REL_ID:
+            table[_LABEL_ID[h], _REL_ID[r], _LABEL_ID[t]] = True
+    return table
+
+
+_ALLOWED = _allowed_table()
+_UNKNOWN_LABEL = len(LABELS)
+_UNKNOWN_REL = len(RELATIONS)
+
+
+def _arrays(diagram: Dict[str, Any]):
+    nodes = diagram.get("nodes") or []
+    edges = diagram.get("edges") or []
+    n = len(nodes)
+    label = np.fromiter(
+        (_LABEL_ID.get(nd["label"], _UNKNOWN_LABEL) for nd in nodes), np.int64, n
+    )
+    # scope -> zone 종류 (NetworkZone 노드의 zone 속성)
+    zone_of_scope = {
+        nd.get("scope"): nd.get("zone")
+        for nd in nodes
+        if nd["label"] == "NetworkZone" and nd.get("scope")
+    }
+    zone = np.array([zone_of_scope.get(nd.get("scope")) or "" for nd in nodes])
+    m = len(edges)
+    src = np.fromiter((e["source"] for e in edges), np.int64, m)
+    dst = np.fromiter((e["target"] for e in edges), np.int64, m)
+    rel = np.fromiter(
+        (_REL_ID.get(e["type"], _UNKNOWN_REL) for e in edges), np.int64, m
+    )
+    return nodes, label, zone, src, dst, rel
+
+
+def _names(nodes: List[Dict[str, Any]], idx: np.ndarray) -> List[str]:
+    return [nodes[i].get("name") or "" for i in idx.tolist()]
+
+
+def review_diagram(
+    diagram: Dict[str, Any],
+    crossings: Optional[int] = None,
+    sample: int = 20,
+    with_crossings: bool = False,
+) -> Dict[str, Any]:
+    """
+    지표 계산 -> {"metrics": {...}, "issues": [...], "quality_score": float}
+    - crossings: 이미 계산된 레이아웃 교차 수
+    - with_crossings: crossings가 없을 때 layout_crossings로 계산 (클러스터 서명 캐시)
+      둘 다 없으면 metrics["crossings"]는 None (감점 없음)
+    - sample: 지표별 이슈 예시 최대 개수
+    """
+    nodes, label, zone, src, dst, rel = _arrays(diagram)
+    n = len(nodes)
+    entity = label >= len(FRAME_LABELS)
+    entity &= label != _UNKNOWN_LABEL
+    connected = rel == _REL_ID["CONNECTED_TO"]
+
+    # --- orphans / unplaced (degree 배열)
+    conn_deg = np.bincount(src[connected], minlength=n) + np.bincount(
+        dst[connected], minlength=n
+    )
+    placement = np.isin(rel, [_REL_ID[r] for r in PLACEMENT_RELATIONS])
+    placed = np.zeros(n, bool)
+    placed[src[placement & (label[src] != _LABEL_ID["Center"])]] = True  # IN_ZONE
+    placed[dst[placement & (label[src] == _LABEL_ID["Center"])]] = True  # HAS_DEVICE
+    orphans = np.flatnonzero(entity & (conn_deg == 0))
+    unplaced = np.flatnonzero(entity & ~placed & (label != _LABEL_ID["DBMS"]))
+
+    # --- disallowed triples (조립 후 추가된 엣지 재검사 + 조립 시 violations)
+    bad = ~_ALLOWED[label[src], rel, label[dst]] if src.size else np.zeros(0, bool)
+    disallowed = [
+        {
+            "source": int(s),
+            "type": RELATIONS[r] if r < len(RELATIONS) else "?",
+            "target": int(t),
+        }
+        for s, r, t in zip(src[bad], rel[bad], dst[bad])
+    ]
+    disallowed.extend(diagram.get("violations") or [])
+
+    # --- duplicate names per scope (라벨이 다른 동명 노드)
+    keys = np.array(
+        [
+            f"{nd.get('scope') or ''}\x1f{(nd.get('name') or '').casefold()}"
+            for nd in nodes
+        ]
+    )
+    dup_idx = np.zeros(0, np.int64)
+    if entity.any():
+        ent = np.flatnonzero(entity)
+        _, inverse, counts = np.unique(
+            keys[ent], return_inverse=True, return_counts=True
+        )
+        dup_idx = ent[counts[inverse] > 1]
+
+    # --- zone boundary
+    internal = np.isin(zone, INTERNAL_ZONES) & np.isin(
+        label, [_LABEL_ID["Server"], _LABEL_ID["DBMS"]]
+    )
+    outside = (label == _LABEL_ID["ExternalSystem"]) | (
+        np.isin(zone, EXTERNAL_ZONES) & entity & (label != _LABEL_ID["Interface"])
+    )
+    crossing_zone = connected & (
+        (internal[src] & outside[dst]) | (outside[src] & internal[dst])
+    )
+    boundary = np.flatnonzero(crossing_zone)
+
+    # --- crossings (opt-in)
+    if crossings is None and with_crossings:
+        from app.diagram.layout import layout_crossings
+
+        crossings = layout_crossings(diagram)
+
+    metrics = {
+        "nodes": n,
+        "edges": int(src.size),
+        "entities": int(entity.sum()),
+        "orphans": int(orphans.size),
+        "unplaced": int(unplaced.size),
+        "disallowed": len(disallowed),
+        "duplicate_names": int(dup_idx.size),
+        "crossings": None if crossings is None else int(crossings),
+        "zone_boundary": int(boundary.size),
+    }
+
+    issues: List[Dict[str, Any]] = []
+    if not n or not entity.any():
+        issues.append({"type": "error", "metric": "empty", "message": "No nodes found"})
+    if not connected.any():
+        issues.append(
+            {"type": "warning", "metric": "edges", "message": "No edges found"}
+        )
+    for metric, level, items in (
+        ("disallowed", "error", disallowed[:sample]),
+        ("zone_boundary", "error", _edge_items(nodes, src, dst, boundary[:sample])),
+        ("duplicate_names", "warning", _names(nodes, dup_idx[:sample])),
+        ("unplaced", "warning", _names(nodes, unplaced[:sample])),
+        ("orphans", "info", _names(nodes, orphans[:sample])),
+    ):
+        if metrics[metric]:
+            issues.append(
+                {
+                    "type": level,
+                    "metric": metric,
+                    "count": metrics[metric],
+                    "examples": items,
+                }
+            )
+
+    return {
+        "metrics": metrics,
+        "issues": issues,
+        "quality_score": quality_score(metrics, bool(n and entity.any())),
+    }
+
+
+def _edge_items(nodes, src, dst, idx: np.ndarray) -> List[str]:
+    return [
+        f"{nodes[s].get('name')} -> {nodes[t].get('name')}"
+        for s, t in zip(src[idx].tolist(), dst[idx].tolist())
+    ]
+
+
+def quality_score(metrics: Dict[str, int], has_nodes: bool = True) -> float:
+    if not has_nodes:
+        return 0.0
+    score = 100.0
+    for metric, (per_item, cap) in PENALTIES.items():
+        score -= min((metrics.get(metric) or 0) * per_item, cap)
+    return round(max(0.0, score), 1)
@@ -0,0 +1,69 @@
+# app/diagram/schema.py
+"""
+구성도 그래프 스키마 (노드 라벨 / 관계 / 허용 triple)
+scripts/validate_dataset.py(학습 데이터 검증)와 조립 단계가 같은 정의를 공유
+"""
+
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, Tuple
+
+Triple = Tuple[str, str, str]
+
+ALLOWED_TRIPLES: FrozenSet[Triple] = frozenset(
+    {
+        ("Diagram", "HAS_COVERS", "Corporation"),
+        ("Corporation", "HAS_CENTER", "Center"),
+        ("Center", "HAS_ZONE", "NetworkZone"),
+        ("Center", "HAS_DEVICE", "NetworkDevice"),
+        ("NetworkDevice", "CONNECTED_TO", "NetworkDevice"),
+        ("NetworkDevice", "CONNECTED_TO", "Server"),
+        ("NetworkDevice", "CONNECTED_TO", "Interface"),
+        ("NetworkDevice", "CONNECTED_TO", "ExternalSystem"),
+        ("Server", "IN_ZONE", "NetworkZone"),
+        ("Server", "IN_GROUP", "SystemGroup"),
+        ("Server", "CONNECTED_TO", "DBMS"),
+        ("Server", "CONNECTED_TO", "NetworkDevice"),
+        ("Server", "CONNECTED_TO", "Interface"),
+        ("Server", "CONNECTED_TO", "ExternalSystem"),
+        ("Server", "CONNECTED_TO", "Server"),
+        ("SystemGroup", "IN_ZONE", "NetworkZone"),
+        ("Interface", "IN_ZONE", "NetworkZone"),
+        ("Interface", "IN_GROUP", "SystemGroup"),
+        ("Interface", "CONNECTED_TO", "NetworkDevice"),
+        ("Interface", "CONNECTED_TO", "Interface"),
+        ("Interface", "CONNECTED_TO", "ExternalSystem"),
+        ("ExternalSystem", "IN_ZONE", "NetworkZone"),
+        ("ExternalSystem", "IN_GROUP", "SystemGroup"),
+        ("ExternalSystem", "CONNECTED_TO", "NetworkDevice"),
+        ("ExternalSystem", "CONNECTED_TO", "Interface"),
+        ("ExternalSystem", "CONNECTED_TO", "ExternalSystem"),
+        ("DBMS", "CONNECTED_TO", "DBMS"),
+    }
+)
+
+# 관계 타입 (adjacency 배열 순서)
+RELATIONS: Tuple[str, ...] = (
+    "HAS_COVERS",
+    "HAS_CENTER",
+    "HAS_ZONE",
+    "HAS_DEVICE",
+    "IN_ZONE",
+    "IN_GROUP",
+    "CONNECTED_TO",
+)
+
+# 방향이 의미 없는 관계 (역방향만 허용되면 뒤집어서 저장)
+SYMMETRIC_RELATIONS: FrozenSet[str] = frozenset({"CONNECTED_TO"})
+
+# zone 안에 배치되는 라벨 -> 소속 관계
+ZONE_MEMBER_RELATION: Dict[str, str] = {
+    "Server": "IN_ZONE",
+    "Interface": "IN_ZONE",
+    "ExternalSystem": "IN_ZONE",
+    "SystemGroup": "IN_ZONE",
+}
+
+
+def is_allowed(head: str, relation: str, tail: str) -> bool:
+    return (head, relation, tail) in ALLOWED_TRIPLES
@@ -0,0 +1,248 @@
+# app/diagram/validate.py
+"""
+scope 단위 증분 검증 (edge_validation)
+
+- scope_key별 signature = 그 scope의 조립 입력(scope_details / edges.by_scope) 해시
+  (scope_inputs, step_assemble이 이미 가진 입력이라 구성도를 다시 훑지 않음)
+- 엣지 끝점 이름은 다른 scope의 노드로 해석될 수 있으므로, 검증 때 본 이름들의
+  노드 id 목록 해시(context)도 함께 비교 -> 다른 scope가 같은 이름을 추가 / 삭제하면 재검증
+- 둘 다 캐시와 같으면 이전 결과 재사용, 바뀐 scope만 재검증
+- 캐시는 state["validation_cache"] (체크포인트에 그대로 저장되는 dict)
+- scope 밖 엣지/노드는 GLOBAL_SCOPE("") 키로 묶음 (입력: 법인 / 센터 / scope 밖 엣지 블록)
+
+검증 항목
+- missing_nodes : scope 상세에 없이 엣지에서 처음 등장한 노드(origin="edges"),
+                  해석하지 못한 엣지 세그먼트
+- ambiguous     : 엣지 끝점 이름이 여러 노드에 걸리는 경우 (같은 scope 안 다른 라벨,
+                  scope 밖으로 해석된 이름의 동명 노드)
+- violations    : ALLOWED_TRIPLES에 없는 관계
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.diagram.model import _name_key
+
+GLOBAL_SCOPE = ""  # 헤더가 scope에 매칭되지 않은 엣지 / 노드
+
+_CONNECTED = "CONNECTED_TO"
+
+
+def _bucket(scope: Optional[str]) -> str:
+    return scope if scope is not None else GLOBAL_SCOPE
+
+
+class _Contrib:
+    """한 scope가 기여한 노드/엣지 index"""
+
+    __slots__ = ("nodes", "edges", "unresolved", "violations")
+
+    def __init__(self) -> None:
+        self.nodes: List[int] = []
+        self.edges: List[int] = []
+        self.unresolved: List[Dict[str, Any]] = []
+        self.violations: List[Dict[str, Any]] = []
+
+
+def _contributions(diagram: Dict[str, Any]) -> Dict[str, _Contrib]:
+    out: Dict[str, _Contrib] = {}
+    for i, node in enumerate(diagram.get("nodes") or []):
+        if node.get("scope") is not None or node.get("origin"):
+            out.setdefault(_bucket(node.get("scope")), _Contrib()).nodes.append(i)
+    for i, edge in enumerate(diagram.get("edges") or []):
+        out.setdefault(_bucket(edge.get("scope")), _Contrib()).edges.append(i)
+    for item in diagram.get("unresolved") or []:
+        out.setdefault(_bucket(item.get("scope")), _Contrib()).unresolved.append(item)
+    for item in diagram.get("violations") or []:
+        out.setdefault(_bucket(item.get("scope")), _Contrib()).violations.append(item)
+    return out
+
+
+def _by_name(nodes: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    index: Dict[str, List[int]] = {}
+    for i, node in enumerate(nodes):
+        index.setdefault(_name_key(node.get("name") or ""), []).append(i)
+    return index
+
+
+def _node_id(nodes: List[Dict[str, Any]], i: int) -> str:
+    return nodes[i].get("id") or str(i)
+
+
+def _record_key(record: Optional[Dict[str, Any]]) -> str:
+    """
+    scope_details / edges.by_scope 레코드 -> 해시 재료
+    - 후보는 같은 단계에서 text로부터 추출되므로 text + 후보 수로 대표
+      (후보 dict 전체 직렬화는 검증 자체보다 비쌈)
+    """
+    if not record:
+        return ""
+    scope = record.get("scope")
+    return "\x1f".join(
+        (
+            json.dumps(scope, ensure_ascii=False, sort_keys=True) if scope else "",
+            record.get("header") or "",
+            record.get("text") or "",
+            str(len(record.get("candidates") or ())),
+        )
+    )
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def scope_inputs(state: Dict[str, Any]) -> Dict[str, str]:
+    """
+    scope_key -> 조립 입력 해시 (scope 상세 + 같은 scope의 엣지 블록)
+    - 노드 id에 법인명이 들어가므로(assign_ids) 법인명은 모든 scope에 포함
+    """
+    corp = (state.get("corporation") or {}).get("name") or ""
+    details = state.get("scope_details") or {}
+    by_scope = (state.get("edges") or {}).get("by_scope") or {}
+    inputs = {
+        key: _digest(corp, key, _record_key(detail), _record_key(by_scope.get(key)))
+        for key, detail in details.items()
+    }
+    inputs[GLOBAL_SCOPE] = _digest(
+        corp,
+        "\x1f".join(state.get("centers") or []),
+        *(k + _record_key(v) for k, v in by_scope.items() if k not in details),
+    )
+    return inputs
+
+
+def _context(names: List[str], nodes: List[Dict[str, Any]], by_name) -> str:
+    """검증 때 본 이름들이 가리키는 노드 id (다른 scope 포함)"""
+    h = hashlib.blake2b(digest_size=16)
+    for name in names:
+        h.update(f"{name}\x1f".encode())
+        for j in by_name.get(name, ()):
+            h.update(f"{_node_id(nodes, j)}\x1f".encode())
+    return h.hexdigest()
+
+
+def _check_scope(
+    key: str,
+    contrib: _Contrib,
+    nodes: List[Dict[str, Any]],
+    edges: List[Dict[str, Any]],
+    by_name: Dict[str, List[int]],
+) -> Dict[str, Any]:
+    scope = key or None
+    missing: List[Dict[str, Any]] = [
+        {
+            "name": nodes[i].get("name"),
+            "label": nodes[i].get("label"),
+            "id": nodes[i].get("id"),
+            "scope": scope,
+            "reason": "undeclared",
+        }
+        for i in contrib.nodes
+        if nodes[i].get("origin") == "edges"
+    ]
+    missing.extend(
+        {"name": item.get("text"), "scope": scope, "reason": "unresolved"}
+        for item in contrib.unresolved
+    )
+
+    ambiguous: List[Dict[str, Any]] = []
+    seen = {_name_key(item.get("text") or "") for item in contrib.unresolved}
+    for i in contrib.edges:
+        edge = edges[i]
+        if edge.get("type") != _CONNECTED:
+            continue
+        for end in (edge["source"], edge["target"]):
+            name_key = _name_key(nodes[end].get("name") or "")
+            if name_key in seen:
+                continue
+            seen.add(name_key)
+            hits = by_name.get(name_key) or []
+            if nodes[end].get("scope") == scope:
+                hits = [j for j in hits if nodes[j].get("scope") == scope]
+            if len(hits) > 1:
+                ambiguous.append(
+                    {
+                        "name": nodes[end].get("name"),
+                        "scope": scope,
+                        "resolved": _node_id(nodes, end),
+                        "candidates": [_node_id(nodes, j) for j in hits],
+                    }
+                )
+
+    return {
+        "missing_nodes": missing,
+        "ambiguous": ambiguous,
+        "names": sorted(seen),
+        # 캐시에 남으므로 index 대신 id로 (다른 scope가 바뀌면 index는 밀림)
+        "violations": [
+            {
+                "source_id": _node_id(nodes, item["source"]),
+                "target_id": _node_id(nodes, item["target"]),
+                "triple": item.get("triple"),
+                "scope": scope,
+            }
+            for item in contrib.violations
+        ],
+    }
+
+
+def validate_incremental(
+    diagram: Dict[str, Any],
+    cache: Optional[Dict[str, Any]] = None,
+    inputs: Optional[Dict[str, str]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    (edge_validation, 새 캐시)
+    - cache: 이전 validation_cache
+      (scope_key -> {"sig", "context", 결과, "names", "nodes", "edges"})
+    - inputs: scope_inputs(state) (없으면 캐시 없이 전부 검증)
+    """
+    cache = cache or {}
+    inputs = inputs or {}
+    nodes = diagram.get("nodes") or []
+    edges = diagram.get("edges") or []
+    by_name = _by_name(nodes)
+
+    new_cache: Dict[str, Any] = {}
+    checked: List[str] = []
+    for key, contrib in _contributions(diagram).items():
+        sig = inputs.get(key)
+        entry = cache.get(key)
+        if (
+            sig is None
+            or not entry
+            or entry.get("sig") != sig
+            or entry.get("context")
+            != _context(entry.get("names") or [], nodes, by_name)
+        ):
+            entry = _check_scope(key, contrib, nodes, edges, by_name)
+            entry["sig"] = sig
+            entry["context"] = _context(entry["names"], nodes, by_name)
+            entry["nodes"] = [_node_id(nodes, i) for i in contrib.nodes]
+            entry["edges"] = [edges[i].get("id") or str(i) for i in contrib.edges]
+            checked.append(key)
+        new_cache[key] = entry
+
+    result: Dict[str, Any] = {
+        "missing_nodes": [],
+        "ambiguous": [],
+        "violations": [],
+        "by_scope": {},
+    }
+    for key, entry in new_cache.items():
+        counts = {}
+        for field in ("missing_nodes", "ambiguous", "violations"):
+            result[field].extend(entry[field])
+            counts[field] = len(entry[field])
+        result["by_scope"][key] = counts
+    result["checked"] = checked
+    result["reused"] = len(new_cache) - len(checked)
+    return result, new_cache
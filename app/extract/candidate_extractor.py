@@ -1,6 +1,7 @@
 from __future__ import annotations
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Tuple, Optional
 import json
 from pathlib import Path
@@ -8,11 +9,19 @@ from pathlib import Path
 VOCAB_PATH = Path(__file__).resolve().parents[1] / "common" / "vocab.json"
 # app/extract/... 이면 parents[1] == app
 
-with VOCAB_PATH.open("r", encoding="utf-8") as f:
-    data = json.load(f)
 
-VOCAB = data["VOCAB"]
-ALIAS = data["ALIAS"]
+@lru_cache(maxsize=1)
+def load_vocab() -> dict:
+    """vocab.json 로드 (import 시점이 아니라 최초 사용 시 한 번만)"""
+    with VOCAB_PATH.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def __getattr__(name: str):
+    # 기존 모듈 상수 VOCAB / ALIAS 호환
+    if name in ("VOCAB", "ALIAS"):
+        return load_vocab()[name]
+    raise AttributeError(name)
 
 
 @dataclass
@@ -29,6 +38,10 @@ class CandidateExtractor:
         self.context_chars = context_chars
         self.context_max = context_max
 
+        vocab = load_vocab()
+        VOCAB = vocab["VOCAB"]
+        ALIAS = vocab["ALIAS"]
+
         self.dbms_canon_map = {
             "POSTGRES": "postgres",
             "ORACLE": "oracle",
@@ -476,9 +489,9 @@ class CandidateExtractor:
             gs, ge = base_offset + s, base_offset + e
             out.append(
                 Candidate(
-                    text=text_override
-                    if text_override is not None
-                    else full_text[gs:ge],
+                    text=(
+                        text_override if text_override is not None else full_text[gs:ge]
+                    ),
                     type=type_,
                     span=(gs, ge),
                     context=self._context(full_text, gs, ge),
@@ -9,13 +9,17 @@ rapidfuzz 기반 엔티티 매칭 시스템
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
 try:
     from rapidfuzz import fuzz, process
 
     RAPIDFUZZ_AVAILABLE = True
 except ImportError:
     RAPIDFUZZ_AVAILABLE = False
-    print("Warning: rapidfuzz not installed. Falling back to exact matching.")
+    logger.warning("rapidfuzz not installed. Falling back to exact matching.")
 
 
 @dataclass
@@ -0,0 +1,154 @@
+# app/extract/training_export.py
+"""
+세션에 저장된 후보(candidates) -> GLiNER2 학습 JSONL
+
+- 한 예제 = scope_details[*].text 또는 edges.by_scope[*].text 하나
+- 후보 type을 학습 라벨(scripts/make_dataset.py LABELS)로 매핑
+- 출력 형식은 gliner2.training.data.InputExample.to_dict()와 동일
+  {"input": text, "output": {"entities": {label: [mention, ...]}}}
+- 텍스트 해시로 중복 제거, 세션 단위로 병렬 변환, 한 줄씩 스트리밍
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# CandidateExtractor type -> 학습 라벨
+# NameCandidate / QuotedNameCandidate 는 라벨을 알 수 없어 제외
+CANDIDATE_LABELS: Dict[str, str] = {
+    "CorporationHint": "Corporation",
+    "CenterHint": "Center",
+    "ZoneHint": "NetworkZone",
+    "InterfaceHint": "Interface",
+    "EngineHint": "DBMS",
+    "DBMSRoleHint": "DBMS",
+    "DeviceTypeHint": "NetworkDevice",
+    "DeviceSubtypeHint": "NetworkDevice",
+    "ServerClassHint": "Server",
+    "ServerTypeHint": "Server",
+}
+
+_WS_RE = re.compile(r"\s+")
+
+
+def text_hash(text: str) -> str:
+    """공백 정규화 후 해시 (중복 제거 키)"""
+    norm = _WS_RE.sub(" ", text).strip()
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _input_example_cls():
+    # gliner2 패키지는 torch를 import하므로 설치된 환경에서만 검증에 사용
+    try:
+        from gliner2.training.data import InputExample
+    except Exception:
+        return None
+    return InputExample
+
+
+def _entities(text: str, candidates: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """후보 -> {라벨: [mention]} (텍스트 등장 순서, 라벨 내 중복 제거)"""
+    lowered = text.lower()
+    found: Dict[str, List[str]] = {}
+    for c in sorted(candidates, key=lambda c: tuple(c.get("span") or (0, 0))):
+        label = CANDIDATE_LABELS.get(c.get("type") or "")
+        mention = (c.get("text") or "").strip()
+        if not label or not mention or mention.lower() not in lowered:
+            continue
+        mentions = found.setdefault(label, [])
+        if mention not in mentions:
+            mentions.append(mention)
+    return found
+
+
+def to_record(text: str, candidates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """텍스트 하나 -> 학습 레코드 (라벨 붙은 후보가 없으면 None)"""
+    text = (text or "").strip()
+    if not text:
+        return None
+    entities = _entities(text, candidates or [])
+    if not entities:
+        return None
+
+    cls = _input_example_cls()
+    if cls is None:
+        return {"input": text, "output": {"entities": entities}}
+    example = cls(text=text, entities=entities)
+    if example.validate():
+        return None
+    return example.to_dict()
+
+
+def session_records(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """세션 state(또는 /export/sessions.ndjson 한 줄)의 모든 학습 레코드"""
+    chunks: List[Dict[str, Any]] = list((state.get("scope_details") or {}).values())
+    chunks.extend(((state.get("edges") or {}).get("by_scope") or {}).values())
+
+    out: List[Dict[str, Any]] = []
+    for chunk in chunks:
+        if not isinstance(chunk, dict):
+            continue
+        record = to_record(chunk.get("text") or "", chunk.get("candidates") or [])
+        if record is not None:
+            out.append(record)
+    return out
+
+
+def map_unordered(
+    fn: Callable[[T], R], items: Iterable[T], workers: int = 4
+) -> Iterator[R]:
+    """
+    ThreadPoolExecutor.map과 달리 입력을 한꺼번에 제출하지 않음
+    (진행 중 작업 수를 workers * 2로 제한, 끝난 순서대로 반환)
+    """
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+
+    it = iter(items)
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Set[Future] = set()
+        for item in it:
+            pending.add(pool.submit(fn, item))
+            if len(pending) < window:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+        for fut in pending:
+            yield fut.result()
+
+
+def iter_training_records(
+    sessions: Iterable[T],
+    load: Callable[[T], Optional[Dict[str, Any]]],
+    workers: int = 4,
+    seen: Optional[Set[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    sessions를 병렬로 load -> 변환, 텍스트 해시 기준 중복 제거하며 스트리밍
+    - load: 세션 키 -> state (없으면 None), 워커 스레드에서 실행
+    - seen: 이미 내보낸 해시 (기존 데이터셋에 이어 붙일 때)
+    """
+    seen = set() if seen is None else seen
+
+    def convert(session: T) -> List[Dict[str, Any]]:
+        state = load(session)
+        return session_records(state) if state else []
+
+    for records in map_unordered(convert, sessions, workers):
+        for record in records:
+            h = text_hash(record["input"])
+            if h in seen:
+                continue
+            seen.add(h)
+            yield record
@@ -1,7 +1,9 @@
 # app/graph/checkpointer.py
 from __future__ import annotations
 
-from typing import Optional
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 try:
     from langgraph.checkpoint.memory import MemorySaver
@@ -25,10 +27,87 @@ def get_checkpointer(mode: str = "memory", sqlite_path: Optional[str] = None):
     if mode == "sqlite":
         if not sqlite_path:
             raise ValueError("sqlite_path is required when mode='sqlite'")
-        # (질문) SQLiteSaver를 쓸지 여부는 langgraph 버전에 따라 달라요.
-        # 보통은 아래처럼 사용합니다.
+        # langgraph-checkpoint-sqlite 필요
+        # (from_conn_string은 context manager라 서버 수명 동안 쓰려면 직접 연결)
         from langgraph.checkpoint.sqlite import SqliteSaver  # type: ignore
 
-        return SqliteSaver.from_conn_string(f"sqlite:///{sqlite_path}")
+        conn = sqlite3.connect(sqlite_path, check_same_thread=False)
+        return SqliteSaver(conn)
 
     raise ValueError(f"Unknown checkpointer mode: {mode}")
+
+
+# ---- 세션(thread) 순회 ----
+
+_THREAD_PAGE = 500
+
+
+def iter_thread_ids(checkpointer) -> Iterator[str]:
+    """
+    체크포인터에 저장된 thread_id를 하나씩 (전체 목록을 메모리에 만들지 않음)
+    - MemorySaver: storage 키
+    - SqliteSaver: thread_id 기준 keyset 페이지네이션
+    - 그 외: list(None)을 돌며 중복 제거
+    """
+    storage = getattr(checkpointer, "storage", None)
+    if isinstance(storage, dict):
+        # 순회 중 새 세션이 추가될 수 있으므로 키만 복사
+        yield from list(storage.keys())
+        return
+
+    conn = getattr(checkpointer, "conn", None)
+    if isinstance(conn, sqlite3.Connection):
+        last = ""
+        while True:
+            with checkpointer.lock:
+                rows = conn.execute(
+                    "SELECT DISTINCT thread_id FROM checkpoints"
+                    " WHERE thread_id > ? ORDER BY thread_id LIMIT ?",
+                    (last, _THREAD_PAGE),
+                ).fetchall()
+            if not rows:
+                return
+            for (thread_id,) in rows:
+                yield thread_id
+            last = rows[-1][0]
+
+    seen = set()
+    for tup in checkpointer.list(None):
+        thread_id = tup.config["configurable"]["thread_id"]
+        if thread_id not in seen:
+            seen.add(thread_id)
+            yield thread_id
+
+
+def _parse_ts(ts: str) -> datetime:
+    dt = datetime.fromisoformat(ts)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def load_latest_state(
+    checkpointer, thread_id: str, since: Optional[datetime] = None
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """thread의 최신 체크포인트 (ts, state), since 이전이면 None"""
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    tup = checkpointer.get_tuple({"configurable": {"thread_id": thread_id}})
+    if tup is None:
+        return None
+    ts = tup.checkpoint.get("ts") or ""
+    if since is not None and (not ts or _parse_ts(ts) < since):
+        return None
+    return ts, tup.checkpoint.get("channel_values") or {}
+
+
+def iter_latest_states(
+    checkpointer, since: Optional[datetime] = None
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    thread별 최신 체크포인트의 (thread_id, ts, state)
+    since 지정 시 그 이후에 갱신된 세션만
+    """
+    for thread_id in iter_thread_ids(checkpointer):
+        latest = load_latest_state(checkpointer, thread_id, since)
+        if latest is not None:
+            yield thread_id, latest[0], latest[1]
@@ -7,7 +7,7 @@ from langgraph.graph import StateGraph, START, END  # type: ignore
 
 from app.graph.state import GraphState
 from app.graph.checkpointer import get_checkpointer
-from app.graph.nodes_wrapped import (
+from app.graph.node_wrapped import (
     node_corp_center,
     node_networks,
     node_next_scope,
@@ -1,19 +1,67 @@
 # app/graph/graph.py
 from __future__ import annotations
 
-from langgraph.graph import StateGraph, END
-
-from langgraph.checkpoint.memory import MemorySaver  # ← 메모리 사용 (개발용)
-# from langgraph.checkpoint.redis import RedisSaver  # ← Redis 사용 (프로덕션용)
+from threading import Lock
 
+from app.core.logging import get_logger
+from app.core.settings import settings
 from app.graph.state import GraphState
-from app.nodes.chat_handler import chat_handler
 
-# MemorySaver 체크포인터 (개발용 - 메모리에만 저장)
-checkpointer = MemorySaver()
+logger = get_logger(__name__)
+
+# langgraph / 노드 모듈은 import 비용이 커서 get_graph() 최초 호출 시점에 로드
+# (app.main import를 가볍게 유지하고, lifespan warmup에서 미리 빌드)
+_graph = None
+_lock = Lock()
+
+
+def _redis_url() -> str | None:
+    url = settings.SESSION_STORE_URL
+    if settings.CHECKPOINTER_SQLITE_PATH:
+        return None
+    return url if url.startswith(("redis://", "rediss://", "unix://")) else None
+
+
+def check_checkpointer() -> None:
+    """기동 시 설정 검사 (lifespan에서 호출, 실패하면 서버가 뜨지 않음)"""
+    if _redis_url() is None:
+        return
+    try:
+        import langgraph.checkpoint.redis  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(
+            "SESSION_STORE_URL is a Redis URL but langgraph-checkpoint-redis "
+            "is not installed (pip install '.[redis]')"
+        ) from e
+
+
+def _build_checkpointer():
+    """
+    - CHECKPOINTER_SQLITE_PATH 지정 시 SqliteSaver (단일 호스트 영속)
+    - SESSION_STORE_URL이 redis면 RedisSaver (여러 워커가 같은 thread 공유)
+      langgraph-checkpoint-redis가 없거나 연결에 실패하면 시작 시 RuntimeError
+      (MemorySaver로 바꾸면 워커 간 state 공유가 조용히 깨짐)
+    - 그 외(memory:// / fakeredis://)는 MemorySaver (프로세스 메모리에만 저장,
+      fakeredis도 프로세스 내 대체품이라 워커 간 공유 없음 - 테스트 전용)
+    """
+    from app.graph.checkpointer import get_checkpointer
 
-# 프로덕션에서는 Redis 사용:
-# checkpointer = RedisSaver(redis_url="redis://localhost:6379/0")
+    if settings.CHECKPOINTER_SQLITE_PATH:
+        return get_checkpointer("sqlite", settings.CHECKPOINTER_SQLITE_PATH)
+
+    url = _redis_url()
+    if url is not None:
+        check_checkpointer()
+        from langgraph.checkpoint.redis import RedisSaver
+
+        try:
+            saver = RedisSaver(redis_url=url)
+            saver.setup()
+        except Exception as e:
+            raise RuntimeError(f"Redis checkpointer setup failed: {e}") from e
+        return saver
+
+    return get_checkpointer("memory")
 
 
 def build_graph():
@@ -25,10 +73,15 @@ def build_graph():
     2. router: 다음 단계 결정
     3. wait_for_input: 사용자 입력 대기 (interrupt)
     """
+    from langgraph.graph import StateGraph, END
+
+    from app.graph.node_wrapped import instrument_node
+    from app.nodes.chat_handler import chat_handler
+
     g = StateGraph(GraphState)
 
     # 메인 노드: 채팅 처리
-    g.add_node("chat_handler", chat_handler)
+    g.add_node("chat_handler", instrument_node("chat_handler")(chat_handler))
 
     # 사용자 입력 대기 노드 (더미 - 실제로는 interrupt에서 멈춤)
     g.add_node("wait_for_input", lambda s: s)
@@ -55,7 +108,29 @@ def build_graph():
     g.add_edge("wait_for_input", "chat_handler")
 
     # interrupt_before: 이 노드 실행 전에 멈춤
-    return g.compile(checkpointer=checkpointer, interrupt_before=["wait_for_input"])
+    return g.compile(
+        checkpointer=_build_checkpointer(), interrupt_before=["wait_for_input"]
+    )
+
+
+def get_graph():
+    """컴파일된 그래프 싱글톤 (최초 호출 시 빌드)"""
+    global _graph
+    if _graph is None:
+        with _lock:
+            if _graph is None:
+                _graph = build_graph()
+    return _graph
+
+
+def is_built() -> bool:
+    return _graph is not None
 
 
-graph = build_graph()
+def __getattr__(name: str):
+    # 기존 `from app.graph.graph import graph, checkpointer` 호환
+    if name == "graph":
+        return get_graph()
+    if name == "checkpointer":
+        return get_graph().checkpointer
+    raise AttributeError(name)
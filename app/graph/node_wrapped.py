@@ -1,15 +1,34 @@
-# app/graph/nodes_wrapped.py
+# app/graph/node_wrapped.py
 from __future__ import annotations
 
-from typing import Any, Dict
-
+import functools
+import time
+from typing import Any, Callable, Dict
+
+from app.core.langfuse_client import record_node_span
+from app.core.logging import should_sample
+from app.core.metrics import (
+    NODE_CALLS,
+    NODE_CANDIDATES,
+    NODE_CPU_SECONDS,
+    NODE_STATE_BYTES,
+    NODE_WALL_SECONDS,
+)
+from app.core.settings import settings
 from app.graph.state import GraphState
 
+from app.nodes.step_assemble import step_assemble
 from app.nodes.step_corp_center import step_corp_center
+from app.nodes.step_edges import step_edges
 from app.nodes.step_networks import step_networks
 from app.nodes.step_next_scope import step_next_scope
 from app.nodes.step_scope_detail import step_scope_detail
 
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 # LangGraph interrupt (없으면 fallback)
 try:
     from langgraph.types import interrupt  # type: ignore
@@ -17,6 +36,110 @@ except Exception:  # pragma: no cover
     interrupt = None  # type: ignore
 
 
+# =========================================================
+# Instrumentation
+# =========================================================
+def _state_size(state: Any) -> int:
+    """state 직렬화 크기(bytes). orjson이 없으면 측정하지 않음(-1)"""
+    if orjson is None or not isinstance(state, dict):
+        return -1
+    try:
+        return len(orjson.dumps(state, default=str, option=orjson.OPT_NON_STR_KEYS))
+    except Exception:
+        return -1
+
+
+def _count_candidates(state: Any) -> int:
+    """state에 누적된 추출 후보 수 (scope_details + edges + center devices)"""
+    if not isinstance(state, dict):
+        return 0
+    n = 0
+    for rec in (state.get("scope_details") or {}).values():
+        n += len(rec.get("candidates") or [])
+    for rec in ((state.get("edges") or {}).get("by_scope") or {}).values():
+        n += len(rec.get("candidates") or [])
+    for info in (state.get("center_networks") or {}).values():
+        devices = info.get("devices") if isinstance(info, dict) else None
+        n += len(devices) if isinstance(devices, list) else 0
+    return n
+
+
+def instrument_node(name: str) -> Callable[[Callable], Callable]:
+    """
+    노드 함수 계측 데코레이터
+    - wall / CPU(thread) 시간, 추가된 후보 수를 기록
+    - 입출력 state 크기는 METRICS_STATE_SIZE_SAMPLE_RATE 비율의 호출에서만 (기본 끔)
+    - METRICS_LANGFUSE_SPANS가 켜져 있으면 Langfuse span으로도 전송
+    노드가 state를 직접 수정하므로 입력 측 값은 호출 전에 측정한다.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(state, *args, **kwargs):
+            rate = settings.METRICS_STATE_SIZE_SAMPLE_RATE
+            measure_size = rate > 0 and should_sample(rate)
+            in_bytes = _state_size(state) if measure_size else -1
+            in_cands = _count_candidates(state)
+
+            status = "ok"
+            out = None
+            wall0 = time.perf_counter()
+            cpu0 = time.thread_time()
+            try:
+                out = fn(state, *args, **kwargs)
+                return out
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                wall = time.perf_counter() - wall0
+                cpu = time.thread_time() - cpu0
+
+                NODE_CALLS.inc(name, status)
+                NODE_WALL_SECONDS.observe(wall, name)
+                NODE_CPU_SECONDS.observe(cpu, name)
+
+                out_bytes = -1
+                added = 0
+                if out is not None:
+                    out_bytes = _state_size(out) if measure_size else -1
+                    added = max(_count_candidates(out) - in_cands, 0)
+                    if added:
+                        NODE_CANDIDATES.inc(name, amount=added)
+                if in_bytes >= 0:
+                    NODE_STATE_BYTES.observe(in_bytes, name, "in")
+                if out_bytes >= 0:
+                    NODE_STATE_BYTES.observe(out_bytes, name, "out")
+
+                record_node_span(
+                    name,
+                    {
+                        "status": status,
+                        "wall_seconds": wall,
+                        "cpu_seconds": cpu,
+                        "state_bytes_in": in_bytes,
+                        "state_bytes_out": out_bytes,
+                        "candidates_added": added,
+                    },
+                )
+
+        return wrapper
+
+    return decorator
+
+
+# chat_processor에서 직접 호출하는 step 함수들의 계측 버전
+timed_step_networks = instrument_node("step_networks")(step_networks)
+timed_step_next_scope = instrument_node("step_next_scope")(step_next_scope)
+timed_step_scope_detail = instrument_node("step_scope_detail")(step_scope_detail)
+timed_step_edges = instrument_node("step_edges")(step_edges)
+timed_step_assemble = instrument_node("step_assemble")(step_assemble)
+
+
+# =========================================================
+# Graph nodes (app/graph/compiled.py)
+# =========================================================
+@instrument_node("corp_center")
 def node_corp_center(state: GraphState) -> GraphState:
     """
     routes_steps.py에서 state에 corporation/centers를 주입한 뒤 호출됨.
@@ -24,18 +147,16 @@ def node_corp_center(state: GraphState) -> GraphState:
     return step_corp_center(state)
 
 
+@instrument_node("networks")
 def node_networks(state: GraphState) -> GraphState:
     """
-    routes_steps.py에서 networks payload를 state에 주입한 뒤 호출됨.
-    step_networks는 payload를 받는 시그니처라서, state에 저장된 payload를 꺼내 전달.
+    routes_steps.py에서 networks_payload를 state에 주입한 뒤 호출됨.
+    step_networks가 state["networks_payload"]를 직접 읽음.
     """
-    payload = state.get("_networks_payload") or {}
-    new_state = step_networks(state, payload=payload)
-    # payload는 소비했으니 제거(선택)
-    new_state.pop("_networks_payload", None)
-    return new_state
+    return step_networks(state)
 
 
+@instrument_node("next_scope")
 def node_next_scope(state: GraphState) -> GraphState:
     """
     pending_scopes에서 current_scope를 세팅/이동시키는 노드
@@ -43,6 +164,7 @@ def node_next_scope(state: GraphState) -> GraphState:
     return step_next_scope(state)
 
 
+@instrument_node("scope_detail")
 def node_scope_detail(state: GraphState) -> GraphState:
     """
     current_scope가 잡혀있으면 해당 scope의 detail_text를 받아 candidates 저장.
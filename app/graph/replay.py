@@ -0,0 +1,58 @@
+# app/graph/replay.py
+"""
+대화 시나리오 재생
+
+HTTP / 그래프 체크포인트 없이 chat_handler(-> process_chat_message)에
+메시지를 순서대로 넣어 한 세션의 대화를 재현.
+부하 테스트와 대화 흐름 회귀 테스트용.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.nodes.chat_handler import chat_handler
+from app.schemas.ui_payloads import ReplayTurn, ReplayTurnResult
+
+
+def run_script(
+    state: Dict[str, Any], turns: List[ReplayTurn]
+) -> Tuple[Dict[str, Any], List[ReplayTurnResult]]:
+    """
+    state에 turns를 차례로 적용 (state는 직접 수정됨)
+    예외가 나면 그 턴을 실패로 기록하고 중단
+    """
+    results: List[ReplayTurnResult] = []
+    for turn in turns:
+        t0 = time.perf_counter()
+        state["user_message"] = turn.message
+        error = None
+        raised = False
+        try:
+            state = chat_handler(state)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raised = True
+
+        next_step = state.get("next_step")
+        ok = error is None and (
+            turn.expect_next_step is None or turn.expect_next_step == next_step
+        )
+        if error is None and not ok:
+            error = f"expected next_step={turn.expect_next_step}, got {next_step}"
+
+        results.append(
+            ReplayTurnResult(
+                message=turn.message,
+                response=state.get("last_response"),
+                next_step=next_step,
+                ok=ok,
+                error=error,
+                elapsed_ms=round((time.perf_counter() - t0) * 1000, 3),
+            )
+        )
+        if raised:
+            # 처리 도중 예외 -> 이후 턴은 의미 없음
+            break
+    return state, results
@@ -39,12 +39,16 @@ class GraphState(TypedDict, total=False):
     edge_text: Optional[str]
     edges: Dict[str, Any]
 
+    # assembled diagram (app/diagram)
+    diagram: Dict[str, Any]  # {"nodes": [...], "edges": [...], "violations": [...]}
+
     # routing
     requested_step: Optional[str]
     next_step: Optional[str]
 
     # validation
     edge_validation: Dict[str, Any]  # {"missing_nodes": [...], "ambiguous": [...]}
+    validation_cache: Dict[str, Any]  # scope_key -> {"sig", "context", 검증 결과}
 
     # misc flags
     prefill_done: bool
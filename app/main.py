@@ -1,11 +1,70 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from app.api.views import FastJSONResponse
+from app.core.langfuse_client import shutdown_tracing
+from app.core.logging import RequestIdMiddleware, get_logger, setup_logging
+from app.core.metrics import REGISTRY
+from app.core.store import SessionBusy, VersionConflict
 from app.api.routes_sessions import router as sessions_router
 from app.api.routes_steps import router as steps_router
 from app.api.routes_export import router as export_router
 from app.api.routes_chat import router as chat_router
 
-app = FastAPI(title="Diagram Agent")
+setup_logging()
+
+logger = get_logger(__name__)
+
+# 무거운 초기화(langgraph 컴파일, vocab 정규식)는 import 시점이 아니라
+# 기동 직후 백그라운드에서 수행 -> 완료 전까지 /health/ready 는 503
+_ready = threading.Event()
+
+
+def warmup() -> float:
+    """그래프 빌드 + 후보 추출기 초기화, 소요 시간(초) 반환"""
+    from app.core.candidates import get_candidate_extractor
+    from app.graph.graph import get_graph
+
+    t0 = time.perf_counter()
+    get_graph()
+    get_candidate_extractor()
+    return time.perf_counter() - t0
+
+
+def _warmup_in_background() -> None:
+    try:
+        elapsed = warmup()
+    except Exception:
+        logger.exception("warmup failed")
+        return
+    _ready.set()
+    logger.info("warmup done", extra={"fields": {"seconds": round(elapsed, 3)}})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.graph.graph import check_checkpointer
+
+    # Redis 설정인데 saver를 못 만들면 MemorySaver로 조용히 떨어지지 않고 기동 실패
+    check_checkpointer()
+    task = asyncio.create_task(asyncio.to_thread(_warmup_in_background))
+    try:
+        yield
+    finally:
+        if not task.done():
+            task.cancel()
+        shutdown_tracing()
+
+
+app = FastAPI(
+    title="Diagram Agent", default_response_class=FastJSONResponse, lifespan=lifespan
+)
 
 # CORS 설정
 app.add_middleware(
@@ -16,12 +75,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 긴 세션의 응답 압축 (SSE 스트림은 압축 대상에서 제외됨)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# 요청별 correlation id (X-Request-ID)
+app.add_middleware(RequestIdMiddleware)
+
 app.include_router(sessions_router)
 app.include_router(steps_router)
 app.include_router(export_router)
 app.include_router(chat_router)
 
 
+@app.exception_handler(SessionBusy)
+@app.exception_handler(VersionConflict)
+async def session_conflict(request, exc):
+    """같은 run_id 턴이 다른 요청(워커)에서 실행 중 -> 재시도하라는 409"""
+    return JSONResponse({"detail": str(exc)}, status_code=409)
+
+
 @app.get("/health")
 def health():
+    """liveness: 프로세스가 응답 가능한지만 확인"""
     return {"ok": True}
+
+
+@app.get("/health/ready")
+def ready():
+    """readiness: 워밍업(그래프/추출기 초기화) 완료 여부"""
+    if not _ready.is_set():
+        return JSONResponse({"ok": False, "ready": False}, status_code=503)
+    return {"ok": True, "ready": True}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,12 +1,18 @@
 from __future__ import annotations
+import hashlib
+import unicodedata
 import uuid
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from app.core.settings import settings
 
 PREFIX_MAP = {
+    "Diagram": "dgm",
     "Corporation": "corp",
     "Center": "ctr",
     "NetworkZone": "zone",
     "ServerGroup": "svrg",
+    "SystemGroup": "sysg",
     "Server": "svr",
     "DBMS": "dbms",
     "Interface": "if",
@@ -16,32 +22,139 @@ PREFIX_MAP = {
     "User": "user",
 }
 
+# content id 해시 길이 (hex). 충돌 시 최대 길이까지 늘림
+ID_HEX_LEN = 16
+ID_HEX_MAX = 32
+
 
 def _new_id(prefix: str) -> str:
     return f"{prefix}-{uuid.uuid4().hex[:8]}"
 
 
-def assign_ids(state: Dict[str, Any]) -> Dict[str, Any]:
+def canonical_name(name: str) -> str:
+    """NFKC + 공백 정리 + casefold ('ＷＥＢ01 ' == 'web01')"""
+    return " ".join(unicodedata.normalize("NFKC", name or "").split()).casefold()
+
+
+def content_key(label: str, name: str, scope_path: str = "") -> str:
+    """id의 원천이 되는 정규화된 내용 키"""
+    return "\x1f".join((label, canonical_name(name), scope_path))
+
+
+def _digest(key: str) -> str:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=ID_HEX_MAX // 2).hexdigest()
+
+
+class IdIndex:
     """
-    - nodes 배열을 순회하며
-    - id 없는 노드에만 prefix-uuid 부여
-    - 이미 id가 있으면 절대 건드리지 않음
+    구성도 하나의 id -> content key 인덱스 (충돌 감지)
+    - 다른 내용이 같은 id로 떨어지면 해시 길이를 늘려 재시도
+    - 내용까지 같은 중복 노드는 '~2', '~3' 접미사 (등장 순서 기준, 결정적)
     """
-    nodes: List[Dict[str, Any]] = state.get("nodes", [])
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, str] = {}
+        self.collisions = 0
+
+    def reserve(self, node_id: str, key: Optional[str] = None) -> None:
+        """이미 id가 있는 노드 등록"""
+        self.ids.setdefault(node_id, key or node_id)
+
+    def assign(self, prefix: str, key: str) -> str:
+        digest = _digest(key)
+        for n in range(ID_HEX_LEN, ID_HEX_MAX + 1, 4):
+            node_id = f"{prefix}-{digest[:n]}"
+            owner = self.ids.get(node_id)
+            if owner is None:
+                self.ids[node_id] = key
+                return node_id
+            if owner == key:
+                break
+            self.collisions += 1
+
+        # 같은 내용의 중복 노드
+        base = f"{prefix}-{digest[:ID_HEX_LEN]}"
+        i = 2
+        while f"{base}~{i}" in self.ids:
+            i += 1
+        node_id = f"{base}~{i}"
+        self.ids[node_id] = key
+        return node_id
+
+
+def _prefix(label: Optional[str]) -> str:
+    if not label:
+        raise ValueError("Node without label cannot get ID")
+    prefix = PREFIX_MAP.get(label)
+    if not prefix:
+        raise ValueError(f"Unknown label for ID assignment: {label}")
+    return prefix
+
+
+def _scope_path(state: Dict[str, Any], node: Dict[str, Any]) -> str:
+    """법인/scope 경로 ('은행/의왕:internal'), 세션(run_id)과 무관"""
+    corp = (state.get("corporation") or {}).get("name") or ""
+    return f"{corp}/{node.get('scope') or ''}"
+
+
+def _assign_nodes(
+    state: Dict[str, Any], nodes: List[Dict[str, Any]], mode: str
+) -> IdIndex:
+    index = IdIndex()
+    for node in nodes:
+        if node.get("id"):
+            index.reserve(node["id"])
 
     for node in nodes:
         if "id" in node and node["id"]:
             continue
 
-        label = node.get("label")
-        if not label:
-            raise ValueError("Node without label cannot get ID")
+        prefix = _prefix(node.get("label"))
+        if mode == "random":
+            node["id"] = _new_id(prefix)
+            continue
 
-        prefix = PREFIX_MAP.get(label)
-        if not prefix:
-            raise ValueError(f"Unknown label for ID assignment: {label}")
+        key = content_key(
+            node["label"], node.get("name") or "", _scope_path(state, node)
+        )
+        node["id"] = index.assign(prefix, key)
+    return index
+
+
+def _assign_edges(diagram: Dict[str, Any]) -> None:
+    """diagram 엣지에 source_id / target_id / id(내용 해시) 부여"""
+    nodes = diagram.get("nodes") or []
+    seen: Dict[str, int] = {}
+    for edge in diagram.get("edges") or []:
+        src = nodes[edge["source"]]["id"]
+        dst = nodes[edge["target"]]["id"]
+        edge["source_id"], edge["target_id"] = src, dst
+        key = "|".join((src, edge["type"], dst))
+        base = f"rel-{_digest(key)[:ID_HEX_LEN]}"
+        n = seen.get(base, 0) + 1
+        seen[base] = n
+        edge["id"] = base if n == 1 else f"{base}~{n}"
+
+
+def assign_ids(state: Dict[str, Any], mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    - nodes 배열(및 state["diagram"]["nodes"])을 순회하며
+    - id 없는 노드에만 id 부여
+      - "content"(기본): prefix + hash(label, 정규화 이름, 법인/scope 경로)
+        같은 입력이면 세션이 달라도 같은 id -> diff / 렌더 캐시 재사용 가능
+      - "random": 기존 방식 prefix-uuid
+    - 이미 id가 있으면 절대 건드리지 않음 (충돌 검사에는 포함)
+    """
+    mode = mode or settings.ID_MODE
 
-        node["id"] = _new_id(prefix)
+    if "nodes" in state:
+        nodes: List[Dict[str, Any]] = state.get("nodes") or []
+        _assign_nodes(state, nodes, mode)
+        state["nodes"] = nodes
 
-    state["nodes"] = nodes
+    diagram = state.get("diagram")
+    if diagram:
+        index = _assign_nodes(state, diagram.get("nodes") or [], mode)
+        _assign_edges(diagram)
+        diagram["id_collisions"] = index.collisions
     return state
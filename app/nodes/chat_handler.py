@@ -4,7 +4,8 @@
 """
 
 from __future__ import annotations
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, List
 
 from app.graph.state import GraphState
 from app.nodes.chat_processor import process_chat_message
@@ -20,6 +21,7 @@ def chat_handler(state: GraphState) -> dict:
 
     출력:
         - state 전체 업데이트 (current_center_index, center_networks 등)
+        - state["messages"]에 이번 턴의 사용자/어시스턴트 메시지 추가
     """
     # state가 튜플이면 딕셔너리로 변환
     if isinstance(state, tuple):
@@ -29,21 +31,37 @@ def chat_handler(state: GraphState) -> dict:
 
     user_message = state.get("user_message", "")
 
-    if not user_message or user_message == "초기화":
-        # 초기화 메시지면 환영 메시지만 설정하고 반환
-        if user_message == "초기화":
-            state["last_response"] = state.get("last_response", "")
-            state["user_message"] = None
+    if not user_message:
         return state
 
-    # process_chat_message가 state를 직접 수정함
-    chat_result = process_chat_message(state, user_message)
+    if user_message == "초기화":
+        # 초기화 메시지면 환영 메시지만 유지
+        state["last_response"] = state.get("last_response", "")
+    else:
+        # process_chat_message가 state를 직접 수정함
+        chat_result = process_chat_message(state, user_message)
 
-    # chat_result에서 반환된 정보를 state에 추가
-    state["last_response"] = chat_result.get("response", "")
-    state["last_ui_data"] = chat_result.get("ui_data", {})
+        # chat_result에서 반환된 정보를 state에 추가
+        state["last_response"] = chat_result.get("response", "")
+        state["last_ui_data"] = chat_result.get("ui_data", {})
+
+    _append_turn_messages(state, user_message, state.get("last_response"))
 
     # user_message는 처리 완료 후 제거 (다음 호출 시 재처리 방지)
     state["user_message"] = None
 
     return state
+
+
+def _append_turn_messages(
+    state: GraphState, user_message: str, assistant_response: str | None
+) -> None:
+    """이번 턴의 사용자/어시스턴트 메시지를 messages 히스토리에 누적"""
+    now = datetime.now().isoformat()
+    messages: List[Dict[str, Any]] = list(state.get("messages") or [])
+    messages.append({"role": "user", "content": user_message, "timestamp": now})
+    if assistant_response:
+        messages.append(
+            {"role": "assistant", "content": assistant_response, "timestamp": now}
+        )
+    state["messages"] = messages
@@ -1,11 +1,24 @@
 # app/nodes/chat_processor.py
 from __future__ import annotations
 
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 
 from app.graph.state import GraphState
 from app.core.candidates import get_candidate_extractor
+from app.core.logging import get_logger
+from app.extract.fuzzy_matcher import fuzzy_matcher
+from app.nodes.step_edges import _split_by_headers
+from app.graph.node_wrapped import (
+    timed_step_assemble as step_assemble,
+    timed_step_edges as step_edges,
+    timed_step_networks as step_networks,
+    timed_step_next_scope as step_next_scope,
+    timed_step_scope_detail as step_scope_detail,
+)
+
+logger = get_logger(__name__)
 
 
 # =========================================================
@@ -45,6 +58,71 @@ def _sort_centers_preferred(centers: List[str]) -> List[str]:
     )
 
 
+# =========================================================
+# 0-1) Intent / keyword matchers (모듈 로드 시 한 번만 컴파일)
+# =========================================================
+def _keyword_re(keywords: List[str]) -> Pattern[str]:
+    """키워드 중 하나라도 포함되면 매치 (대소문자 무시)"""
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+
+# 특수 명령: 메시지 전체(소문자)가 일치할 때만
+COMMAND_INTENTS: Dict[str, str] = {
+    **dict.fromkeys(["요약", "상태", "summary"], "summary"),
+    **dict.fromkeys(["다시", "돌아가", "이전", "뒤로", "reject", "back"], "back"),
+}
+
+# 확인 대기 중 응답: 부분 일치, confirm이 reject보다 우선
+CONFIRM_RE = _keyword_re(["확인", "네", "yes", "맞아", "맞습니다", "ok", "ㅇㅋ"])
+REJECT_RE = _keyword_re(["아니", "no", "다시", "아니요"])
+
+CORPORATION_KEYWORDS = [
+    "은행",
+    "중앙회",
+    "농협",
+    "신협",
+    "카드",
+    "증권",
+    "보험",
+    "캐피탈",
+    "저축은행",
+]
+PRIORITY_CENTERS = ["의왕", "안성", "AWS", "IDC"]
+CENTER_SUFFIX_RES = [
+    re.compile(r"([가-힣A-Za-z0-9]+)센터"),
+    re.compile(r"([가-힣A-Za-z0-9]+)지점"),
+    re.compile(r"([가-힣A-Za-z0-9]+)본점"),
+]
+ENGLISH_CAPS_RE = re.compile(r"\b[A-Z]{2,}\b")
+
+# 네트워크 영역 키워드 (표준화된 zone label -> 부분 일치 패턴)
+ZONE_KEYWORDS: Dict[str, List[str]] = {
+    "내부망": ["내부망", "업무망"],
+    "DMZ망": ["dmz", "dmz망", "디엠지", "대외dmz"],
+    "외부망": ["외부망", "대외망", "인터넷망", "인터넷", "외부"],
+    "지점망": ["지점망", "영업점망", "점포망"],
+    "사용자망": ["사용자망", "유저망"],
+}
+ZONE_RES: List[Tuple[str, Pattern[str]]] = [
+    (label, _keyword_re(keys)) for label, keys in ZONE_KEYWORDS.items()
+]
+
+
+def match_command(message: str) -> Optional[str]:
+    """'summary' | 'back' | None"""
+    return COMMAND_INTENTS.get(message.lower())
+
+
+def match_confirmation(message: str) -> Optional[str]:
+    """'confirm' | 'reject' | None"""
+    if CONFIRM_RE.search(message):
+        return "confirm"
+    if REJECT_RE.search(message):
+        return "reject"
+    return None
+
+
 # =========================================================
 # 1) Chat history (절대 삭제하지 않음)
 # =========================================================
@@ -192,7 +270,6 @@ def _bubble(
 # 3) Public entry
 # =========================================================
 def process_chat_message(state: GraphState, user_message: str) -> Dict[str, Any]:
-    extractor = get_candidate_extractor()
     step = state.get("next_step", "corp-center")
 
     msg = (user_message or "").strip()
@@ -200,56 +277,16 @@ def process_chat_message(state: GraphState, user_message: str) -> Dict[str, Any]
     # 기록: 사용자 입력은 무조건 누적
     _push_history(state, role="user", text=msg, step=step, meta={})
 
-    # 특수 명령
-    if msg.lower() in ["요약", "상태", "summary"]:
-        res = _handle_summary(state)
-        _push_history(
-            state,
-            role="assistant",
-            text=res["response"],
-            step=res["next_step"],
-            ui_data=res.get("ui_data"),
-        )
-        return res
-
-    if msg.lower() in ["다시", "돌아가", "이전", "뒤로", "reject", "back"]:
-        res = _handle_back(state, current_step=step)
-        _push_history(
-            state,
-            role="assistant",
-            text=res["response"],
-            step=res["next_step"],
-            ui_data=res.get("ui_data"),
-        )
-        return res
-
-    # 단계별 처리
-    if step == "corp-center":
-        res = _step_corp_center(state, msg, extractor)
-    elif step == "networks":
-        res = _step_networks(state, msg, extractor)
-    elif step == "scope-detail":
-        res = _step_scope_detail(state, msg, extractor)
-    elif step == "edges":
-        res = _step_edges(state, msg, extractor)
+    # 특수 명령 -> 단계별 처리 (핸들러 테이블은 모듈 하단)
+    command = match_command(msg)
+    if command is not None:
+        res = _COMMAND_HANDLERS[command](state, step)
     else:
-        ui = _ui_payload(
-            title="오류",
-            subtitle="단계를 인식할 수 없습니다",
-            step=step,
-            progress=(1, 1),
-            summary={"next_step": step},
-            target={},
-            extracted={"message": msg},
-            examples=[],
-            actions=["summary", "reset"],
-            helper="next_step 값을 확인해주세요.",
-        )
-        res = {
-            "response": "단계를 인식할 수 없습니다.",
-            "next_step": step,
-            "ui_data": ui,
-        }
+        handler = _STEP_HANDLERS.get(step)
+        if handler is not None:
+            res = handler(state, msg, get_candidate_extractor())
+        else:
+            res = _handle_unknown_step(step, msg)
 
     # 기록: 어시스턴트 응답도 누적
     _push_history(
@@ -262,6 +299,26 @@ def process_chat_message(state: GraphState, user_message: str) -> Dict[str, Any]
     return res
 
 
+def _handle_unknown_step(step: str, msg: str) -> Dict[str, Any]:
+    ui = _ui_payload(
+        title="오류",
+        subtitle="단계를 인식할 수 없습니다",
+        step=step,
+        progress=(1, 1),
+        summary={"next_step": step},
+        target={},
+        extracted={"message": msg},
+        examples=[],
+        actions=["summary", "reset"],
+        helper="next_step 값을 확인해주세요.",
+    )
+    return {
+        "response": "단계를 인식할 수 없습니다.",
+        "next_step": step,
+        "ui_data": ui,
+    }
+
+
 # =========================================================
 # 4) Summary + Back (대화 삭제 금지)
 # =========================================================
@@ -460,20 +517,14 @@ def _handle_back(state: GraphState, current_step: str) -> Dict[str, Any]:
 # 5) Step: corp-center (원래 로직 + Fuzzy Matching 보조)
 # =========================================================
 def _step_corp_center(state: GraphState, message: str, extractor) -> Dict[str, Any]:
-    import re
-    from app.extract.fuzzy_matcher import fuzzy_matcher
-
     # 확인 대기 상태 체크
     pending_confirmation = state.get("pending_confirmation")
 
     # 사용자가 확인 응답을 한 경우
     if pending_confirmation:
-        confirm_keywords = ["확인", "네", "yes", "맞아", "맞습니다", "ok", "ㅇㅋ"]
-        reject_keywords = ["아니", "no", "다시", "아니요"]
+        answer = match_confirmation(message)
 
-        msg_lower = message.lower().strip()
-
-        if any(k in msg_lower for k in confirm_keywords):
+        if answer == "confirm":
             # 확인 완료 - pending 데이터 사용
             corporations = pending_confirmation.get("corporations", [])
             centers = pending_confirmation.get("centers", [])
@@ -574,7 +625,7 @@ def _step_corp_center(state: GraphState, message: str, extractor) -> Dict[str, A
 
             return {"response": response, "next_step": "networks", "ui_data": ui}
 
-        elif any(k in msg_lower for k in reject_keywords):
+        elif answer == "reject":
             # 거부 - pending 제거하고 다시 입력 요청
             state.pop("pending_confirmation", None)
 
@@ -606,37 +657,20 @@ def _step_corp_center(state: GraphState, message: str, extractor) -> Dict[str, A
             return {"response": response, "next_step": "corp-center", "ui_data": ui}
 
     # ===== 원래 로직: 정규표현식 기반 추출 =====
-    corporation_keywords = [
-        "은행",
-        "중앙회",
-        "농협",
-        "신협",
-        "카드",
-        "증권",
-        "보험",
-        "캐피탈",
-        "저축은행",
-    ]
-    corporations: List[str] = [k for k in corporation_keywords if k in message]
+    corporations: List[str] = [k for k in CORPORATION_KEYWORDS if k in message]
     corporations = _dedupe_keep_order(corporations)
 
     # 센터 추출: 우선순위 키워드 + 패턴 + 대문자
-    priority_centers = ["의왕", "안성", "AWS", "IDC"]
-    centers: List[str] = [c for c in priority_centers if c in message]
+    centers: List[str] = [c for c in PRIORITY_CENTERS if c in message]
 
     if not centers:
-        patterns = [
-            r"([가-힣A-Za-z0-9]+)센터",
-            r"([가-힣A-Za-z0-9]+)지점",
-            r"([가-힣A-Za-z0-9]+)본점",
-        ]
-        for pat in patterns:
-            for m in re.finditer(pat, message):
+        for pat in CENTER_SUFFIX_RES:
+            for m in pat.finditer(message):
                 name = m.group(1)
                 if name and name != "센터" and len(name) >= 2:
                     centers.append(name)
 
-    english_caps = re.findall(r"\b[A-Z]{2,}\b", message)
+    english_caps = ENGLISH_CAPS_RE.findall(message)
     for c in english_caps:
         centers.append(c)
 
@@ -848,15 +882,57 @@ def _step_corp_center(state: GraphState, message: str, extractor) -> Dict[str, A
     response = _bubble(
         question=f"{confirmation}\n\n어떤 네트워크 영역들이 있나요?",
         examples=["내부망, DMZ망, 외부망", "내부망만"],
-        hint="키워드 기반으로 인식합니다. (내부망/DMZ망/외부망/지점망/사용자망)",
+        hint="키워드 기반으로 인식합니다. (내부망/DMZ망/외부망/지점망/사용자망) "
+        "[센터] 헤더를 붙이면 여러 센터를 한 번에 입력할 수 있어요.",
     )
 
     return {"response": response, "next_step": "networks", "ui_data": ui}
 
 
 # =========================================================
-# 6) Step: networks (센터별 순차)
+# 6) Step: networks (센터별 순차 / [센터] 헤더로 한 번에)
 # =========================================================
+NETWORKS_BULK_EXAMPLE = "[의왕]\n내부망, DMZ망\n[AWS]\n내부망"
+
+
+def _next_missing_center_index(
+    centers: List[str], center_networks: dict, start: int = 0
+) -> int:
+    """start부터 아직 영역이 입력되지 않은 첫 센터 index (없으면 len(centers))"""
+    for i in range(start, len(centers)):
+        if not (center_networks.get(centers[i]) or {}).get("zones"):
+            return i
+    return len(centers)
+
+
+CENTER_SUFFIXES = ("데이터센터", "센터", "center", "idc")
+
+
+def _center_key(name: str) -> str:
+    """센터명 비교 키 (소문자, 공백 제거, '센터' 등 접미사 제거)"""
+    key = "".join(name.split()).lower()
+    for suffix in CENTER_SUFFIXES:
+        if key.endswith(suffix) and len(key) > len(suffix):
+            return key[: -len(suffix)]
+    return key
+
+
+def _match_center_header(header: str, centers: List[str]) -> Optional[str]:
+    """
+    [헤더] -> 센터명 (완전 일치 우선, 없으면 '센터' 등 접미사만 다른 경우:
+    '의왕센터' -> '의왕'). 'AWS2'처럼 이름 일부만 겹치면 매칭하지 않음
+    """
+    h = header.strip().lower()
+    for c in centers:
+        if c.lower() == h:
+            return c
+    hk = _center_key(header)
+    for c in centers:
+        if _center_key(c) == hk:
+            return c
+    return None
+
+
 def _step_networks(state: GraphState, message: str, extractor) -> Dict[str, Any]:
     centers: List[str] = _ensure_list(state.get("centers"))
     corp = (state.get("corporation") or {}).get("name")
@@ -889,25 +965,15 @@ def _step_networks(state: GraphState, message: str, extractor) -> Dict[str, Any]
     if idx >= len(centers):
         return _finalize_networks(state)
 
+    # [센터] 헤더가 있으면 여러 센터를 한 번에 처리
+    blocks = _split_by_headers(message)
+    if blocks and blocks[0][0] != "GLOBAL":
+        return _step_networks_bulk(state, message, blocks)
+
     current_center = centers[idx]
 
     # 키워드 인식 (표준화된 zone label로 저장)
-    zone_map = {
-        "내부망": ["내부망", "업무망"],
-        "DMZ망": ["dmz", "dmz망", "디엠지", "대외dmz"],
-        "외부망": ["외부망", "대외망", "인터넷망", "인터넷", "외부"],
-        "지점망": ["지점망", "영업점망", "점포망"],
-        "사용자망": ["사용자망", "유저망"],
-    }
-
-    found: List[str] = []
-    lower = message.lower()
-    for label, keys in zone_map.items():
-        for k in keys:
-            if k.lower() in lower:
-                found.append(label)
-                break
-    found = _dedupe_keep_order(found)
+    found: List[str] = [label for label, pat in ZONE_RES if pat.search(message)]
 
     extracted = {
         "message": message,
@@ -939,14 +1005,15 @@ def _step_networks(state: GraphState, message: str, extractor) -> Dict[str, Any]
             },
             target={"center": current_center},
             extracted=extracted,
-            examples=["내부망, DMZ망", "내부망만", "지점망, 사용자망"],
+            examples=["내부망, DMZ망", "내부망만", NETWORKS_BULK_EXAMPLE],
             actions=["back", "summary"],
             helper="인식 키워드: 내부망/DMZ망/외부망/지점망/사용자망",
         )
         response = _bubble(
             question=f"`{current_center}` 센터의 네트워크 영역을 인식하지 못했어요. 다시 입력해주세요.",
             examples=["내부망, DMZ망", "내부망만"],
-            hint="예시처럼 키워드를 포함해서 입력해 주세요.",
+            hint="예시처럼 키워드를 포함해서 입력해 주세요. "
+            "[센터] 헤더로 여러 센터를 한 번에 입력할 수도 있어요.",
         )
         return {"response": response, "next_step": "networks", "ui_data": ui}
 
@@ -961,16 +1028,21 @@ def _step_networks(state: GraphState, message: str, extractor) -> Dict[str, Any]
     zones_display = ", ".join([f"`{z}`" for z in found])
     confirmation = f"✅ `{current_center}` 센터: {zones_display} 저장 완료!"
 
-    # 다음 센터로 이동
-    next_idx = idx + 1
+    # 다음 센터로 이동 (헤더 일괄 입력으로 이미 채워진 센터는 건너뜀)
+    next_idx = _next_missing_center_index(centers, center_networks, idx + 1)
     state["current_center_index"] = next_idx
 
-    # 디버깅: 상태 확인
-    print(
-        f"DEBUG: current_center={current_center}, idx={idx}, next_idx={next_idx}, len(centers)={len(centers)}"
+    logger.debug(
+        "center networks saved",
+        extra={
+            "fields": {
+                "center": current_center,
+                "index": idx,
+                "next_index": next_idx,
+                "total": len(centers),
+            }
+        },
     )
-    print(f"DEBUG: centers={centers}")
-    print(f"DEBUG: center_networks keys={list(center_networks.keys())}")
 
     if next_idx < len(centers):
         next_center = centers[next_idx]
@@ -1006,14 +1078,110 @@ def _step_networks(state: GraphState, message: str, extractor) -> Dict[str, Any]
             question=f"{confirmation}\n\n어떤 네트워크 영역들이 있나요?",
             examples=["내부망, DMZ망, 외부망", "내부망만"],
         )
-        print(f"DEBUG: Returning next_step=networks for next_center={next_center}")
         return {"response": response, "next_step": "networks", "ui_data": ui}
 
     # 마지막 센터 완료 - finalize로 넘어가기 전에 확인 메시지 포함
-    print(f"DEBUG: All centers done, calling _finalize_networks")
     return _finalize_networks(state, last_center=current_center, last_zones=found)
 
 
+def _step_networks_bulk(
+    state: GraphState, message: str, blocks: List[Tuple[str, str]]
+) -> Dict[str, Any]:
+    """
+    [센터] 헤더별 블록을 한 번에 저장
+    - 블록 원문은 devices로도 넘겨 finalize에서 장비 후보까지 추출
+      (센터별 추출은 step_networks에서 병렬 처리)
+    - 모든 센터가 채워지면 바로 finalize, 아니면 빠진 센터부터 순차 입력
+    """
+    centers: List[str] = _ensure_list(state.get("centers"))
+    corp = (state.get("corporation") or {}).get("name")
+    center_networks: dict = state.get("center_networks", {})
+
+    saved: List[Tuple[str, List[str]]] = []
+    unmatched: List[str] = []
+    no_zones: List[str] = []
+    for header, block in blocks:
+        center = _match_center_header(header, centers)
+        if center is None:
+            unmatched.append(header)
+            continue
+        found = [label for label, pat in ZONE_RES if pat.search(block)]
+        if not found:
+            no_zones.append(center)
+            continue
+        center_networks[center] = {"zones": found, "devices": [block]}
+        saved.append((center, found))
+    state["center_networks"] = center_networks
+
+    next_idx = _next_missing_center_index(centers, center_networks)
+    state["current_center_index"] = next_idx
+
+    extracted = {
+        "message": message,
+        "headers": [h for h, _ in blocks],
+        "saved": {c: zones for c, zones in saved},
+        "unmatched_headers": unmatched,
+        "zones_not_found": no_zones,
+    }
+
+    logger.debug(
+        "center networks saved (bulk)",
+        extra={
+            "fields": {
+                "saved": len(saved),
+                "unmatched": len(unmatched),
+                "next_index": next_idx,
+                "total": len(centers),
+            }
+        },
+    )
+
+    if next_idx >= len(centers):
+        return _finalize_networks(state)
+
+    lines = [
+        f"✅ `{c}` 센터: {', '.join(f'`{z}`' for z in zones)} 저장 완료!"
+        for c, zones in saved
+    ]
+    if unmatched:
+        lines.append(
+            "⚠️ 센터를 찾지 못한 헤더: " + ", ".join(f"`[{h}]`" for h in unmatched)
+        )
+    if no_zones:
+        lines.append(
+            "⚠️ 영역을 인식하지 못한 센터: " + ", ".join(f"`{c}`" for c in no_zones)
+        )
+    missing = [c for c in centers if not (center_networks.get(c) or {}).get("zones")]
+    next_center = centers[next_idx]
+    lines.append(
+        f"\n남은 센터: {', '.join(f'`{c}`' for c in missing)}"
+        f"\n\n`{next_center}` 센터의 네트워크 영역을 입력해주세요. "
+        f"({next_idx + 1}/{len(centers)})"
+    )
+
+    ui = _ui_payload(
+        title="네트워크 영역 입력",
+        subtitle=f"{next_center} 센터",
+        step="networks",
+        progress=(next_idx + 1, len(centers)),
+        summary={
+            "corporation": corp,
+            "centers": centers,
+            "center_networks": center_networks,
+        },
+        target={"center": next_center},
+        extracted=extracted,
+        examples=["내부망, DMZ망", "내부망만", NETWORKS_BULK_EXAMPLE],
+        actions=["back", "summary"],
+        helper=f"센터명: {', '.join(centers)}",
+    )
+    response = _bubble(
+        question="\n".join(lines),
+        examples=["내부망, DMZ망", NETWORKS_BULK_EXAMPLE],
+    )
+    return {"response": response, "next_step": "networks", "ui_data": ui}
+
+
 def _finalize_networks(
     state: GraphState,
     last_center: Optional[str] = None,
@@ -1041,8 +1209,6 @@ def _finalize_networks(
         else:
             center_devices[c] = str(devs)
 
-    from app.nodes.step_networks import step_networks
-
     state["networks_payload"] = {
         "center_zones": center_zones,
         "center_devices": center_devices,
@@ -1083,8 +1249,6 @@ def _finalize_networks(
         return {"response": response, "next_step": "networks", "ui_data": ui}
 
     # 첫 스코프 지정
-    from app.nodes.step_next_scope import step_next_scope
-
     updated = step_next_scope(updated)
     current_scope = updated.get("current_scope")
     remaining = len(updated.get("pending_scopes", []))
@@ -1153,8 +1317,6 @@ def _step_scope_detail(state: GraphState, message: str, extractor) -> Dict[str,
 
     current_scope = state.get("current_scope")
     if not current_scope:
-        from app.nodes.step_next_scope import step_next_scope
-
         updated = step_next_scope(state)
         current_scope = updated.get("current_scope")
         if not current_scope:
@@ -1184,8 +1346,6 @@ def _step_scope_detail(state: GraphState, message: str, extractor) -> Dict[str,
 
     # step_scope_detail 실행
     state["scope_detail_text"] = message
-    from app.nodes.step_scope_detail import step_scope_detail
-
     updated = step_scope_detail(state)
 
     extracted = {
@@ -1195,8 +1355,6 @@ def _step_scope_detail(state: GraphState, message: str, extractor) -> Dict[str,
     }
 
     # 다음 스코프
-    from app.nodes.step_next_scope import step_next_scope
-
     updated = step_next_scope(updated)
     next_scope = updated.get("current_scope")
     remaining = len(updated.get("pending_scopes", []))
@@ -1265,17 +1423,31 @@ def _step_edges(state: GraphState, message: str, extractor) -> Dict[str, Any]:
     center_networks: dict = state.get("center_networks", {})
 
     state["edge_text"] = message
-    from app.nodes.step_edges import step_edges
-
     updated = step_edges(state)
     state.update(updated)
+    state.update(step_assemble(state))
     state["next_step"] = "done"
 
+    diagram = state.get("diagram") or {}
+    validation = state.get("edge_validation") or {}
     extracted = {
         "message": message,
-        "edges_keys": list((updated.get("edges") or {}).keys())
-        if isinstance(updated.get("edges"), dict)
-        else None,
+        "edges_keys": (
+            list((updated.get("edges") or {}).keys())
+            if isinstance(updated.get("edges"), dict)
+            else None
+        ),
+        "diagram": {
+            "nodes": len(diagram.get("nodes") or []),
+            "edges": len(diagram.get("edges") or []),
+            "violations": len(diagram.get("violations") or []),
+            "unresolved": len(diagram.get("unresolved") or []),
+        },
+        "validation": {
+            "missing_nodes": len(validation.get("missing_nodes") or []),
+            "ambiguous": len(validation.get("ambiguous") or []),
+            "revalidated": validation.get("checked") or [],
+        },
     }
 
     status = _format_status_block(
@@ -1305,3 +1477,22 @@ def _step_edges(state: GraphState, message: str, extractor) -> Dict[str, Any]:
         examples=["요약", "다시"],
     )
     return {"response": response, "next_step": "done", "ui_data": ui}
+
+
+# =========================================================
+# 9) Dispatch tables
+# =========================================================
+CommandHandler = Callable[[GraphState, str], Dict[str, Any]]
+StepHandler = Callable[[GraphState, str, Any], Dict[str, Any]]
+
+_COMMAND_HANDLERS: Dict[str, CommandHandler] = {
+    "summary": lambda state, step: _handle_summary(state),
+    "back": _handle_back,
+}
+
+_STEP_HANDLERS: Dict[str, StepHandler] = {
+    "corp-center": _step_corp_center,
+    "networks": _step_networks,
+    "scope-detail": _step_scope_detail,
+    "edges": _step_edges,
+}
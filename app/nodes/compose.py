@@ -1,6 +1,5 @@
 from typing import Dict, Any
-from graph.state import NodeType
-from core.logging import get_logger
+from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
@@ -9,13 +8,14 @@ class ComposeNode:
     """Handles composition of diagram elements"""
 
     def __init__(self):
-        self.node_type = NodeType.COMPOSE
+        self.node_type = "compose"
 
     def execute(self, session_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute compose step"""
         logger.info(f"Executing compose step for session {session_id}")
 
         composition_data = input_data.get("composition_data", {})
+        diagram = input_data.get("diagram")
 
         result = {
             "composed_elements": self._compose_elements(composition_data),
@@ -23,6 +23,9 @@ class ComposeNode:
             "styling": composition_data.get("styling", {}),
             "status": "composed",
         }
+        if diagram:
+            result["layout"] = "layered"
+            result["positions"] = self._layout(diagram)
 
         return result
 
@@ -43,6 +46,22 @@ class ComposeNode:
 
         return composed
 
+    def _layout(self, diagram: Dict[str, Any]) -> Dict[str, Any]:
+        """Layered (Sugiyama) layout of the assembled diagram, keyed by node id"""
+        from app.diagram.layout import layered_layout
+
+        layout = layered_layout(diagram)
+        nodes = diagram.get("nodes") or []
+        positions = {}
+        for i, (x, y) in layout.local_positions().items():
+            positions[nodes[i].get("id") or str(i)] = {
+                "x": round(x, 1),
+                "y": round(y, 1),
+                "layer": int(layout.layer[i]),
+                "cluster": nodes[i].get("scope"),
+            }
+        return {"crossings": layout.crossings, "nodes": positions}
+
     def validate_input(self, input_data: Dict[str, Any]) -> bool:
         """Validate input data for this node"""
-        return "composition_data" in input_data
+        return "composition_data" in input_data or "diagram" in input_data
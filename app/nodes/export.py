@@ -1,6 +1,6 @@
-from typing import Dict, Any, List
-from graph.state import NodeType
-from core.logging import get_logger
+from typing import Dict, Any, Iterator, List
+from app.core.logging import get_logger
+from app.diagram.render import iter_render
 import json
 
 logger = get_logger(__name__)
@@ -10,8 +10,8 @@ class ExportNode:
     """Handles diagram export operations"""
 
     def __init__(self):
-        self.node_type = NodeType.EXPORT
-        self.supported_formats = ["json", "svg", "png", "pdf", "mermaid"]
+        self.node_type = "export"
+        self.supported_formats = ["json", "svg", "mermaid"]
 
     def execute(self, session_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute export step"""
@@ -20,46 +20,31 @@ class ExportNode:
         export_config = input_data.get("export_config", {})
         format_type = export_config.get("format", "json")
 
+        exported = self._export_diagram(input_data, format_type)
         result = {
-            "exported_data": self._export_diagram(input_data, format_type),
+            "exported_data": exported,
             "format": format_type,
-            "file_size": 0,  # Would be calculated in real implementation
+            "file_size": len(exported.encode("utf-8")),
             "status": "exported",
         }
 
         return result
 
-    def _export_diagram(self, data: Dict[str, Any], format_type: str) -> str:
-        """Export diagram in specified format"""
+    def iter_export(
+        self, input_data: Dict[str, Any], format_type: str
+    ) -> Iterator[str]:
+        """Stream diagram export in chunks (mermaid / svg)"""
+        diagram = input_data.get("diagram") or input_data
         if format_type == "json":
-            return json.dumps(data, indent=2)
-        elif format_type == "mermaid":
-            return self._export_to_mermaid(data)
-        elif format_type in ["svg", "png", "pdf"]:
-            return f"<{format_type} export placeholder>"
-        else:
+            yield json.dumps(diagram, indent=2, ensure_ascii=False)
+            return
+        if format_type not in self.supported_formats:
             raise ValueError(f"Unsupported export format: {format_type}")
+        yield from iter_render(diagram, format_type)
 
-    def _export_to_mermaid(self, data: Dict[str, Any]) -> str:
-        """Export diagram to Mermaid format"""
-        mermaid = ["graph TD"]
-
-        # Add nodes
-        nodes = data.get("nodes", [])
-        for node in nodes:
-            node_id = node.get("id", "")
-            node_label = node.get("label", node_id)
-            mermaid.append(f"    {node_id}[{node_label}]")
-
-        # Add edges
-        edges = data.get("edges", [])
-        for edge in edges:
-            source = edge.get("source", "")
-            target = edge.get("target", "")
-            if source and target:
-                mermaid.append(f"    {source} --> {target}")
-
-        return "\n".join(mermaid)
+    def _export_diagram(self, data: Dict[str, Any], format_type: str) -> str:
+        """Export diagram in specified format"""
+        return "".join(self.iter_export(data, format_type))
 
     def get_supported_formats(self) -> List[str]:
         """Get list of supported export formats"""
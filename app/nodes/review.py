@@ -1,6 +1,5 @@
-from typing import Dict, Any, List
-from graph.state import NodeType
-from core.logging import get_logger
+from typing import Dict, Any, List, Optional
+from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
@@ -9,23 +8,53 @@ class ReviewNode:
     """Handles diagram review and validation"""
 
     def __init__(self):
-        self.node_type = NodeType.REVIEW
+        self.node_type = "review"
 
     def execute(self, session_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute review step"""
         logger.info(f"Executing review step for session {session_id}")
 
         review_data = input_data.get("review_data", {})
-
+        diagram = input_data.get("diagram")
+
+        if diagram:
+            report = self._review_diagram(diagram)
+            return {
+                "validation_results": report["issues"],
+                "metrics": report["metrics"],
+                "suggestions": self._generate_suggestions(report["metrics"]),
+                "quality_score": report["quality_score"],
+                "status": "reviewed",
+            }
+
+        validations = self._validate_diagram(review_data)
         result = {
-            "validation_results": self._validate_diagram(review_data),
-            "suggestions": self._generate_suggestions(review_data),
-            "quality_score": self._calculate_quality_score(review_data),
+            "validation_results": validations,
+            "suggestions": self._generate_suggestions(
+                {"nodes": len(review_data.get("nodes", []))}
+            ),
+            "quality_score": self._calculate_quality_score(validations),
             "status": "reviewed",
         }
 
         return result
 
+    def _review_diagram(
+        self, diagram: Dict[str, Any], crossings: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Vectorized metrics over the assembled diagram (crossings computed lazily)"""
+        cached = diagram.get("review")
+        if (
+            cached
+            and crossings is None
+            and cached["metrics"].get("crossings") is not None
+        ):
+            return cached
+        from app.diagram.review import review_diagram
+
+        # 조립 시에는 crossings를 건너뛰므로 리뷰 단계에서 (캐시된) 레이아웃 기준으로 채움
+        return review_diagram(diagram, crossings=crossings, with_crossings=True)
+
     def _validate_diagram(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Validate diagram structure and content"""
         validations = []
@@ -43,22 +72,30 @@ class ReviewNode:
 
         return validations
 
-    def _generate_suggestions(self, data: Dict[str, Any]) -> List[str]:
+    def _generate_suggestions(self, metrics: Dict[str, Any]) -> List[str]:
         """Generate improvement suggestions"""
         suggestions = []
 
-        node_count = len(data.get("nodes", []))
-        if node_count > 20:
+        # crossings 없음(None) = 계산 안 함 -> 노드 수 기준만 적용
+        crossings = metrics.get("crossings")
+        if metrics.get("nodes", 0) > 20 and (crossings is None or crossings > 0):
             suggestions.append("Consider grouping nodes to reduce complexity")
+        if metrics.get("zone_boundary"):
+            suggestions.append(
+                "Route internal servers to external systems through an Interface"
+            )
+        if metrics.get("duplicate_names"):
+            suggestions.append("Rename nodes that share a name within the same zone")
+        if metrics.get("orphans"):
+            suggestions.append("Connect or remove nodes without any connection")
 
         return suggestions
 
-    def _calculate_quality_score(self, data: Dict[str, Any]) -> float:
+    def _calculate_quality_score(self, validations: List[Dict[str, Any]]) -> float:
         """Calculate diagram quality score"""
         score = 100.0
 
         # Deduct points for issues
-        validations = self._validate_diagram(data)
         for validation in validations:
             if validation["type"] == "error":
                 score -= 20
@@ -69,4 +106,4 @@ class ReviewNode:
 
     def validate_input(self, input_data: Dict[str, Any]) -> bool:
         """Validate input data for this node"""
-        return "review_data" in input_data
+        return "review_data" in input_data or "diagram" in input_data
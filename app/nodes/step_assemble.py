@@ -0,0 +1,64 @@
+# app/nodes/step_assemble.py
+from __future__ import annotations
+
+from app.graph.state import GraphState
+from app.core.logging import get_logger
+from app.diagram.assemble import assemble_diagram
+from app.diagram.validate import scope_inputs, validate_incremental
+from app.nodes.assign_ids import assign_ids
+
+try:
+    from app.diagram.review import review_diagram
+except ImportError:  # numpy 미설치 -> 품질 지표 생략
+    review_diagram = None
+
+logger = get_logger(__name__)
+
+
+def step_assemble(state: GraphState) -> GraphState:
+    """
+    scope_details + edges -> 구성도 그래프(state["diagram"]) 조립 단계.
+    - 노드는 정수 index, 관계는 ALLOWED_TRIPLES로 검증
+    - 허용되지 않은 관계 / 해석하지 못한 엣지는 diagram에 함께 기록
+    - 노드/엣지 id는 assign_ids로 부여 (기본: 내용 기반 결정적 id)
+    - 품질 지표(diagram["review"])는 매 조립마다 배열 연산으로 갱신
+      (레이아웃이 필요한 crossings는 제외 -> ReviewNode / export에서 필요할 때 계산)
+    - edge_validation은 scope별 캐시로 입력이 바뀐 scope만 재검증
+    """
+    graph, unresolved = assemble_diagram(state)
+    diagram = graph.to_dict()
+    diagram["unresolved"] = unresolved
+    state["diagram"] = diagram
+    assign_ids(state)
+    if review_diagram is not None:
+        diagram["review"] = review_diagram(diagram)
+
+    validation, cache = validate_incremental(
+        diagram, state.get("validation_cache"), scope_inputs(state)
+    )
+    state["validation_cache"] = cache
+    state["edge_validation"] = {
+        **{
+            k: v
+            for k, v in (state.get("edge_validation") or {}).items()
+            if k != "edges_error"
+        },
+        **validation,
+    }
+
+    logger.info(
+        "diagram assembled",
+        extra={
+            "fields": {
+                "nodes": len(graph),
+                "edges": len(graph.edges),
+                "violations": len(graph.violations),
+                "unresolved": len(unresolved),
+                "missing_nodes": len(validation["missing_nodes"]),
+                "ambiguous": len(validation["ambiguous"]),
+                "revalidated": len(validation["checked"]),
+                "quality_score": (diagram.get("review") or {}).get("quality_score"),
+            }
+        },
+    )
+    return state
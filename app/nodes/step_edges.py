@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.graph.state import GraphState
 from app.core.candidates import get_candidate_extractor
-
+from app.extract.fuzzy_matcher import fuzzy_matcher
 
 HEADER_RE = re.compile(r"^\s*\[(?P<header>[^\]]{1,60})\]\s*$", re.MULTILINE)
 
@@ -38,30 +38,87 @@ def _split_by_headers(text: str) -> List[Tuple[str, str]]:
     return blocks
 
 
-def _header_to_scope_key(state: GraphState, header: str) -> str:
+# zone 코드 -> 헤더에 올 수 있는 표기 (정규화 후 비교)
+ZONE_HEADER_ALIASES: Dict[str, List[str]] = {
+    "internal": ["내부망", "내부", "internal"],
+    "dmz": ["DMZ망", "DMZ", "dmz"],
+    "internal_sdn": ["내부SDN망", "내부SDN", "SDN망", "SDN", "internal_sdn"],
+    "external": ["대외망", "대외", "외부망", "외부", "external"],
+    "user": ["사용자망", "사용자", "user"],
+    "branch": ["영업점망", "영업점", "지점망", "branch"],
+}
+
+_HEADER_NORM_RE = re.compile(r"[\s_:/\-]+")
+
+
+def _norm_header(text: str) -> str:
+    """공백/구분자 제거 + 소문자 ('의왕 내부망' == '의왕_내부망' == '의왕내부망')"""
+    return _HEADER_NORM_RE.sub("", (text or "").lower())
+
+
+def _scope_index(state: GraphState) -> Dict[str, str]:
     """
-    헤더 문자열을 state의 scope 키(예: '의왕:internal')로 매핑.
-    - 아주 MVP 버전: header에 '의왕 내부망' 같은 display가 오면 pending/current_scope의 display로 매칭
-    - 못 찾으면 header 그대로 key 사용
+    정규화된 헤더 표기 -> scope 키('의왕:internal') 인덱스 (edges 호출당 1회 생성)
+    - current_scope / pending_scopes / 완료된 scope_details 모두 포함
+    - display, 'center:zone' 키, 센터(+'센터') x zone 별칭 조합
+    - 같은 표기가 여러 scope에 걸리면 먼저 등록된 쪽 우선
     """
-    header_norm = header.strip()
-
-    # 1) scope_details/ pending_scopes/current_scope의 display와 매칭 시도
-    all_scopes = []
+    scopes: List[Dict[str, Any]] = []
     cur = state.get("current_scope")
     if cur:
-        all_scopes.append(cur)
-    all_scopes.extend(state.get("pending_scopes") or [])
-
-    for sc in all_scopes:
-        if (sc.get("display") or "").strip() == header_norm:
-            return f"{sc.get('center')}:{sc.get('zone')}"
+        scopes.append(cur)
+    scopes.extend(state.get("pending_scopes") or [])
+    for key, detail in (state.get("scope_details") or {}).items():
+        sc = (detail or {}).get("scope") or {}
+        if not sc and ":" in key:
+            center, zone = key.split(":", 1)
+            sc = {"center": center, "zone": zone}
+        scopes.append(sc)
+
+    index: Dict[str, str] = {}
+    for sc in scopes:
+        center, zone = sc.get("center"), sc.get("zone")
+        if not center or not zone:
+            continue
+        key = f"{center}:{zone}"
+        names = [sc.get("display") or "", key]
+        for c in (center, f"{center}센터"):
+            for alias in ZONE_HEADER_ALIASES.get(zone, [zone]):
+                names.append(f"{c}{alias}")
+        for name in names:
+            norm = _norm_header(name)
+            if norm:
+                index.setdefault(norm, key)
+    return index
+
+
+def _header_to_scope_key(
+    state: GraphState, header: str, index: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    헤더 문자열을 state의 scope 키(예: '의왕:internal')로 매핑.
+    - index(_scope_index)에서 정규화 표기로 바로 조회
+    - 없으면 fuzzy 매칭 (긴 표기 우선), 결과는 index에 캐시
+    - 못 찾으면 header 그대로 key 사용 (나중에 resolver에서 정리)
+    """
+    header_norm = header.strip()
+    if index is None:
+        index = _scope_index(state)
 
-    # 2) scope_details에 이미 있는 키들의 display를 보고 매칭(있으면)
-    # (현재 scope_details record에 display는 있지만 key는 center:zone이라서 직접 매칭은 제한적)
+    norm = _norm_header(header_norm)
+    if not norm:
+        return header_norm
+    hit = index.get(norm)
+    if hit is not None:
+        return hit
 
-    # 3) 못 찾으면 header 자체를 key로 둠(나중에 resolver에서 정리)
-    return header_norm
+    names = sorted(index, key=len, reverse=True)
+    match = fuzzy_matcher.match_text(
+        norm, names, threshold=fuzzy_matcher.CONFIDENCE_AUTO
+    )
+    key = index[match.matched] if match else header_norm
+    index[norm] = key
+    return key
 
 
 def step_edges(state: GraphState) -> GraphState:
@@ -74,12 +131,13 @@ def step_edges(state: GraphState) -> GraphState:
 
     extractor = get_candidate_extractor()
     blocks = _split_by_headers(edge_text)
+    index = _scope_index(state)
 
     edges_out: Dict[str, Any] = dict(state.get("edges") or {})
     edges_by_scope: Dict[str, Any] = {}
 
     for header, block in blocks:
-        scope_key = _header_to_scope_key(state, header)
+        scope_key = _header_to_scope_key(state, header, index)
         cands = extractor.extract(block) if block else []
 
         edges_by_scope[scope_key] = {
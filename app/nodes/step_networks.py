@@ -1,19 +1,40 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.graph.state import GraphState
-from app.extract.candidate_extractor import CandidateExtractor
-
-_ce = CandidateExtractor()
+from app.core.candidates import get_candidate_extractor
+from app.core.settings import settings
 
 ZONE_CANON_ALLOW = {"internal", "dmz", "internal_sdn", "external", "user", "branch"}
 
+# 센터별 추출용 공유 스레드 풀 (요청마다 만들지 않음)
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = Lock()
+
+
+def _extract_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.NETWORKS_EXTRACT_WORKERS,
+                    thread_name_prefix="networks-extract",
+                )
+    return _pool
+
 
 def _extract_zone_norms(text: str) -> List[str]:
     """자유 텍스트에서 ZoneHint만 뽑아 normalized 목록으로 반환"""
+    return _zone_norms_from(get_candidate_extractor().extract(text))
+
+
+def _zone_norms_from(candidates) -> List[str]:
     zones = []
-    for c in _ce.extract(text):
+    for c in candidates:
         if c.type == "ZoneHint" and c.normalized in ZONE_CANON_ALLOW:
             zones.append(c.normalized)
     # 중복 제거(순서 유지)
@@ -31,8 +52,12 @@ DEVICE_CAND_TYPES = {"DeviceTypeHint", "DeviceSubtypeHint"}
 
 def _extract_device_tokens(text: str) -> List[Dict[str, Any]]:
     """자유 텍스트에서 Device 후보를 전부 저장 (type + subtype)"""
+    return _device_items_from(get_candidate_extractor().extract(text))
+
+
+def _device_items_from(candidates) -> List[Dict[str, Any]]:
     items = []
-    for c in _ce.extract(text):
+    for c in candidates:
         if c.type in DEVICE_CAND_TYPES:
             items.append(
                 {
@@ -46,6 +71,37 @@ def _extract_device_tokens(text: str) -> List[Dict[str, Any]]:
     return items
 
 
+def _extract_center(job: Tuple[str, str, str]) -> Tuple[str, Dict[str, Any]]:
+    """센터 하나의 zones / devices 추출"""
+    center, zones_text, devices_text = job
+    extractor = get_candidate_extractor()
+
+    zone_cands = extractor.extract(zones_text)
+    device_items: List[Dict[str, Any]] = (
+        _device_items_from(extractor.extract(devices_text)) if devices_text else []
+    )
+
+    return center, {
+        "zones_raw": zones_text,  # 원문 보존
+        "zones": _zone_norms_from(zone_cands),  # normalized
+        "devices_raw": devices_text,  # 원문 보존
+        "devices": device_items,  # 후보 저장
+    }
+
+
+def _extract_centers(jobs: List[Tuple[str, str, str]]) -> Dict[str, Any]:
+    """
+    센터별 블록 추출 (기본 순차)
+    NETWORKS_EXTRACT_WORKERS >= 2이고 센터가 여럿이면 공유 스레드 풀로 동시에
+    """
+    if len(jobs) <= 1 or settings.NETWORKS_EXTRACT_WORKERS <= 1:
+        results = map(_extract_center, jobs)
+    else:
+        results = _extract_pool().map(_extract_center, jobs)
+    # 입력(centers) 순서 유지
+    return dict(results)
+
+
 def step_networks(state: GraphState) -> GraphState:
     payload = state.get("networks_payload") or {}
     centers = state.get("centers", [])
@@ -53,22 +109,13 @@ def step_networks(state: GraphState) -> GraphState:
     center_devices: Dict[str, str] = payload.get("center_devices") or {}
     external_networks_in = payload.get("external_networks") or []
 
-    # 1) center_networks 채우기
-    center_networks: Dict[str, Any] = {}
-
-    for center in centers:
-        zones_text = center_zones.get(center, "")
-        devices_text = center_devices.get(center, "")
-
-        zone_norms = _extract_zone_norms(zones_text)
-        device_items = _extract_device_tokens(devices_text) if devices_text else []
-
-        center_networks[center] = {
-            "zones_raw": zones_text,  # 원문 보존
-            "zones": zone_norms,  # normalized
-            "devices_raw": devices_text,  # 원문 보존
-            "devices": device_items,  # 후보 저장
-        }
+    # 1) center_networks 채우기 (NETWORKS_EXTRACT_WORKERS >= 2면 센터별 동시 추출)
+    center_networks: Dict[str, Any] = _extract_centers(
+        [
+            (center, center_zones.get(center, ""), center_devices.get(center, ""))
+            for center in centers
+        ]
+    )
 
     # 2) external_networks 저장 (원문 + normalized)
     external_networks_out: List[Dict[str, Any]] = []
@@ -1,9 +1,13 @@
 # app/nodes/step_scope_detail.py
 from __future__ import annotations
 
+import logging
 from typing import Any, Dict
 from app.graph.state import GraphState
 from app.core.candidates import get_candidate_extractor
+from app.core.logging import get_logger, should_sample
+
+logger = get_logger(__name__)
 
 
 def _scope_key(scope: Dict[str, Any]) -> str:
@@ -26,36 +30,10 @@ def step_scope_detail(state: GraphState) -> GraphState:
 
     detail_text = (state.get("scope_detail_text") or "").strip()
 
-    print("\n" + "=" * 80)
-    print("🔍 STEP: SCOPE DETAIL EXTRACTION")
-    print("=" * 80)
-    print(f"📍 Current Scope:")
-    print(f"   - Center: {current_scope.get('center')}")
-    print(f"   - Zone: {current_scope.get('zone')}")
-    print(f"   - Display: {current_scope.get('display')}")
-    print(f"\n📝 Input Text:")
-    print(f"   '{detail_text}'")
-    print(f"\n🤖 Running candidate_extractor.extract()...")
-
     # candidate_extractor로 후보 추출
     extractor = get_candidate_extractor()
     candidates = extractor.extract(detail_text) if detail_text else []
 
-    print(f"\n✅ Extracted {len(candidates)} candidates:")
-    print("-" * 80)
-
-    if candidates:
-        for i, c in enumerate(candidates, 1):
-            print(f"\n[{i}] Type: {c.type}")
-            print(f"    Text: '{c.text}'")
-            print(f"    Normalized: {c.normalized}")
-            print(f"    Span: {c.span}")
-            print(f"    Context: {c.context}")
-    else:
-        print("   (No candidates extracted)")
-
-    print("\n" + "-" * 80)
-
     # scope_details에 저장할 레코드 생성
     record: Dict[str, Any] = {
         "scope": current_scope,
@@ -78,10 +56,23 @@ def step_scope_detail(state: GraphState) -> GraphState:
     scope_details[key] = record
     state["scope_details"] = scope_details
 
-    print(f"\n💾 Saved to scope_details['{key}']")
-    print(f"📊 Total scopes collected: {len(scope_details)}")
-    print(f"   Keys: {list(scope_details.keys())}")
-    print("=" * 80 + "\n")
+    logger.info(
+        "scope detail extracted",
+        extra={
+            "fields": {
+                "scope_key": key,
+                "text_len": len(detail_text),
+                "candidates": len(candidates),
+                "total_scopes": len(scope_details),
+            }
+        },
+    )
+    # 후보 전체 덤프는 DEBUG + 샘플링일 때만
+    if logger.isEnabledFor(logging.DEBUG) and should_sample():
+        logger.debug(
+            "scope detail candidates",
+            extra={"fields": {"scope_key": key, "candidates": record["candidates"]}},
+        )
 
     # 입력 텍스트 소비
     state["scope_detail_text"] = None
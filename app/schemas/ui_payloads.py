@@ -1,7 +1,7 @@
 # app/schemas/ui_payloads.py
 from __future__ import annotations
-from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Union
 
 
 class CreateSessionRequest(BaseModel):
@@ -13,6 +13,16 @@ class CreateSessionResponse(BaseModel):
     state: Dict[str, Any]
 
 
+class BulkCreateSessionsRequest(BaseModel):
+    count: int = Field(1, ge=1, le=1000)
+
+
+class BulkCreateSessionsResponse(BaseModel):
+    run_ids: List[str]
+    created: int
+    elapsed_ms: float
+
+
 class ChatMessage(BaseModel):
     role: str  # "user" | "assistant" | "system"
     content: str
@@ -28,7 +38,7 @@ class ChatResponse(BaseModel):
     messages: List[ChatMessage]
     current_step: str
     next_step: Optional[str] = None
-    state: Dict[str, Any]
+    state: Optional[Dict[str, Any]] = None  # view=full 또는 fields 지정 시에만
     ui_data: Optional[Dict[str, Any]] = None  # 추가 UI 표시용 데이터
 
 
@@ -40,7 +50,7 @@ class CorpCenterStepRequest(BaseModel):
 
 class StepResponse(BaseModel):
     run_id: str
-    state: Dict[str, Any]
+    state: Optional[Dict[str, Any]] = None
     next_step: Optional[str] = None
     message: Optional[str] = None
 
@@ -57,7 +67,7 @@ class NextScopeResponse(BaseModel):
     remaining: int
     next_step: str
     message: str
-    state: Dict[str, Any]
+    state: Optional[Dict[str, Any]] = None
 
 
 class ScopeDetailRequest(BaseModel):
@@ -70,7 +80,7 @@ class ScopeDetailResponse(BaseModel):
     remaining: int
     next_step: str
     message: str
-    state: Dict[str, Any]
+    state: Optional[Dict[str, Any]] = None
 
 
 class EdgesRequest(BaseModel):
@@ -81,4 +91,43 @@ class EdgesResponse(BaseModel):
     run_id: str
     next_step: str
     message: str
-    state: Dict[str, Any]
+    state: Optional[Dict[str, Any]] = None
+
+
+# 대화 시나리오 재생 (부하 테스트 / 대화 흐름 회귀 테스트)
+class ReplayTurn(BaseModel):
+    message: str
+    expect_next_step: Optional[str] = None  # 지정 시 이 턴 후 next_step 검증
+
+
+class ReplayRequest(BaseModel):
+    turns: List[Union[str, ReplayTurn]]
+    repeat: int = Field(1, ge=1, le=200)  # 같은 시나리오를 독립 세션 N개로 재생
+    persist: bool = (
+        False  # True면 최종 state를 체크포인터에 저장 (run_id로 이어서 대화 가능)
+    )
+    include_transcript: bool = True
+
+
+class ReplayTurnResult(BaseModel):
+    message: str
+    response: Optional[str] = None
+    next_step: Optional[str] = None
+    ok: bool = True
+    error: Optional[str] = None
+    elapsed_ms: float
+
+
+class ReplayRunResult(BaseModel):
+    run_id: str
+    next_step: Optional[str] = None
+    failures: int
+    turns: Optional[List[ReplayTurnResult]] = None
+
+
+class ReplayResponse(BaseModel):
+    runs: List[ReplayRunResult]
+    total_turns: int
+    failures: int
+    elapsed_ms: float
+    turns_per_second: float
@@ -23,15 +23,55 @@ export interface ChatMessage {
   timestamp?: string;
 }
 
+// 기본(view=compact) 응답: messages는 이번 턴에 추가된 것만, ui_data는 변경분만
 export interface ChatResponse {
   run_id: string;
   messages: ChatMessage[];
   current_step: string;
   next_step?: string;
-  state: Record<string, any>;
+  state?: Record<string, any>;
   ui_data?: Record<string, any>;
 }
 
+export interface StreamHandlers {
+  onNode?: (node: string, nextStep?: string) => void;
+  onDelta?: (content: string) => void;
+  onDone?: (response: Omit<ChatResponse, 'state'>) => void;
+  onError?: (message: string) => void;
+}
+
+// SSE 스트림 파싱 ("event: ...\ndata: ...\n\n")
+const readEventStream = async (
+  body: ReadableStream<Uint8Array>,
+  onEvent: (event: string, data: any) => void
+) => {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let sep = buffer.indexOf('\n\n');
+    while (sep !== -1) {
+      const raw = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+
+      let event = 'message';
+      let data = '';
+      raw.split('\n').forEach(line => {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      });
+      if (data) onEvent(event, JSON.parse(data));
+
+      sep = buffer.indexOf('\n\n');
+    }
+  }
+};
+
 // API 함수들
 export const api = {
   // 세션 생성
@@ -48,10 +88,37 @@ export const api = {
     return response.data;
   },
 
+  // 챗봇 메시지 전송 (SSE 스트리밍)
+  streamMessage: async (runId: string, message: string, handlers: StreamHandlers): Promise<void> => {
+    const response = await fetch(`${API_BASE_URL}/chat/${runId}/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify({ message }),
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`stream failed: ${response.status}`);
+    }
+
+    await readEventStream(response.body, (event, data) => {
+      if (event === 'node') handlers.onNode?.(data.node, data.next_step);
+      else if (event === 'delta') handlers.onDelta?.(data.content);
+      else if (event === 'done') handlers.onDone?.(data);
+      else if (event === 'error') handlers.onError?.(data.message);
+    });
+  },
+
   // 채팅 히스토리 조회
   getChatHistory: async (runId: string): Promise<ChatResponse> => {
     const response = await apiClient.get(`/chat/${runId}/history`);
     return response.data;
+  },
+
+  // 전체 state 조회 (fields로 일부 키만 선택)
+  getState: async (runId: string, fields?: string[]): Promise<Record<string, any>> => {
+    const response = await apiClient.get(`/chat/${runId}/state`, {
+      params: fields ? { fields: fields.join(',') } : undefined,
+    });
+    return response.data.state;
   }
 };
 
@@ -103,12 +103,37 @@ const ChatBot: React.FC<ChatBotProps> = ({ runId, onSessionCreate, initialMessag
     setInputMessage(''); // 입력창 즉시 비우기
     setLoading(true);
 
+    // 사용자 메시지와 빈 어시스턴트 말풍선을 먼저 표시
+    const now = new Date().toISOString();
+    setMessages(prev => [
+      ...prev,
+      { role: 'user', content: messageToSend, timestamp: now },
+      { role: 'assistant', content: '', timestamp: now },
+    ]);
+
+    const appendToLastBubble = (content: string) => {
+      setMessages(prev => {
+        const next = [...prev];
+        const last = next[next.length - 1];
+        next[next.length - 1] = { ...last, content: last.content + content };
+        return next;
+      });
+    };
+
     try {
-      const response = await api.sendMessage(runId, messageToSend);
-      
-      setMessages(response.messages);
-      setCurrentStep(response.current_step);
-      setUiData(response.ui_data || null);
+      await api.streamMessage(runId, messageToSend, {
+        onDelta: appendToLastBubble,
+        onDone: response => {
+          // 낙관적으로 추가한 사용자/어시스턴트 말풍선을 서버 메시지로 교체
+          setMessages(prev => [...prev.slice(0, -2), ...response.messages]);
+          setCurrentStep(response.current_step);
+          setUiData(prev => ({ ...(prev || {}), ...(response.ui_data || {}) }));
+        },
+        onError: message => {
+          appendToLastBubble(message);
+          setCurrentStep('error');
+        },
+      });
       
     } catch (error) {
       console.error('메시지 전송 실패:', error);
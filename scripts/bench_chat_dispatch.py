@@ -0,0 +1,124 @@
+# scripts/bench_chat_dispatch.py
+"""
+채팅 턴 디스패치 오버헤드 마이크로 벤치마크 (후보 추출 제외)
+
+- intent: 특수 명령 / 확인·거부 판정 (사전 컴파일 vs 매번 리스트 순회)
+- zones: 네트워크 영역 키워드 판정 (사전 컴파일 vs 매번 리스트 순회)
+- turn: process_chat_message 한 턴 (요약 명령 -> 추출기 호출 없음)
+
+사용: python scripts/bench_chat_dispatch.py --number 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.nodes.chat_processor import (  # noqa: E402
+    ZONE_KEYWORDS,
+    ZONE_RES,
+    match_command,
+    match_confirmation,
+    process_chat_message,
+)
+
+MESSAGES = [
+    "요약",
+    "다시",
+    "네 맞습니다",
+    "아니요 다시 할게요",
+    "법인은 은행이고 AWS, 의왕으로 구성되어있습니다",
+    "의왕은 내부망, DMZ망, 인터넷망으로 구성",
+    "WEB 서버 2대, DB 서버 오라클, L4 스위치",
+    "OK",
+]
+
+
+# 이전 구현과 같은 방식 (호출마다 리스트 생성 + lower + 순회)
+def _legacy_intent(msg: str):
+    if msg.lower() in ["요약", "상태", "summary"]:
+        return "summary"
+    if msg.lower() in ["다시", "돌아가", "이전", "뒤로", "reject", "back"]:
+        return "back"
+    confirm_keywords = ["확인", "네", "yes", "맞아", "맞습니다", "ok", "ㅇㅋ"]
+    reject_keywords = ["아니", "no", "다시", "아니요"]
+    msg_lower = msg.lower().strip()
+    if any(k in msg_lower for k in confirm_keywords):
+        return "confirm"
+    if any(k in msg_lower for k in reject_keywords):
+        return "reject"
+    return None
+
+
+def _new_intent(msg: str):
+    return match_command(msg) or match_confirmation(msg)
+
+
+def _legacy_zones(msg: str):
+    found = []
+    lower = msg.lower()
+    for label, keys in dict(ZONE_KEYWORDS).items():
+        for k in keys:
+            if k.lower() in lower:
+                found.append(label)
+                break
+    return found
+
+
+def _new_zones(msg: str):
+    return [label for label, pat in ZONE_RES if pat.search(msg)]
+
+
+def _turn_state() -> dict:
+    return {
+        "next_step": "networks",
+        "corporation": {"name": "은행"},
+        "centers": ["의왕", "AWS"],
+        "current_center_index": 1,
+        "center_networks": {"의왕": {"zones": ["내부망", "DMZ망"]}},
+    }
+
+
+def _bench(label: str, fn, number: int) -> float:
+    per_call = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"  {label:<28} {per_call * 1e6:8.2f} us")
+    return per_call
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--number", type=int, default=20000)
+    args = ap.parse_args()
+    n = args.number
+
+    for msg in MESSAGES:
+        assert _legacy_intent(msg) == _new_intent(msg), msg
+        assert _legacy_zones(msg) == _new_zones(msg), msg
+
+    print(f"[intent] {len(MESSAGES)} messages / call")
+    old = _bench("legacy list scan", lambda: [_legacy_intent(m) for m in MESSAGES], n)
+    new = _bench("precompiled", lambda: [_new_intent(m) for m in MESSAGES], n)
+    print(f"  speedup x{old / new:.2f}")
+
+    print(f"[zones] {len(MESSAGES)} messages / call")
+    old = _bench("legacy list scan", lambda: [_legacy_zones(m) for m in MESSAGES], n)
+    new = _bench("precompiled", lambda: [_new_zones(m) for m in MESSAGES], n)
+    print(f"  speedup x{old / new:.2f}")
+
+    print("[turn] process_chat_message('요약') (no extraction)")
+    state = _turn_state()
+
+    def turn():
+        # chat_history가 계속 쌓이지 않도록 매 턴 비움
+        state["chat_history"] = []
+        process_chat_message(state, "요약")
+
+    _bench("per turn", turn, max(n // 10, 1))
+
+
+if __name__ == "__main__":
+    main()
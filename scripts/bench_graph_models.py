@@ -0,0 +1,191 @@
+# scripts/bench_graph_models.py
+"""
+그래프 질의 결과 표현 벤치마크: pydantic 객체 vs 내부 레코드(NamedTuple + intern)
+
+- construct: 노드 / 관계마다 GraphEntity·GraphRelationship 생성 vs EntityRecord·RelationshipRecord
+- serialize: GraphQueryResult.model_dump_json() vs QueryRecord.to_dict() + json
+- boundary : QueryRecord.to_model() (API 경계에서 한 번 검증) 비용
+- k_hop    : 전체 그래프 k-hop 질의 한 번 (결과 변환 포함)
+
+사용: python scripts/bench_graph_models.py --nodes 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.diagram.model import DiagramGraph  # noqa: E402
+from app.diagram.query import GraphQueryEngine  # noqa: E402
+from app.diagram.records import (  # noqa: E402
+    DEFAULT_ENTITY_TYPE,
+    DEFAULT_RELATIONSHIP_TYPE,
+    ENTITY_TYPES,
+    NODE_FIELDS,
+    RELATIONSHIP_TYPES,
+)
+from app.nodes.assign_ids import assign_ids  # noqa: E402
+from app.schemas.graphdb_schema import (  # noqa: E402
+    GraphEntity,
+    GraphQueryResult,
+    GraphRelationship,
+)
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def _diagram(n_nodes: int, zones: int = 20, seed: int = 0) -> dict:
+    rnd = random.Random(seed)
+    g = DiagramGraph()
+    root = g.add_node("Diagram", "bench")
+    corp = g.add_node("Corporation", "은행")
+    g.add_edge(root, "HAS_COVERS", corp)
+    prev = None
+    for z in range(zones):
+        center = f"C{z % 4}"
+        ci = g.add_node("Center", center)
+        g.add_edge(corp, "HAS_CENTER", ci)
+        key = f"{center}:z{z}"
+        zi = g.add_node("NetworkZone", f"{center} z{z}", key, center=center, zone="z")
+        g.add_edge(ci, "HAS_ZONE", zi)
+        members = []
+        for k in range(n_nodes // zones):
+            i = g.add_node("Server", f"s{z}_{k}", key)
+            g.add_edge(i, "IN_ZONE", zi)
+            members.append(i)
+        for _ in range(len(members) * 3 // 2):
+            a, b = rnd.sample(members, 2)
+            g.add_edge(a, "CONNECTED_TO", b, key)
+        if prev is not None:
+            g.add_edge(members[0], "CONNECTED_TO", prev, key)
+        prev = members[-1]
+    state = {"corporation": {"name": "은행"}, "diagram": g.to_dict()}
+    assign_ids(state)
+    return state["diagram"]
+
+
+# 이전 구현과 같은 방식 (결과 객체마다 pydantic 검증 + datetime.now)
+def _legacy_entity(engine: GraphQueryEngine, i: int) -> GraphEntity:
+    nd = engine.nodes[i]
+    label = nd.get("label") or ""
+    return GraphEntity(
+        id=nd.get("id") or str(i),
+        type=ENTITY_TYPES.get(label, DEFAULT_ENTITY_TYPE),
+        name=nd.get("name") or "",
+        properties={k: v for k, v in nd.items() if k not in NODE_FIELDS},
+        labels=[label],
+    )
+
+
+def _legacy_relationship(engine: GraphQueryEngine, e: int) -> GraphRelationship:
+    edge = engine.edges[e]
+    rel = edge.get("type") or ""
+    return GraphRelationship(
+        id=edge.get("id") or f"e{e}",
+        type=RELATIONSHIP_TYPES.get(rel, DEFAULT_RELATIONSHIP_TYPE),
+        source_id=engine.nodes[edge["source"]].get("id"),
+        target_id=engine.nodes[edge["target"]].get("id"),
+        properties={"relation": rel, "scope": edge.get("scope")},
+        weight=1.0,
+    )
+
+
+def _legacy_result(engine: GraphQueryEngine, nodes, edges) -> GraphQueryResult:
+    return GraphQueryResult(
+        query_id="q-bench",
+        entities=[_legacy_entity(engine, i) for i in nodes],
+        relationships=[_legacy_relationship(engine, e) for e in edges],
+        execution_time=0.0,
+        total_results=len(nodes),
+    )
+
+
+def _comparable(result: GraphQueryResult) -> tuple:
+    # 시각 / query_id 빼고 비교
+    skip = {"created_at", "updated_at"}
+    return (
+        [e.model_dump(exclude=skip) for e in result.entities],
+        [r.model_dump(exclude=skip) for r in result.relationships],
+    )
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _bench(label: str, fn, number: int) -> float:
+    per_call = min(timeit.repeat(fn, number=number, repeat=3)) / number
+    print(f"  {label:<34} {per_call * 1e3:9.2f} ms")
+    return per_call
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", type=int, default=20000)
+    ap.add_argument("--number", type=int, default=3)
+    args = ap.parse_args()
+    n = args.number
+
+    diagram = _diagram(args.nodes)
+    engine = GraphQueryEngine(diagram)
+    nodes = list(range(len(engine.nodes)))
+    edges = [i for i, e in enumerate(engine.edges) if e["type"] == "CONNECTED_TO"]
+    record = engine._result("bench", 0.0, nodes, edges)
+    legacy = _legacy_result(engine, nodes, edges)
+    assert _comparable(record.to_model()) == _comparable(legacy)
+
+    print(f"[construct] {len(nodes)} entities + {len(edges)} relationships")
+    old = _bench(
+        "pydantic per object",
+        lambda: (
+            [_legacy_entity(engine, i) for i in nodes],
+            [_legacy_relationship(engine, e) for e in edges],
+        ),
+        n,
+    )
+    new = _bench(
+        "records (NamedTuple + intern)",
+        lambda: (
+            [engine.entity(i) for i in nodes],
+            [engine.relationship(e) for e in edges],
+        ),
+        n,
+    )
+    print(f"  speedup x{old / new:.2f}")
+
+    print("[serialize] same result")
+    old = _bench("GraphQueryResult.model_dump_json", legacy.model_dump_json, n)
+    new = _bench("QueryRecord.to_dict + dumps", lambda: _dumps(record.to_dict()), n)
+    print(f"  speedup x{old / new:.2f}")
+
+    print("[boundary] records -> pydantic once")
+    _bench("QueryRecord.to_model", record.to_model, n)
+
+    print("[k_hop] whole graph, k=64")
+    start = engine.nodes[len(engine.nodes) // 2]["id"]
+
+    def legacy_k_hop():
+        dist, _, parent_edge = engine.bfs([engine.resolve(start)], max_depth=64)
+        reached = [i for i, d in enumerate(dist.tolist()) if d > 0]
+        return _legacy_result(
+            engine, reached, sorted({int(parent_edge[i]) for i in reached})
+        )
+
+    old = _bench("bfs + pydantic result", legacy_k_hop, n)
+    new = _bench("bfs + records", lambda: engine.k_hop(start, 64), n)
+    print(f"  speedup x{old / new:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# scripts/export_gliner_training.py
+"""
+/export/sessions.ndjson 덤프 -> GLiNER2 학습 JSONL
+
+- 텍스트 해시로 중복 제거 (--existing 지정 시 기존 데이터셋과도 중복 제거 후 이어쓰기)
+- 세션(줄) 단위 병렬 변환
+
+예)
+  curl -s "$API/export/sessions.ndjson?since=2026-01-01" > sessions.ndjson
+  python scripts/export_gliner_training.py --in_path sessions.ndjson \\
+      --out_path data/train_sessions.jsonl --existing data/train_sessions.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Iterator, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.extract.training_export import iter_training_records, text_hash  # noqa: E402
+
+
+def _iter_lines(path: str) -> Iterator[str]:
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in f:
+            if line.strip():
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _load_seen(paths) -> Set[str]:
+    seen: Set[str] = set()
+    for p in paths or []:
+        if not Path(p).exists():
+            continue
+        for line in _iter_lines(p):
+            seen.add(text_hash(json.loads(line)["input"]))
+    return seen
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in_path", required=True, help="sessions.ndjson ('-' = stdin)")
+    ap.add_argument("--out_path", required=True, help="GLiNER2 training jsonl")
+    ap.add_argument(
+        "--existing",
+        nargs="*",
+        default=None,
+        help="이미 만든 학습 jsonl (중복 제거 기준, out_path와 같으면 이어쓰기)",
+    )
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+
+    seen = _load_seen(args.existing)
+    out_path = Path(args.out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    append = bool(args.existing) and str(out_path) in {
+        str(Path(p)) for p in args.existing
+    }
+
+    kept = 0
+    with out_path.open("a" if append else "w", encoding="utf-8") as f_out:
+        for record in iter_training_records(
+            _iter_lines(args.in_path), json.loads, args.workers, seen
+        ):
+            f_out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            kept += 1
+
+    print(f"✅ Export done: {kept} new examples -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
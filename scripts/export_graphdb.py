@@ -0,0 +1,71 @@
+# scripts/export_graphdb.py
+"""
+세션 구성도 덤프 -> Neo4j 대량 적재 파일 (Cypher UNWIND 배치 / neo4j-admin CSV)
+
+- 입력: NDJSON, 한 줄 = {"run_id": ..., "diagram": {...}} 또는 diagram dict 그대로
+- 출력: out_dir 아래 분할 파일 + manifest.json (적재 순서)
+
+예)
+  curl -s "$API/export/sessions.ndjson?include_diagram=true" > sessions.ndjson
+  python scripts/export_graphdb.py --in_path sessions.ndjson --out_dir exports/graphdb \\
+      --format cypher --batch_size 1000
+  for f in $(jq -r '.load_order[]' exports/graphdb/manifest.json); do
+      cypher-shell -f exports/graphdb/$f; done
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.diagram.graphdb_export import FORMATS, export_graphdb  # noqa: E402
+
+
+def _iter_diagrams(path: str) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if "nodes" in row:
+                yield None, row
+            elif row.get("diagram"):
+                yield row.get("run_id"), row["diagram"]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in_path", required=True, help="diagram ndjson ('-' = stdin)")
+    ap.add_argument("--out_dir", required=True)
+    ap.add_argument("--format", choices=FORMATS, default="cypher")
+    ap.add_argument("--batch_size", type=int, default=None, help="UNWIND 한 문의 행 수")
+    ap.add_argument(
+        "--files_per_chunk", type=int, default=None, help="파일 하나에 담을 batch 수"
+    )
+    args = ap.parse_args()
+
+    manifest = export_graphdb(
+        _iter_diagrams(args.in_path),
+        args.out_dir,
+        fmt=args.format,
+        batch_size=args.batch_size,
+        files_per_chunk=args.files_per_chunk,
+    )
+    print(
+        f"✅ Export done: {manifest['diagrams']} diagrams, {manifest['nodes']} nodes, "
+        f"{manifest['relationships']} relationships -> {args.out_dir} "
+        f"({len(manifest['load_order'])} files)"
+    )
+
+
+if __name__ == "__main__":
+    main()
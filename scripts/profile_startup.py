@@ -0,0 +1,87 @@
+# scripts/profile_startup.py
+"""
+서버 기동 비용 측정
+
+- import app.main 에 걸리는 시간 (python -X importtime, 새 프로세스)
+- 누적 import 시간 상위 N개 모듈
+- 워밍업(그래프 컴파일 + 후보 추출기 초기화) 시간
+
+사용: python scripts/profile_startup.py --top 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run_importtime(module: str) -> Tuple[float, str]:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - t0
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(proc.returncode)
+    return elapsed, proc.stderr
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, str]]:
+    """'import time: self | cumulative | name' -> [(cumulative_us, name)]"""
+    rows: List[Tuple[int, str]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cum = int(parts[1].strip())
+        except ValueError:
+            continue
+        # 첫 공백은 구분자, 그 뒤 들여쓰기가 중첩 깊이
+        rows.append((cum, parts[2][1:].rstrip()))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--module", default="app.main")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--no-warmup", action="store_true", help="워밍업 시간 측정 생략")
+    args = ap.parse_args()
+
+    wall, stderr = _run_importtime(args.module)
+    rows = _parse_importtime(stderr)
+    top_level = [r for r in rows if not r[1].startswith(" ")]
+    total_us = sum(cum for cum, _ in top_level)
+
+    print(f"[import] {args.module}: {total_us / 1e6:.3f}s (process {wall:.3f}s)")
+    print(f"[import] top {args.top} by cumulative time")
+    for cum, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {cum / 1e3:9.1f} ms  {name.strip()}")
+
+    if args.no_warmup:
+        return
+
+    sys.path.insert(0, str(ROOT))
+    from app.main import warmup
+
+    print(f"[warmup] graph + extractor: {warmup():.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,38 +3,14 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
+from pathlib import Path
 from typing import Dict, List, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-ALLOWED_TRIPLES = {
-    ("Diagram", "HAS_COVERS", "Corporation"),
-    ("Corporation", "HAS_CENTER", "Center"),
-    ("Center", "HAS_ZONE", "NetworkZone"),
-    ("Center", "HAS_DEVICE", "NetworkDevice"),
-    ("NetworkDevice", "CONNECTED_TO", "NetworkDevice"),
-    ("NetworkDevice", "CONNECTED_TO", "Server"),
-    ("NetworkDevice", "CONNECTED_TO", "Interface"),
-    ("NetworkDevice", "CONNECTED_TO", "ExternalSystem"),
-    ("Server", "IN_ZONE", "NetworkZone"),
-    ("Server", "IN_GROUP", "SystemGroup"),
-    ("Server", "CONNECTED_TO", "DBMS"),
-    ("Server", "CONNECTED_TO", "NetworkDevice"),
-    ("Server", "CONNECTED_TO", "Interface"),
-    ("Server", "CONNECTED_TO", "ExternalSystem"),
-    ("Server", "CONNECTED_TO", "Server"),
-    ("SystemGroup", "IN_ZONE", "NetworkZone"),
-    ("Interface", "IN_ZONE", "NetworkZone"),
-    ("Interface", "IN_GROUP", "SystemGroup"),
-    ("Interface", "CONNECTED_TO", "NetworkDevice"),
-    ("Interface", "CONNECTED_TO", "Interface"),
-    ("Interface", "CONNECTED_TO", "ExternalSystem"),
-    ("ExternalSystem", "IN_ZONE", "NetworkZone"),
-    ("ExternalSystem", "IN_GROUP", "SystemGroup"),
-    ("ExternalSystem", "CONNECTED_TO", "NetworkDevice"),
-    ("ExternalSystem", "CONNECTED_TO", "Interface"),
-    ("ExternalSystem", "CONNECTED_TO", "ExternalSystem"),
-    ("DBMS", "CONNECTED_TO", "DBMS"),
-}
+# 조립 단계(app/diagram)와 같은 허용 triple 사용
+from app.diagram.schema import ALLOWED_TRIPLES  # noqa: E402
 
 
 def label_of(entities: Dict[str, List[str]], name: str) -> Optional[str]:
@@ -0,0 +1,37 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+SCRIPT = [
+    "법인은 은행이고 AWS, 의왕으로 구성되어있습니다",
+    "[의왕]\n내부망, DMZ망\n[AWS]\n내부망",
+    "서버: nbefapp01, nbefapp02\nDB: orclprod (오라클)\n장비: IRT 라우터, L4 스위치\n"
+    "인터페이스: EAI",
+    "웹서버 WEB01\n대외기관: KFTC",
+    "라우터 rt01",
+    "서버: awsapp01",
+    "[의왕 내부망]\nnbefapp01 -> orclprod\nnbefapp02 <- L4 스위치\nEAI -> KFTC\n"
+    "[의왕 DMZ]\nWEB01 -> nbefapp01\n"
+    "[AWS 내부]\nawsapp01 -> nbefapp01\norclprod -> L4 스위치\nfoo -> bar",
+]
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def run_id(client):
+    return client.post("/sessions").json()["run_id"]
+
+
+@pytest.fixture
+def finished_run(client, run_id):
+    """SCRIPT 전체를 보내 구성도까지 조립된 세션"""
+    for message in SCRIPT:
+        r = client.post(f"/chat/{run_id}/message", json={"message": message})
+        assert r.status_code == 200, r.text
+    return run_id
@@ -0,0 +1,79 @@
+import copy
+
+from app.graph.graph import get_graph
+from app.nodes.step_assemble import step_assemble
+
+
+def _state(run_id):
+    config = {"configurable": {"thread_id": run_id}}
+    return copy.deepcopy(dict(get_graph().get_state(config).values))
+
+
+def test_ids_do_not_depend_on_session(finished_run):
+    a = _state(finished_run)
+    b = copy.deepcopy(a)
+    b["run_id"] = "another-run"
+    for state in (a, b):
+        state.pop("diagram", None)
+        step_assemble(state)
+
+    da, db = a["diagram"], b["diagram"]
+    assert [n["id"] for n in da["nodes"]] == [n["id"] for n in db["nodes"]]
+    assert [e["id"] for e in da["edges"]] == [e["id"] for e in db["edges"]]
+
+    root = next(n for n in da["nodes"] if n["label"] == "Diagram")
+    assert root["name"] == "은행 구성도"
+    assert root["run_id"] == finished_run
+    assert next(n for n in db["nodes"] if n["label"] == "Diagram")["run_id"] == (
+        "another-run"
+    )
+
+
+def _triples(diagram, rel):
+    nodes = diagram["nodes"]
+    return {
+        (nodes[e["source"]]["name"], nodes[e["target"]]["name"], e["scope"])
+        for e in diagram["edges"]
+        if e["type"] == rel
+    }
+
+
+def test_assembly_triples_and_violations(finished_run):
+    state = _state(finished_run)
+    state.pop("diagram", None)
+    diagram = step_assemble(state)["diagram"]
+    nodes = diagram["nodes"]
+    labels = {n["name"]: n["label"] for n in nodes if n.get("origin") is None}
+    assert {k: labels[k] for k in ("orclprod", "L4 스위치", "EAI", "KFTC")} == {
+        "orclprod": "DBMS",
+        "L4 스위치": "NetworkDevice",
+        "EAI": "Interface",
+        "KFTC": "ExternalSystem",
+    }
+
+    # 엣지 텍스트 -> CONNECTED_TO ('<-'는 방향 반전)
+    assert _triples(diagram, "CONNECTED_TO") == {
+        ("nbefapp01", "orclprod", "의왕:internal"),
+        ("L4 스위치", "nbefapp02", "의왕:internal"),
+        ("EAI", "KFTC", "의왕:internal"),
+        ("WEB01", "nbefapp01", "의왕:dmz"),
+        ("awsapp01", "nbefapp01", "AWS:internal"),
+    }
+    # 소속: 서버는 zone으로, 장비는 센터에서
+    assert ("nbefapp01", "의왕 내부망", "의왕:internal") in _triples(diagram, "IN_ZONE")
+    assert ("의왕", "L4 스위치", "의왕:internal") in _triples(diagram, "HAS_DEVICE")
+
+    # 허용되지 않은 DBMS -> NetworkDevice는 엣지 대신 violations
+    (violation,) = diagram["violations"]
+    assert violation["triple"] == ["DBMS", "CONNECTED_TO", "NetworkDevice"]
+    assert violation["scope"] == "AWS:internal"
+    assert (nodes[violation["source"]]["name"], nodes[violation["target"]]["name"]) == (
+        "orclprod",
+        "L4 스위치",
+    )
+
+    # scope 상세에 없던 이름은 origin="edges", 엔티티가 아닌 조각은 unresolved
+    assert [(n["scope"], n["origin"]) for n in nodes if n.get("origin")] == [
+        ("AWS:internal", "edges")
+    ]
+    assert diagram["unresolved"] == [{"text": "bar", "scope": "AWS:internal"}]
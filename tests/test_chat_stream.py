@@ -0,0 +1,28 @@
+import json
+
+from conftest import SCRIPT
+
+
+def _events(body):
+    out = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        out.append((event[len("event: ") :], json.loads(data[len("data: ") :])))
+    return out
+
+
+def test_stream_emits_deltas_from_node_updates(client, run_id):
+    r = client.post(f"/chat/{run_id}/stream", json={"message": SCRIPT[0]})
+    assert r.status_code == 200, r.text
+    events = _events(r.text)
+    kinds = [e for e, _ in events]
+    assert kinds[0] == "start" and kinds[-1] == "done"
+
+    # delta는 응답을 만든 노드 업데이트에서 바로 (done 이전, 노드명 포함)
+    deltas = [d for e, d in events if e == "delta"]
+    assert deltas and {d["node"] for d in deltas} == {"chat_handler"}
+    first_node = kinds.index("node")
+    assert all(i > first_node for i, k in enumerate(kinds) if k == "delta")
+
+    state = client.get(f"/chat/{run_id}/state").json()["state"]
+    assert "".join(d["content"] for d in deltas) == state["last_response"]
@@ -0,0 +1,67 @@
+import asyncio
+
+from app.core.concurrency import Coalescer
+
+
+def test_coalescer_merges_only_inflight_requests():
+    calls = []
+
+    async def main():
+        coalescer = Coalescer()
+        gate = asyncio.Event()
+
+        async def work():
+            calls.append(1)
+            await gate.wait()
+            return len(calls)
+
+        first = asyncio.ensure_future(coalescer.run("k", work))
+        second = asyncio.ensure_future(coalescer.run("k", work))
+        await asyncio.sleep(0)
+        gate.set()
+        merged = await asyncio.gather(first, second)
+        # 끝난 뒤 같은 키는 새로 실행
+        again = await coalescer.run("k", work)
+        return merged, again
+
+    merged, again = asyncio.run(main())
+    assert merged == [1, 1]
+    assert again == 2
+    assert len(calls) == 2
+
+
+def test_identical_sequential_messages_both_run(client, run_id):
+    message = "법인은 은행이고 AWS, 의왕으로 구성되어있습니다"
+    counts = []
+    for _ in range(2):
+        r = client.post(
+            f"/chat/{run_id}/message",
+            json={"message": message},
+            params={"view": "full"},
+        )
+        assert r.status_code == 200, r.text
+        counts.append(len(r.json()["messages"]))
+
+    assert counts[1] > counts[0]
+    history = client.get(f"/chat/{run_id}/history").json()["messages"]
+    assert [m["content"] for m in history if m["role"] == "user"] == [message] * 2
+
+
+def test_repeated_step_commands_each_run(monkeypatch):
+    from app.api import routes_steps
+
+    calls = []
+    monkeypatch.setattr(
+        routes_steps, "_apply_step", lambda run_id, updates: calls.append(updates) or {}
+    )
+
+    async def main():
+        # /next-scope 두 번 (입력이 매번 같음) -> 두 번 다 실행
+        updates = {"requested_step": "next_scope"}
+        await asyncio.gather(
+            routes_steps._step("run-x", updates), routes_steps._step("run-x", updates)
+        )
+        await routes_steps._step("run-x", updates)
+
+    asyncio.run(main())
+    assert len(calls) == 3
@@ -0,0 +1,134 @@
+import copy
+
+from app.diagram.diff import diagram_signature, diff_diagrams
+from app.graph.graph import get_graph
+
+
+def _revise(run_id, edit):
+    config = {"configurable": {"thread_id": run_id}}
+    diagram = copy.deepcopy(get_graph().get_state(config).values["diagram"])
+    edit(diagram)
+    get_graph().update_state(config, {"diagram": diagram})
+    return diagram
+
+
+def test_diff_reports_changes_by_id(client, finished_run):
+    diagram = client.get(f"/export/{finished_run}/diagram?format=json").json()
+    revised = copy.deepcopy(diagram)
+    revised["nodes"][-1]["zone"] = "changed"
+    connected = next(
+        i for i, e in enumerate(revised["edges"]) if e["type"] == "CONNECTED_TO"
+    )
+    removed = revised["edges"].pop(connected)
+
+    diff = diff_diagrams(diagram, revised)
+    assert diff["summary"] == {
+        "nodes_added": 0,
+        "nodes_removed": 0,
+        "nodes_changed": 1,
+        "edges_added": 0,
+        "edges_removed": 1,
+        "edges_changed": 0,
+    }
+    assert diff["nodes"]["changed"][0]["fields"]["zone"][1] == "changed"
+    assert diff["edges"]["removed"][0]["id"] == removed["id"]
+    # 렌더 캐시: 엣지가 빠진 scope만 다시 그림
+    assert diff["clusters"]["changed"] == [removed["scope"]]
+    assert diff_diagrams(revised, revised)["identical"]
+
+
+def test_signature_ignores_list_order(client, finished_run):
+    diagram = client.get(f"/export/{finished_run}/diagram?format=json").json()
+    shuffled = copy.deepcopy(diagram)
+    shuffled["edges"].reverse()
+    assert diagram_signature(shuffled) == diagram_signature(diagram)
+
+
+def test_revisions_and_default_diff(client, finished_run):
+    base = client.get(f"/export/{finished_run}/diagram/revisions").json()["revisions"]
+    assert len(base) == 1
+    first = client.get(f"/export/{finished_run}/diagram/diff").json()
+    assert first["base"] is None
+    assert first["summary"]["nodes_added"] == base[0]["nodes"]
+
+    # 같은 구성도를 다시 저장하면 새 리비전이 아님
+    _revise(finished_run, lambda d: None)
+    _revise(finished_run, lambda d: d["edges"].pop())
+    _revise(finished_run, lambda d: d["nodes"][-1].update(zone="x"))
+    revisions = client.get(f"/export/{finished_run}/diagram/revisions").json()[
+        "revisions"
+    ]
+    assert len(revisions) == 3
+    assert len({r["signature"] for r in revisions}) == 3
+
+    latest = client.get(f"/export/{finished_run}/diagram/diff").json()
+    assert latest["target"] == revisions[0]["checkpoint_id"]
+    assert latest["base"] == revisions[1]["checkpoint_id"]
+    assert latest["summary"]["nodes_changed"] == 1
+    assert latest["summary"]["edges_removed"] == 0
+
+    explicit = client.get(
+        f"/export/{finished_run}/diagram/diff",
+        params={
+            "base": revisions[2]["checkpoint_id"],
+            "target": revisions[0]["checkpoint_id"],
+        },
+    ).json()
+    assert explicit["summary"]["edges_removed"] == 1
+    assert explicit["summary"]["nodes_changed"] == 1
+
+
+def test_diff_missing(client, finished_run):
+    assert client.get("/export/nope/diagram/diff").status_code == 404
+    r = client.get(f"/export/{finished_run}/diagram/diff", params={"base": "nope"})
+    assert r.status_code == 404
+
+
+def test_default_base_is_older_than_target(client, finished_run):
+    # A(과거) -> B -> A(최신): 과거 A 기준 이전 리비전은 없음
+    original = _revise(finished_run, lambda d: None)
+    _revise(finished_run, lambda d: d["nodes"][-1].update(zone="b"))
+    _revise(finished_run, lambda d: d.clear() or d.update(original))
+    revisions = client.get(f"/export/{finished_run}/diagram/revisions").json()[
+        "revisions"
+    ]
+    assert len(revisions) == 3
+    assert revisions[0]["signature"] == revisions[2]["signature"]
+
+    old_a = revisions[2]["checkpoint_id"]
+    diff = client.get(
+        f"/export/{finished_run}/diagram/diff", params={"target": old_a}
+    ).json()
+    assert diff["target"] == old_a
+    assert diff["base"] is None
+    assert diff["summary"]["nodes_added"] == revisions[2]["nodes"]
+
+    middle = client.get(
+        f"/export/{finished_run}/diagram/diff",
+        params={"target": revisions[1]["checkpoint_id"]},
+    ).json()
+    assert middle["base"] == old_a
+
+
+def test_default_diff_stops_walking_history(client, finished_run, monkeypatch):
+    from app.api import routes_export
+
+    for zone in ("x", "y", "z"):
+        _revise(finished_run, lambda d, zone=zone: d["nodes"][-1].update(zone=zone))
+    calls = []
+    real = routes_export.get_graph
+
+    class Graph:
+        def get_state_history(self, config):
+            for snap in real().get_state_history(config):
+                calls.append(1)
+                yield snap
+
+    monkeypatch.setattr(routes_export, "get_graph", Graph)
+    diff = client.get(f"/export/{finished_run}/diagram/diff").json()
+    assert diff["summary"]["nodes_changed"] == 1
+    total = len(
+        list(real().get_state_history({"configurable": {"thread_id": finished_run}}))
+    )
+    # 최신 리비전 + 바로 이전 리비전 + 그 다음 스냅샷 하나까지만
+    assert len(calls) <= 3 < total
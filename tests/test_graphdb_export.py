@@ -0,0 +1,147 @@
+import csv
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.diagram.graphdb_export import cypher_literal, export_graphdb
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def diagram(client, finished_run):
+    r = client.get(f"/export/{finished_run}/diagram?format=json")
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _export(tmp_path, diagram, fmt, run_id="run-1"):
+    # 같은 구성도 두 번 -> 노드 / 관계는 한 번만 기록
+    return export_graphdb(
+        [(run_id, diagram), (run_id, diagram)],
+        str(tmp_path),
+        fmt,
+        batch_size=3,
+        files_per_chunk=2,
+    )
+
+
+def test_cypher_literal_escaping():
+    assert cypher_literal({"a b": "it's\n", "n": [1, 2.5, None, True]}) == (
+        "{`a b`: 'it\\'s\\n', n: [1, 2.5, null, true]}"
+    )
+    assert cypher_literal(float("nan")) == "null"
+
+
+def test_cypher_export_files(tmp_path, diagram):
+    manifest = _export(tmp_path, diagram, "cypher")
+    labels = {n["label"] for n in diagram["nodes"]}
+    assert manifest["diagrams"] == 2
+    assert manifest["nodes"] == len(diagram["nodes"])
+    assert manifest["skipped_nodes"] == len(diagram["nodes"])
+    assert manifest["relationships"] == len(diagram["edges"])
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+
+    # 적재 순서: constraints -> nodes -> rels, 모두 실제 파일
+    order = manifest["load_order"]
+    assert order[0] == "constraints.cypher"
+    kinds = [name.split("_")[0] for name in order[1:]]
+    assert kinds == sorted(kinds, key=["nodes", "rels"].index)
+    assert all((tmp_path / name).is_file() for name in order)
+    assert len(list(tmp_path.iterdir())) == len(order) + 1
+
+    constraints = (tmp_path / "constraints.cypher").read_text().splitlines()
+    assert len(constraints) == len(labels)
+    assert all(
+        line.startswith("CREATE CONSTRAINT") and line.endswith("IS UNIQUE;")
+        for line in constraints
+    )
+
+    node_text = "".join((tmp_path / n).read_text() for n in order if "nodes_" in n)
+    rel_text = "".join((tmp_path / n).read_text() for n in order if "rels_" in n)
+    statements = [s for s in (node_text + rel_text).split(";\n") if s.strip()]
+    assert len(statements) == manifest["statements"]
+    assert all(s.startswith("UNWIND [") for s in statements)
+    # 파일당 batch 수 제한
+    for name in order[1:]:
+        assert (tmp_path / name).read_text().count("UNWIND") <= 2
+
+    assert "run_id" not in node_text + rel_text
+    node_ids = re.findall(r"\{id: '([^']+)', props:", node_text)
+    assert sorted(node_ids) == sorted(n["id"] for n in diagram["nodes"])
+    # UNWIND 한 문 = batch_size 행 이하
+    assert all(len(re.findall(r"\{(?:id|s): '", s)) <= 3 for s in statements)
+    assert rel_text.count("{s: '") == len(diagram["edges"])
+
+
+def test_csv_export_files(tmp_path, diagram):
+    manifest = _export(tmp_path, diagram, "csv")
+    order = manifest["load_order"]
+    assert order[:2] == ["nodes_header.csv", "rels_header.csv"]
+
+    def rows(prefix):
+        out = []
+        for name in order[2:]:
+            if name.startswith(prefix):
+                with (tmp_path / name).open(encoding="utf-8", newline="") as f:
+                    out.extend(csv.reader(f))
+        return out
+
+    def header(name):
+        with (tmp_path / name).open(encoding="utf-8", newline="") as f:
+            return next(csv.reader(f))
+
+    node_header, rel_header = header(order[0]), header(order[1])
+    assert node_header[0] == "id:ID" and node_header[-1] == ":LABEL"
+    assert rel_header[:3] == [":START_ID", ":END_ID", ":TYPE"]
+
+    nodes, rels = rows("nodes_"), rows("rels_")
+    assert len(nodes) == manifest["nodes"] == len(diagram["nodes"])
+    assert len(rels) == manifest["relationships"] == len(diagram["edges"])
+    assert all(len(r) == len(node_header) for r in nodes)
+    assert all(len(r) == len(rel_header) for r in rels)
+
+    ids = [r[0] for r in nodes]
+    assert len(set(ids)) == len(ids)
+    assert {r[-1] for r in nodes} == {n["label"] for n in diagram["nodes"]}
+    assert all(r[0] in ids and r[1] in ids for r in rels)
+    # 합쳐진 노드 / 관계는 세션 공유 -> run_id 없음
+    assert "run_id" not in node_header and "run_id" not in rel_header
+    assert "--nodes=nodes_header.csv," in manifest["command"]
+
+
+def test_script_exports_ndjson_dump(tmp_path, client, finished_run):
+    dump = tmp_path / "sessions.ndjson"
+    r = client.get("/export/sessions.ndjson", params={"include_diagram": "true"})
+    dump.write_bytes(r.content)
+    diagrams = {
+        row["run_id"]: row["diagram"]
+        for row in map(json.loads, r.text.splitlines())
+        if row.get("diagram")
+    }
+    assert finished_run in diagrams
+
+    out = tmp_path / "out"
+    subprocess.run(
+        [
+            sys.executable,
+            str(ROOT / "scripts" / "export_graphdb.py"),
+            "--in_path",
+            str(dump),
+            "--out_dir",
+            str(out),
+            "--format",
+            "csv",
+        ],
+        check=True,
+        capture_output=True,
+        cwd=ROOT,
+    )
+    manifest = json.loads((out / "manifest.json").read_text())
+    assert manifest["diagrams"] == len(diagrams)
+    unique = {n["id"] for d in diagrams.values() for n in d["nodes"]}
+    assert manifest["nodes"] == len(unique)
@@ -0,0 +1,69 @@
+import numpy as np
+
+from app.diagram import layout
+from app.diagram.render import RenderCache, build_clusters, render
+
+
+def _crossed_zone(k=4):
+    # zone 하나, 위층 a0..a3 -> 아래층 b3..b0 (등장 순서 그대로면 모든 쌍이 교차)
+    nodes = [{"index": 0, "label": "NetworkZone", "name": "z", "scope": "z:internal"}]
+    for prefix in "ab":
+        for i in range(k):
+            nodes.append(
+                {
+                    "index": len(nodes),
+                    "label": "Server",
+                    "name": f"{prefix}{i}",
+                    "scope": "z:internal",
+                }
+            )
+    edges = [
+        {"source": 1 + i, "target": 1 + k + (k - 1 - i), "type": "CONNECTED_TO"}
+        for i in range(k)
+    ]
+    return {"nodes": nodes, "edges": edges}
+
+
+def test_sweeps_reduce_crossings_of_input_order():
+    diagram = _crossed_zone()
+    initial = layout.layered_layout(diagram, sweeps=0)
+    assert initial.crossings == 6
+    swept = layout.layered_layout(diagram)
+    assert swept.crossings == 0
+    # 위 / 아래 층 순서가 간선 방향대로 맞춰짐
+    assert list(swept.order[5:9]) == [3, 2, 1, 0]
+    assert set(swept.layer[1:5]) == {0} and set(swept.layer[5:9]) == {1}
+
+
+def test_cluster_layout_is_independent(client, finished_run):
+    diagram = client.get(f"/export/{finished_run}/diagram?format=json").json()
+    full = layout.layered_layout(diagram)
+    clusters = list(build_clusters(diagram).values())
+    for gi, c in enumerate(clusters):
+        alone = layout.layered_layout(diagram, clusters=[c])
+        assert np.allclose(alone.x[c.members], full.x[c.members])
+        assert np.allclose(alone.y[c.members], full.y[c.members])
+        assert alone.crossings == full.cluster_crossings[gi]
+    assert full.crossings == int(full.cluster_crossings.sum())
+
+
+def test_cached_svg_skips_layout(client, finished_run, monkeypatch):
+    diagram = client.get(f"/export/{finished_run}/diagram?format=json").json()
+    cache = RenderCache()
+    first = render(diagram, "svg", cache=cache)
+
+    calls = []
+    real = layout.layered_layout
+    monkeypatch.setattr(
+        layout,
+        "layered_layout",
+        lambda *a, **kw: calls.append(kw.get("clusters")) or real(*a, **kw),
+    )
+    assert render(diagram, "svg", cache=cache) == first
+    assert calls == []
+
+    # 클러스터 하나만 바뀌면 그 클러스터만 다시 배치
+    node = next(n for n in diagram["nodes"] if n.get("scope") == "AWS:internal")
+    node["name"] += "-2"
+    render(diagram, "svg", cache=cache)
+    assert [[c.scope for c in clusters] for clusters in calls] == [["AWS:internal"]]
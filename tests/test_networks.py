@@ -0,0 +1,36 @@
+import pytest
+
+from app.nodes.chat_processor import _match_center_header
+from app.nodes.step_networks import _extract_centers
+
+CENTERS = ["의왕", "AWS", "AWS2"]
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("의왕", "의왕"),
+        ("의왕센터", "의왕"),
+        ("의왕 센터", "의왕"),
+        ("aws", "AWS"),
+        ("AWS2", "AWS2"),
+        ("AWS 센터", "AWS"),
+        ("AWS3", None),
+        ("의", None),
+        ("과천", None),
+    ],
+)
+def test_match_center_header(header, expected):
+    assert _match_center_header(header, CENTERS) == expected
+
+
+def test_extract_centers_keeps_input_order():
+    jobs = [
+        ("의왕", "내부망, DMZ망", "[의왕]\n내부망, DMZ망\nL4 스위치"),
+        ("AWS", "내부망", ""),
+    ]
+    out = _extract_centers(jobs)
+    assert list(out) == ["의왕", "AWS"]
+    assert {"internal", "dmz"} <= set(out["의왕"]["zones"])
+    assert out["의왕"]["devices"]
+    assert out["AWS"]["devices"] == []
@@ -0,0 +1,146 @@
+import math
+
+import pytest
+
+from app.diagram.query import GraphQueryEngine
+from app.schemas.graphdb_schema import GraphQuery
+
+
+def _node(i, name, scope, label="Server"):
+    return {"index": i, "id": f"n{i}", "name": name, "scope": scope, "label": label}
+
+
+def _edge(i, source, target, rel="CONNECTED_TO"):
+    return {"id": f"e{i}", "source": source, "target": target, "type": rel}
+
+
+@pytest.fixture
+def diagram():
+    # zone a: app1, app2, ext_in(내부 대외기관)   zone b: gw   외부: ext1, ext2
+    nodes = [
+        _node(0, "app1", "a"),
+        _node(1, "app2", "a"),
+        _node(2, "ext_in", "a", "ExternalSystem"),
+        _node(3, "gw", "b"),
+        _node(4, "ext1", "ext", "ExternalSystem"),
+        _node(5, "ext2", "ext", "ExternalSystem"),
+        _node(6, "zone-a", "a", "NetworkZone"),
+    ]
+    edges = [
+        _edge(0, 0, 1),  # app1 -> app2
+        _edge(1, 0, 3),  # app1 -> gw
+        _edge(2, 1, 3),  # app2 -> gw
+        _edge(3, 3, 4),  # gw -> ext1
+        _edge(4, 5, 0),  # ext2 -> app1 (역방향, zone에서 못 감)
+        _edge(5, 1, 2),  # app2 -> ext_in
+        _edge(6, 4, 5),  # ext1 -> ext2 (대외기관에서 더 나가지 않음)
+        _edge(7, 6, 0, "CONTAINS"),
+    ]
+    return {"nodes": nodes, "edges": edges}
+
+
+def _names(path):
+    return [e["name"] for e in path["entities"]]
+
+
+def test_neighbors_and_k_hop_are_undirected(diagram):
+    engine = GraphQueryEngine(diagram)
+    hop1 = engine.neighbors("app1").to_dict()
+    assert {e["name"] for e in hop1["entities"]} == {"app2", "gw", "ext2"}
+
+    hop2 = engine.k_hop("app1", 2).to_dict()
+    assert hop2["metadata"]["depth"]["n4"] == 2
+    assert hop2["metadata"]["depth"]["n2"] == 2
+
+
+def test_shortest_path_bfs_and_dijkstra(diagram):
+    engine = GraphQueryEngine(diagram)
+    result = engine.shortest_path("app2", "ext1").to_dict()
+    assert result["metadata"]["algorithm"] == "bfs"
+    assert _names(result["paths"][0]) == ["app2", "gw", "ext1"]
+
+    weighted = GraphQueryEngine(diagram, weights={"CONNECTED_TO": 2.5})
+    result = weighted.shortest_path("app1", "ext1").to_dict()
+    assert result["paths"][0]["total_weight"] == 5.0
+
+
+def test_zone_external_returns_all_directed_simple_paths(diagram):
+    result = GraphQueryEngine(diagram).zone_external("a").to_dict()
+    paths = sorted(_names(p) for p in result["paths"])
+    assert paths == [
+        ["app1", "app2", "ext_in"],
+        ["app1", "app2", "gw", "ext1"],
+        ["app1", "gw", "ext1"],
+        ["app2", "ext_in"],
+        ["app2", "gw", "ext1"],
+    ]
+    # 역방향 엣지(ext2 -> app1)로는 도달하지 않음, zone 안의 대외기관 포함
+    assert set(result["metadata"]["externals"]) == {"n2", "n4"}
+    assert result["metadata"]["truncated"] is False
+
+
+def test_zone_external_limits(diagram):
+    engine = GraphQueryEngine(diagram)
+    short = engine.zone_external("a", max_depth=2).to_dict()
+    assert all(p["length"] <= 2 for p in short["paths"])
+    assert len(short["paths"]) == 4
+
+    capped = engine.zone_external("a", max_paths=2).to_dict()
+    assert len(capped["paths"]) == 2
+    assert capped["metadata"]["truncated"] is True
+
+
+def test_dijkstra_depth_limit_keeps_fewer_hop_route():
+    # s -a-b-> v 는 싸지만 3 hop, s -> v 직행은 비싸지만 1 hop
+    nodes = [_node(i, name, "a") for i, name in enumerate("sabvt")]
+    edges = [
+        _edge(0, 0, 1),
+        _edge(1, 1, 2),
+        _edge(2, 2, 3),
+        _edge(3, 0, 3, "LINKS"),
+        _edge(4, 3, 4),
+    ]
+    engine = GraphQueryEngine(
+        {"nodes": nodes, "edges": edges},
+        relations=("CONNECTED_TO", "LINKS"),
+        weights={"CONNECTED_TO": 1, "LINKS": 10},
+    )
+    free = engine.shortest_path("s", "t").to_dict()
+    assert _names(free["paths"][0]) == ["s", "a", "b", "v", "t"]
+
+    # hop 제한 안에서 최단: 싼 경로가 v를 먼저 차지해도 직행 경로로 찾음
+    capped = engine.shortest_path("s", "t", max_depth=3).to_dict()
+    assert _names(capped["paths"][0]) == ["s", "v", "t"]
+    assert capped["paths"][0]["total_weight"] == 11.0
+    assert engine.shortest_path("s", "t", max_depth=1).to_dict()["paths"] == []
+
+
+@pytest.mark.parametrize("weight", [-1, math.nan, math.inf, "heavy"])
+def test_invalid_weights_rejected(diagram, weight):
+    with pytest.raises(ValueError):
+        GraphQueryEngine(diagram, weights={"CONNECTED_TO": weight})
+
+
+def test_query_route_maps_errors(client, finished_run):
+    url = f"/export/{finished_run}/diagram/query"
+    bad = GraphQuery(
+        query_type="shortest_path",
+        query_string="nbefapp01",
+        parameters={"target": "orclprod", "weights": {"CONNECTED_TO": -1}},
+    )
+    r = client.post(url, json=bad.model_dump())
+    assert r.status_code == 400
+
+    as_list = {
+        "query_type": "shortest_path",
+        "query_string": "nbefapp01",
+        "parameters": {"target": "orclprod", "weights": [1, 2]},
+    }
+    assert client.post(url, json=as_list).status_code == 400
+
+    missing = {"query_type": "neighbors", "query_string": "no-such-node"}
+    assert client.post(url, json=missing).status_code == 404
+
+    ok = {"query_type": "zone_external", "query_string": "의왕 내부망"}
+    r = client.post(url, json=ok)
+    assert r.status_code == 200, r.text
@@ -0,0 +1,29 @@
+from app.diagram.render import RenderCache, build_clusters, render
+
+
+def test_mermaid_reuses_cached_clusters(client, finished_run):
+    diagram = client.get(f"/export/{finished_run}/diagram?format=json").json()
+    n_clusters = len(build_clusters(diagram))
+    cache = RenderCache()
+
+    first = render(diagram, "mermaid", cache=cache)
+    assert (cache.hits, cache.misses) == (0, n_clusters)
+    assert render(diagram, "mermaid", cache=cache) == first
+    assert (cache.hits, cache.misses) == (n_clusters, n_clusters)
+
+    # 클러스터 하나만 바뀌면 그 클러스터만 다시 렌더
+    node = next(n for n in diagram["nodes"] if n.get("scope") == "AWS:internal")
+    node["name"] += "-2"
+    changed = render(diagram, "mermaid", cache=cache)
+    assert (cache.hits, cache.misses) == (2 * n_clusters - 1, n_clusters + 1)
+    assert node["name"] in changed and node["name"] not in first
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RenderCache(maxsize=2)
+    for sig in ("a", "b"):
+        cache.put("svg", sig, sig.upper())
+    assert cache.get("svg", "a") == "A"  # a가 최근 사용
+    cache.put("svg", "c", "C")
+    assert cache.get("svg", "b") is None
+    assert cache.get("svg", "a") == "A" and cache.get("svg", "c") == "C"
@@ -0,0 +1,74 @@
+from conftest import SCRIPT
+
+EXPECTED_STEPS = [
+    "networks",
+    "scope-detail",
+    "scope-detail",
+    "scope-detail",
+    "scope-detail",
+    "edges",
+    "done",
+]
+
+
+def _turns(steps=EXPECTED_STEPS):
+    return [
+        {"message": message, "expect_next_step": step}
+        for message, step in zip(SCRIPT, steps)
+    ]
+
+
+def test_replay_follows_scripted_flow(client):
+    r = client.post("/sessions/replay", json={"turns": _turns(), "repeat": 2})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["failures"] == 0
+    assert body["total_turns"] == len(SCRIPT) * 2
+    assert len({run["run_id"] for run in body["runs"]}) == 2
+    for run in body["runs"]:
+        assert run["next_step"] == "done"
+        assert [t["next_step"] for t in run["turns"]] == EXPECTED_STEPS
+
+
+def test_replay_reports_unexpected_step(client):
+    steps = list(EXPECTED_STEPS)
+    steps[1] = "edges"
+    r = client.post(
+        "/sessions/replay", json={"turns": _turns(steps), "include_transcript": True}
+    )
+    body = r.json()
+    assert body["failures"] == 1
+    failed = [t for t in body["runs"][0]["turns"] if not t["ok"]]
+    assert failed[0]["message"] == SCRIPT[1]
+    assert "expected next_step=edges" in failed[0]["error"]
+
+
+def test_persisted_replay_matches_http_conversation(client, finished_run):
+    r = client.post("/sessions/replay", json={"turns": SCRIPT, "persist": True})
+    replayed = r.json()["runs"][0]["run_id"]
+
+    a = client.get(f"/chat/{replayed}/state").json()["state"]
+    b = client.get(f"/chat/{finished_run}/state").json()["state"]
+    assert a["next_step"] == b["next_step"] == "done"
+    assert a["scope_details"] == b["scope_details"]
+    assert a["edges"] == b["edges"]
+    assert [m["content"] for m in a["messages"]] == [
+        m["content"] for m in b["messages"]
+    ]
+
+    # 저장된 세션은 /chat으로 이어서 사용 가능
+    history = client.get(f"/chat/{replayed}/history").json()
+    assert history["current_step"] == "done"
+
+
+def test_bulk_sessions_are_independent(client):
+    r = client.post("/sessions/bulk", json={"count": 3})
+    body = r.json()
+    assert body["created"] == 3 and len(set(body["run_ids"])) == 3
+
+    first, second = body["run_ids"][:2]
+    r = client.post(f"/chat/{first}/message", json={"message": SCRIPT[0]})
+    assert r.json()["next_step"] == "networks"
+    assert client.get(f"/chat/{second}/history").json()["current_step"] == (
+        "corp-center"
+    )
@@ -0,0 +1,41 @@
+from app.diagram import layout
+from app.diagram.review import review_diagram
+from app.nodes.review import ReviewNode
+
+
+def test_assembly_review_skips_layout(client, finished_run, monkeypatch):
+    diagram = client.get(f"/export/{finished_run}/diagram?format=json").json()
+    assert diagram["review"]["metrics"]["crossings"] is None
+
+    calls = []
+    real = layout.layered_layout
+    monkeypatch.setattr(
+        layout, "layered_layout", lambda *a, **kw: calls.append(1) or real(*a, **kw)
+    )
+    review_diagram(diagram)
+    assert not calls
+
+
+def test_crossings_computed_once_per_cluster_layout(client, finished_run, monkeypatch):
+    diagram = client.get(f"/export/{finished_run}/diagram?format=json").json()
+    layout._crossings_cache.clear()
+    expected = layout.layered_layout(diagram).crossings
+
+    # export 레이아웃 결과를 캐시에서 재사용 -> 레이아웃 재계산 없음
+    monkeypatch.setattr(layout, "layered_layout", None)
+    report = ReviewNode()._review_diagram(diagram)
+    assert report["metrics"]["crossings"] == expected
+    assert review_diagram(diagram, with_crossings=True)["metrics"]["crossings"] == (
+        expected
+    )
+
+
+def test_legacy_review_data_suggests_grouping():
+    nodes = [{"id": i} for i in range(30)]
+    result = ReviewNode().execute("s", {"review_data": {"nodes": nodes}})
+    assert "Consider grouping nodes to reduce complexity" in result["suggestions"]
+
+    small = ReviewNode().execute("s", {"review_data": {"nodes": nodes[:5]}})
+    assert small["suggestions"] == []
+    # 교차가 0으로 계산된 경우에만 생략
+    assert ReviewNode()._generate_suggestions({"nodes": 30, "crossings": 0}) == []
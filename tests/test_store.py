@@ -0,0 +1,147 @@
+import fakeredis
+import pytest
+
+from app.core.store import (
+    TURN_LEASE_KEY,
+    InMemorySessionStore,
+    RedisSessionStore,
+    SessionBusy,
+    VersionConflict,
+)
+
+
+@pytest.fixture(params=["memory", "fakeredis"])
+def store(request):
+    if request.param == "memory":
+        return InMemorySessionStore()
+    return RedisSessionStore(fakeredis.FakeRedis(), ttl=60)
+
+
+def test_set_get_versions(store):
+    assert store.get("a") is None
+    assert store.set("a", {"n": 1}, expected_version=0) == 1
+    assert store.set("a", {"n": 2}, expected_version=1) == 2
+    cur = store.get("a")
+    assert (cur.state, cur.version) == ({"n": 2}, 2)
+
+
+def test_version_conflict(store):
+    store.set("a", {"n": 1})
+    with pytest.raises(VersionConflict) as e:
+        store.set("a", {"n": 2}, expected_version=0)
+    assert (e.value.expected, e.value.actual) == (0, 1)
+    assert store.get("a").state == {"n": 1}
+
+
+def test_get_many_set_many(store):
+    versions = store.set_many({"a": {"n": 1}, "b": {"n": 2}})
+    assert versions == {"a": 1, "b": 1}
+    assert store.set_many({"a": {"n": 3}}) == {"a": 2}
+    got = store.get_many(["a", "b", "missing"])
+    assert got["a"].state == {"n": 3} and got["a"].version == 2
+    assert got["b"].state == {"n": 2}
+    assert got["missing"] is None
+    assert sorted(store.iter_ids()) == ["a", "b"]
+
+
+def test_redis_many_is_one_round_trip():
+    client = fakeredis.FakeRedis()
+    store = RedisSessionStore(client)
+    calls = []
+    pipeline = client.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+        pipe.execute = lambda *a, **kw: calls.append(1) or execute(*a, **kw)
+        return pipe
+
+    client.pipeline = counting_pipeline
+    store.set_many({f"r{i}": {"i": i} for i in range(50)})
+    got = store.get_many([f"r{i}" for i in range(50)])
+    assert len(calls) == 2
+    assert [v.state["i"] for v in got.values()] == list(range(50))
+
+
+def test_redis_watch_conflict():
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server)
+    store = RedisSessionStore(client)
+    other = RedisSessionStore(fakeredis.FakeRedis(server=server))
+    store.set("a", {"n": 1})
+    pipeline = client.pipeline
+
+    def racing_pipeline(*args, **kwargs):
+        # WATCH 후 version을 읽은 직후 다른 클라이언트가 먼저 씀
+        pipe = pipeline(*args, **kwargs)
+        hget = pipe.hget
+
+        def hget_then_race(key, field):
+            value = hget(key, field)
+            other.set("a", {"n": "other"})
+            return value
+
+        pipe.hget = hget_then_race
+        return pipe
+
+    client.pipeline = racing_pipeline
+    with pytest.raises(VersionConflict) as e:
+        store.set("a", {"n": 2}, expected_version=1)
+    assert e.value.actual == 2
+    assert other.get("a").state == {"n": "other"}
+
+
+def test_turn_lease(store):
+    claim = store.begin_turn("a", lease_seconds=60)
+    with pytest.raises(SessionBusy):
+        store.begin_turn("a", lease_seconds=60)
+    store.end_turn("a", claim, next_step="networks")
+    cur = store.get("a")
+    assert cur.state["next_step"] == "networks"
+    assert cur.state[TURN_LEASE_KEY] is None
+    # 해제 후에는 다시 획득 가능, 만료된 lease는 가져갈 수 있음
+    store.begin_turn("a", lease_seconds=60)
+    store.begin_turn("a", lease_seconds=0)
+
+
+def test_turn_claim_race(store):
+    # 두 워커가 같은 version을 읽고 동시에 claim -> 나중 쪽은 VersionConflict
+    store.set("a", {"run_id": "a"})
+    cur = store.get("a")
+    store.set("a", {**cur.state, TURN_LEASE_KEY: 1.0}, expected_version=cur.version)
+    with pytest.raises(VersionConflict):
+        store.set("a", {**cur.state, TURN_LEASE_KEY: 2.0}, expected_version=cur.version)
+
+
+def test_busy_session_returns_409(client, run_id):
+    from app.core.store import get_session_store
+
+    store = get_session_store()
+    claim = store.begin_turn(run_id, lease_seconds=60)
+    try:
+        r = client.post(f"/chat/{run_id}/message", json={"message": "안녕"})
+        assert r.status_code == 409
+    finally:
+        store.end_turn(run_id, claim)
+    r = client.post(f"/chat/{run_id}/message", json={"message": "안녕"})
+    assert r.status_code == 200
+    assert store.get(run_id).state["next_step"] == r.json()["next_step"]
+
+
+def test_redis_url_without_saver_fails_startup(monkeypatch):
+    from app.core.settings import settings
+    from app.graph import graph
+
+    pytest.importorskip("redis")
+    try:
+        import langgraph.checkpoint.redis  # noqa: F401
+
+        pytest.skip("langgraph-checkpoint-redis installed")
+    except ImportError:
+        pass
+    monkeypatch.setattr(settings, "SESSION_STORE_URL", "redis://localhost:6379/0")
+    monkeypatch.setattr(settings, "CHECKPOINTER_SQLITE_PATH", None)
+    with pytest.raises(RuntimeError):
+        graph.check_checkpointer()
+    with pytest.raises(RuntimeError):
+        graph._build_checkpointer()
@@ -0,0 +1,92 @@
+import copy
+
+from app.core.candidates import get_candidate_extractor
+from app.diagram.validate import validate_incremental
+from app.graph.graph import get_graph
+from app.nodes.step_assemble import step_assemble
+
+
+def _state(run_id):
+    config = {"configurable": {"thread_id": run_id}}
+    return copy.deepcopy(dict(get_graph().get_state(config).values))
+
+
+def _set_text(record, text):
+    record["text"] = text
+    record["candidates"] = [
+        {
+            "text": c.text,
+            "type": c.type,
+            "span": list(c.span),
+            "normalized": c.normalized,
+        }
+        for c in get_candidate_extractor().extract(text)
+    ]
+
+
+def _findings(validation):
+    return {
+        k: sorted(map(repr, validation[k]))
+        for k in ("missing_nodes", "ambiguous", "violations")
+    }
+
+
+def test_unchanged_scopes_are_not_rechecked(finished_run, monkeypatch):
+    from app.diagram import validate
+
+    state = step_assemble(_state(finished_run))
+    scopes = list(state["validation_cache"])
+
+    checked = []
+    real = validate._check_scope
+    monkeypatch.setattr(
+        validate,
+        "_check_scope",
+        lambda key, *a: checked.append(key) or real(key, *a),
+    )
+    step_assemble(state)
+    assert checked == []
+    assert state["edge_validation"]["reused"] == len(scopes)
+
+    key = next(k for k in state["scope_details"] if k.startswith("AWS"))
+    _set_text(state["scope_details"][key], "서버: awsapp01, awsapp02")
+    step_assemble(state)
+    assert checked == [key]
+    assert state["edge_validation"]["checked"] == [key]
+
+
+def test_cross_scope_name_change_rechecks_referencing_scope(finished_run):
+    state = step_assemble(_state(finished_run))
+    # DMZ에 nbefapp01을 하나 더 선언 -> AWS 입력은 그대로지만
+    # AWS 엣지(awsapp01 -> nbefapp01)의 끝점이 모호해지므로 AWS도 재검증
+    dmz = state["scope_details"]["의왕:dmz"]
+    _set_text(dmz, dmz["text"] + "\n서버: nbefapp01")
+    step_assemble(state)
+    validation = state["edge_validation"]
+    assert set(validation["checked"]) >= {"의왕:dmz", "AWS:internal"}
+    assert any(
+        a["scope"] == "AWS:internal" and a["name"] == "nbefapp01"
+        for a in validation["ambiguous"]
+    )
+
+    full, _ = validate_incremental(state["diagram"])
+    assert _findings(validation) == _findings(full)
+    assert full["reused"] == 0
+
+
+def test_cached_results_match_full_validation(finished_run):
+    from app.diagram.validate import scope_inputs
+
+    state = step_assemble(_state(finished_run))
+    diagram, inputs = state["diagram"], scope_inputs(state)
+
+    cached, cache = validate_incremental(diagram, state["validation_cache"], inputs)
+    full, _ = validate_incremental(diagram)
+    assert cached["checked"] == [] and cached["reused"] == len(cache)
+    assert full["reused"] == 0
+    assert _findings(cached) == _findings(full)
+    assert cached["violations"]  # fixture에는 DBMS -> NetworkDevice 위반이 있음
+
+    # 입력 서명이 없으면 캐시가 있어도 재검증
+    fresh, _ = validate_incremental(diagram, cache)
+    assert fresh["reused"] == 0